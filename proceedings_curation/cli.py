@@ -0,0 +1,96 @@
+import importlib
+
+import typer
+
+# Subcommand name: (module, function, help). Modules are imported when their subcommand runs, so each subcommand
+# only pays for the dependencies it uses.
+COMMANDS = {
+    'compare-excel': (
+        'proceedings_curation.scripts.compare_excel',
+        'compare_excel',
+        'Compare two Excel files and write a report of the differences.',
+    ),
+    'corpus-stats': (
+        'proceedings_curation.scripts.corpus_stats',
+        'main',
+        'Report the size, language shares and per-year totals of the meeting texts.',
+    ),
+    'create-jsonl-dataset': (
+        'proceedings_curation.scripts.create_jsonl_dataset',
+        'create_jsonl_dataset',
+        'Create a JSONL dataset from a folder of text files using a metadata index.',
+    ),
+    'create-metadata-index': (
+        'proceedings_curation.scripts.create_metadata_index',
+        'main',
+        'Create a metadata index from the proceedings index and metadata.',
+    ),
+    'extract-language-subset': (
+        'proceedings_curation.scripts.extract_language_subset',
+        'main',
+        'Extract paragraphs in some languages from a folder of text files.',
+    ),
+    'extract-meetings': (
+        'proceedings_curation.scripts.extract_meetings',
+        'main',
+        'Extract the text of each meeting from the proceedings PDF files.',
+    ),
+    'find-near-duplicates': (
+        'proceedings_curation.scripts.find_near_duplicates',
+        'main',
+        'Find near-duplicate meeting texts with MinHash and LSH.',
+    ),
+    'index-meetings': (
+        'proceedings_curation.scripts.full_text_index',
+        'index_meetings',
+        'Build or update a full-text index of the meeting texts.',
+    ),
+    'search-meetings': (
+        'proceedings_curation.scripts.full_text_index',
+        'search_meetings',
+        'Search the full-text index of the meeting texts.',
+    ),
+}
+
+app = typer.Typer(help='Tools for curating the UNESCO General Conference proceedings.', no_args_is_help=True)
+
+
+def load_command(name: str) -> typer.core.TyperCommand:
+    """Import the script behind a subcommand and build its command line interface
+
+    Args:
+        name (str): Name of the subcommand
+
+    Returns:
+        typer.core.TyperCommand: Command
+    """
+    module, function, _ = COMMANDS[name]
+    script = typer.Typer(add_completion=False)
+    script.command()(getattr(importlib.import_module(module), function))
+    return typer.main.get_command(script)  # type: ignore[return-value]
+
+
+def add_command(name: str, help_text: str) -> None:
+    """Add a subcommand that loads its script and passes all its arguments on when it runs
+
+    Args:
+        name (str): Name of the subcommand
+        help_text (str): Help shown in the command list
+    """
+
+    @app.command(
+        name,
+        help=help_text,
+        add_help_option=False,
+        context_settings={'allow_extra_args': True, 'ignore_unknown_options': True},
+    )
+    def command(ctx: typer.Context) -> None:
+        load_command(name).main(args=ctx.args, prog_name=ctx.command_path, standalone_mode=False)
+
+
+for command_name, (_, _, command_help) in COMMANDS.items():
+    add_command(command_name, command_help)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    app()
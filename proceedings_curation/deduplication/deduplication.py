@@ -0,0 +1,156 @@
+import zlib
+from collections import defaultdict
+from itertools import combinations
+from typing import Sequence
+
+import numpy as np
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def shingle_hashes(text: str, shingle_size: int = 5) -> np.ndarray:
+    """Hash the word shingles of a text. Words are hashed with CRC-32 and the hashes of the words in a shingle are combined with a polynomial rolling hash over all shingles at once.
+
+    Args:
+        text (str): Text
+        shingle_size (int, optional): Number of words in a shingle. Defaults to 5.
+
+    Returns:
+        np.ndarray: Unique 32-bit shingle hashes (uint64)
+    """
+    words = text.lower().split()
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    word_hashes = np.fromiter((zlib.crc32(word.encode('utf-8')) for word in words), dtype=np.uint64, count=len(words))
+    size = min(shingle_size, len(words))
+    count = len(words) - size + 1
+    hashes = np.zeros(count, dtype=np.uint64)
+    for i in range(size):
+        hashes = hashes * np.uint64(1000003) + word_hashes[i : i + count]
+    return np.unique((hashes ^ (hashes >> np.uint64(32))) & MAX_HASH)
+
+
+class MinHasher:
+    """MinHash signatures of texts, with hash functions (a * x + b) mod (2^61 - 1) over 32-bit shingle hashes"""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1, chunk_size: int = 4096) -> None:
+        """Create the hash functions
+
+        Args:
+            num_perm (int, optional): Number of hash functions, the length of a signature. Defaults to 128.
+            shingle_size (int, optional): Number of words in a shingle. Defaults to 5.
+            seed (int, optional): Random seed of the hash functions. Defaults to 1.
+            chunk_size (int, optional): Number of shingles hashed at once. Defaults to 4096.
+        """
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.chunk_size = chunk_size
+        self.a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of a text. A text without words gets a signature of maximum values.
+
+        Args:
+            text (str): Text
+
+        Returns:
+            np.ndarray: Signature (uint64, num_perm values)
+        """
+        signature = np.full(self.num_perm, MERSENNE_PRIME, dtype=np.uint64)
+        hashes = shingle_hashes(text, self.shingle_size)
+        for start in range(0, len(hashes), self.chunk_size):
+            chunk = hashes[start : start + self.chunk_size, None]
+            signature = np.minimum(signature, ((chunk * self.a + self.b) % MERSENNE_PRIME).min(axis=0))
+        return signature
+
+
+def similarity(first: np.ndarray, second: np.ndarray) -> float:
+    """Estimate the Jaccard similarity of two texts from their signatures
+
+    Args:
+        first (np.ndarray): Signature of the first text
+        second (np.ndarray): Signature of the second text
+
+    Returns:
+        float: Fraction of equal signature values
+    """
+    return float(np.mean(first == second))
+
+
+def candidate_pairs(signatures: np.ndarray, bands: int = 16) -> set[tuple[int, int]]:
+    """Find candidate pairs with locality-sensitive hashing. The signatures are split into bands and texts that have the same values in a band are candidates. Empty texts are never candidates.
+
+    Args:
+        signatures (np.ndarray): Signatures, one row per text
+        bands (int, optional): Number of bands. Must divide the signature length. Defaults to 16.
+
+    Raises:
+        ValueError: If the number of bands does not divide the signature length
+
+    Returns:
+        set[tuple[int, int]]: Pairs of row numbers, the smaller first
+    """
+    if signatures.shape[1] % bands:
+        raise ValueError(f"Number of bands ({bands}) does not divide the signature length ({signatures.shape[1]})")
+    rows = signatures.shape[1] // bands
+    texts = np.flatnonzero((signatures != MERSENNE_PRIME).any(axis=1))
+    pairs: set[tuple[int, int]] = set()
+    for band in range(bands):
+        buckets = defaultdict(list)
+        for i in texts:
+            buckets[signatures[i, band * rows : (band + 1) * rows].tobytes()].append(int(i))
+        for bucket in buckets.values():
+            pairs.update(combinations(bucket, 2))
+    return pairs
+
+
+def find_near_duplicates(
+    signatures: np.ndarray, threshold: float = 0.8, bands: int = 16
+) -> list[tuple[int, int, float]]:
+    """Find pairs of texts whose estimated Jaccard similarity is at least the threshold. Only candidate pairs from `candidate_pairs` are compared.
+
+    Args:
+        signatures (np.ndarray): Signatures, one row per text
+        threshold (float, optional): Minimum similarity. Defaults to 0.8.
+        bands (int, optional): Number of bands. Defaults to 16.
+
+    Returns:
+        list[tuple[int, int, float]]: Pairs of row numbers and their similarity, sorted by row numbers
+    """
+    duplicates = []
+    for i, j in sorted(candidate_pairs(signatures, bands)):
+        if (score := similarity(signatures[i], signatures[j])) >= threshold:
+            duplicates.append((i, j, score))
+    return duplicates
+
+
+def duplicate_exclusions(names: Sequence[str], pairs: Sequence[tuple[int, int, float]]) -> list[str]:
+    """Group near-duplicate texts into clusters and return the names of all texts but the first of each cluster. Meeting text files start with the year, so the earliest meeting of each cluster is kept.
+
+    Args:
+        names (Sequence[str]): Name of each text
+        pairs (Sequence[tuple[int, int, float]]): Near-duplicate pairs from `find_near_duplicates`
+
+    Returns:
+        list[str]: Sorted names of the texts to exclude
+    """
+    parent = list(range(len(names)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j, _ in pairs:
+        first, second = find(i), find(j)
+        if first != second:
+            parent[max(first, second, key=lambda k: names[k])] = min(first, second, key=lambda k: names[k])
+    return sorted(names[i] for i in range(len(names)) if find(i) != i)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    pass
@@ -0,0 +1,209 @@
+import hashlib
+import math
+from typing import Iterable
+
+import numpy as np
+
+
+def paragraph_fingerprints(paragraphs: Iterable[str]) -> np.ndarray:
+    """64-bit fingerprints of paragraphs, the first 8 bytes of their BLAKE2b hash
+
+    Args:
+        paragraphs (Iterable[str]): Paragraphs
+
+    Returns:
+        np.ndarray: Fingerprints (uint64)
+    """
+    return np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(paragraph.encode('utf-8'), digest_size=8).digest(), 'little')
+            for paragraph in paragraphs
+        ),
+        dtype=np.uint64,
+    )
+
+
+def occurrence_numbers(inverse: np.ndarray) -> np.ndarray:
+    """Number each element by how many equal elements come before it in the batch
+
+    Args:
+        inverse (np.ndarray): Group of each element, e.g. the inverse of `np.unique`
+
+    Returns:
+        np.ndarray: 0 for the first element of each group, 1 for the second and so on
+    """
+    order = np.argsort(inverse, kind='stable')
+    sorted_groups = inverse[order]
+    numbers = np.empty(len(inverse), dtype=np.int64)
+    numbers[order] = np.arange(len(inverse)) - np.searchsorted(sorted_groups, sorted_groups)
+    return numbers
+
+
+class FingerprintCounter:
+    """Count set of 64-bit fingerprints backed by sorted numpy arrays, 12 bytes per fingerprint. New fingerprints are merged into a small sorted buffer, which is merged into the main arrays when it grows past an eighth of them, so adding is amortized O(n log n)."""
+
+    def __init__(self) -> None:
+        self.keys = np.empty(0, dtype=np.uint64)
+        self.counts = np.empty(0, dtype=np.uint32)
+        self.buffer_keys = np.empty(0, dtype=np.uint64)
+        self.buffer_counts = np.empty(0, dtype=np.uint32)
+
+    def __len__(self) -> int:
+        return len(self.keys) + len(self.buffer_keys)
+
+    @staticmethod
+    def _positions(keys: np.ndarray, fingerprints: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        positions = np.minimum(np.searchsorted(keys, fingerprints), max(len(keys) - 1, 0))
+        found = keys[positions] == fingerprints if len(keys) else np.zeros(len(fingerprints), dtype=bool)
+        return positions, found
+
+    def get(self, fingerprints: np.ndarray) -> np.ndarray:
+        """Counts of fingerprints
+
+        Args:
+            fingerprints (np.ndarray): Fingerprints
+
+        Returns:
+            np.ndarray: Count of each fingerprint, 0 if it has not been added
+        """
+        counts = np.zeros(len(fingerprints), dtype=np.int64)
+        for keys, values in [(self.keys, self.counts), (self.buffer_keys, self.buffer_counts)]:
+            positions, found = self._positions(keys, fingerprints)
+            counts[found] = values[positions[found]]
+        return counts
+
+    def add(self, fingerprints: np.ndarray) -> np.ndarray:
+        """Add fingerprints in order
+
+        Args:
+            fingerprints (np.ndarray): Fingerprints
+
+        Returns:
+            np.ndarray: Count of each fingerprint after it was added, 1 for the first occurrence
+        """
+        unique, inverse, batch_counts = np.unique(fingerprints, return_inverse=True, return_counts=True)
+        previous = self.get(unique)
+        totals = np.minimum(previous + batch_counts, np.iinfo(np.uint32).max).astype(np.uint32)
+
+        for keys, values in [(self.keys, self.counts), (self.buffer_keys, self.buffer_counts)]:
+            positions, found = self._positions(keys, unique)
+            values[positions[found]] = totals[found]
+        new = previous == 0
+        self.buffer_keys = np.concatenate([self.buffer_keys, unique[new]])
+        self.buffer_counts = np.concatenate([self.buffer_counts, totals[new]])
+        order = np.argsort(self.buffer_keys, kind='stable')
+        self.buffer_keys, self.buffer_counts = self.buffer_keys[order], self.buffer_counts[order]
+        if len(self.buffer_keys) > max(len(self.keys) // 8, 1024):
+            self.merge()
+
+        return previous[inverse] + occurrence_numbers(inverse) + 1
+
+    def merge(self) -> None:
+        """Merge the buffer into the main arrays"""
+        keys = np.concatenate([self.keys, self.buffer_keys])
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.counts = np.concatenate([self.counts, self.buffer_counts])[order]
+        self.buffer_keys = np.empty(0, dtype=np.uint64)
+        self.buffer_counts = np.empty(0, dtype=np.uint32)
+
+
+class BloomFilter:
+    """Bloom filter of 64-bit fingerprints with a fixed size. Membership tests can give false positives at about the error rate, but never false negatives."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        """Create an empty filter
+
+        Args:
+            capacity (int): Expected number of distinct fingerprints
+            error_rate (float, optional): False positive rate at capacity. Defaults to 0.001.
+        """
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / max(capacity, 1) * math.log(2)))
+        self.bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    def _bit_positions(self, fingerprints: np.ndarray) -> np.ndarray:
+        # Double hashing with the two halves of the fingerprint
+        low = fingerprints & np.uint64(0xFFFFFFFF)
+        high = (fingerprints >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.hashes, dtype=np.uint64)
+        return (low[:, None] + steps * high[:, None]) % np.uint64(self.size)
+
+    def contains(self, fingerprints: np.ndarray) -> np.ndarray:
+        """Test if fingerprints have been added
+
+        Args:
+            fingerprints (np.ndarray): Fingerprints
+
+        Returns:
+            np.ndarray: True for fingerprints that have probably been added
+        """
+        positions = self._bit_positions(fingerprints)
+        return ((self.bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1).all(axis=1)
+
+    def add(self, fingerprints: np.ndarray) -> np.ndarray:
+        """Add fingerprints in order
+
+        Args:
+            fingerprints (np.ndarray): Fingerprints
+
+        Returns:
+            np.ndarray: True for fingerprints that had probably been added before, including earlier in the batch
+        """
+        unique, index, inverse = np.unique(fingerprints, return_index=True, return_inverse=True)
+        seen = self.contains(unique)[inverse]
+        seen[np.setdiff1d(np.arange(len(fingerprints)), index)] = True
+        positions = self._bit_positions(unique).ravel()
+        np.bitwise_or.at(
+            self.bits, positions >> np.uint64(3), np.left_shift(1, positions & np.uint64(7)).astype(np.uint8)
+        )
+        return seen
+
+
+class ParagraphDeduplicator:
+    """Find paragraphs that were seen more than max_repeats times before, across all files deduplicated with the same deduplicator. Paragraphs are tracked by 64-bit fingerprints, counted in a `FingerprintCounter` or, with method 'bloom', recorded in a fixed-size `BloomFilter`, which only supports max_repeats=1 and can drop a unique paragraph at about the error rate."""
+
+    def __init__(
+        self, max_repeats: int = 1, method: str = 'counter', capacity: int = 10_000_000, error_rate: float = 0.001
+    ) -> None:
+        """Create a deduplicator
+
+        Args:
+            max_repeats (int, optional): Number of occurrences of a paragraph to keep. Defaults to 1.
+            method (str, optional): 'counter' or 'bloom'. Defaults to 'counter'.
+            capacity (int, optional): Expected number of distinct paragraphs for 'bloom'. Defaults to 10_000_000.
+            error_rate (float, optional): False positive rate for 'bloom'. Defaults to 0.001.
+
+        Raises:
+            ValueError: If the method is unknown, or max_repeats is not 1 for 'bloom'
+        """
+        if method == 'counter':
+            self.counter: FingerprintCounter | None = FingerprintCounter()
+            self.bloom_filter: BloomFilter | None = None
+        elif method == 'bloom':
+            if max_repeats != 1:
+                raise ValueError("A Bloom filter can only keep one occurrence of each paragraph")
+            self.counter = None
+            self.bloom_filter = BloomFilter(capacity, error_rate)
+        else:
+            raise ValueError(f"Unknown deduplication method: {method}")
+        self.max_repeats = max_repeats
+        self.method = method
+
+    def keep(self, fingerprints: np.ndarray) -> np.ndarray:
+        """Add the fingerprints of the paragraphs of a file, in order, and find the paragraphs to keep
+
+        Args:
+            fingerprints (np.ndarray): Paragraph fingerprints, see `paragraph_fingerprints`
+
+        Returns:
+            np.ndarray: False for paragraphs repeated more than max_repeats times
+        """
+        if self.bloom_filter is not None:
+            return ~self.bloom_filter.add(fingerprints)
+        assert self.counter is not None
+        return self.counter.add(fingerprints) <= self.max_repeats
+
+
+if __name__ == '__main__':  # pragma: no cover
+    pass
@@ -1,13 +1,14 @@
 # pylint: disable=useless-parent-delegation
-from langdetect import DetectorFactory, detect_langs
+from langdetect import detector_factory
 from langdetect.lang_detect_exception import LangDetectException
+from langdetect.language import Language
+
+from proceedings_curation.language_detectors.profile_store import get_profile_store
 
 # fmt: off
 DEFAULT_LANGUAGES = ['af', 'ar', 'bg', 'bn', 'ca', 'cs', 'cy', 'da', 'de', 'el', 'en', 'es', 'et', 'fa', 'fi', 'fr', 'gu', 'he', 'hi', 'hr', 'hu', 'id', 'it', 'ja', 'kn', 'ko', 'lt', 'lv', 'mk', 'ml', 'mr', 'ne', 'nl', 'no', 'pa', 'pl', 'pt', 'ro', 'ru', 'sk', 'sl', 'so', 'sq', 'sv', 'sw', 'ta', 'te', 'th', 'tl', 'tr', 'uk', 'ur', 'vi', 'zh-cn', 'zh-tw']
 # fmt: on
 
-DetectorFactory.seed = 0  # Necessary for deterministic results
-
 
 class LanguageDetector:
     """Base class for language detectors."""
@@ -31,13 +32,71 @@ class LanguageDetector:
 
 
 class LangDetect(LanguageDetector):
-    """Language detector using langdetect library."""
+    """Language detector using langdetect library. If profile_store is set, language profiles are loaded from a compiled, memory-mapped profile store at that path, which is created if it does not exist."""
 
     def __init__(self, **kwargs) -> None:  # type: ignore[no-untyped-def]
         super().__init__()
         self.options = kwargs
         self.possible_languages = kwargs.get("possible_languages", None)
         self.threshold = kwargs.get("threshold", None)
+        self.seed = kwargs.get("seed", 0)
+        self.max_chars = kwargs.get("max_chars", None)
+        self.window_size = kwargs.get("window_size", 200)
+        self.confidence = kwargs.get("confidence", 0.95)
+        self.profile_store = kwargs.get("profile_store", None)
+        if self.profile_store is not None:
+            get_profile_store(str(self.profile_store))
+
+    def detect_langs(self, text: str) -> list[Language]:
+        """Detect the probabilities of the languages of a text. The detector is seeded for every text, which makes the results deterministic without relying on the global `DetectorFactory.seed`, also when texts are detected in different processes.
+
+        If max_chars is set, texts longer than max_chars are detected adaptively: samples of 1, 2, 4, ... evenly spaced windows of window_size characters, up to max_chars characters, are detected in turn and the first sample where the most probable language reaches the confidence bound is used. The full text is only detected if no sample is conclusive.
+
+        Args:
+            text (str): Text to detect language
+
+        Raises:
+            LangDetectException: If no language features are found in the text
+
+        Returns:
+            list[Language]: Languages sorted by probability
+        """
+        if self.max_chars is not None and len(text) > self.max_chars:
+            windows = 1
+            while windows * self.window_size <= self.max_chars:
+                try:
+                    detections = self._detect_langs(self.sample(text, windows))
+                except LangDetectException:
+                    detections = []
+                if detections and detections[0].prob >= self.confidence:
+                    return detections
+                windows *= 2
+        return self._detect_langs(text)
+
+    def sample(self, text: str, windows: int) -> str:
+        """Sample evenly spaced windows of window_size characters from a text, starting with the beginning of the text.
+
+        Args:
+            text (str): Text to sample
+            windows (int): Number of windows
+
+        Returns:
+            str: Windows joined by spaces
+        """
+        if windows * self.window_size >= len(text):
+            return text
+        step = (len(text) - self.window_size) // max(windows - 1, 1)
+        return ' '.join(text[i * step : i * step + self.window_size] for i in range(windows))
+
+    def _detect_langs(self, text: str) -> list[Language]:
+        if self.profile_store is not None:
+            detector = get_profile_store(str(self.profile_store)).create()
+        else:
+            detector_factory.init_factory()
+            detector = detector_factory._factory.create()  # pylint: disable=protected-access
+        detector.seed = self.seed
+        detector.append(text)
+        return detector.get_probabilities()
 
     def detect(self, text: str) -> str | None:
         """Detect language of a text. If possible_languages is set, only those languages will be considered. If threshold is set, only languages with a probability higher than the threshold will be considered. If both possible_languages and threshold are set, both conditions must be met. If no language is detected, None is returned.
@@ -52,13 +111,13 @@ class LangDetect(LanguageDetector):
             if self.threshold is None:
                 detections = [
                     d
-                    for d in detect_langs(text)
+                    for d in self.detect_langs(text)
                     if self.possible_languages is None or d.lang in self.possible_languages
                 ]
             else:
                 detections = [
                     d
-                    for d in detect_langs(text)
+                    for d in self.detect_langs(text)
                     if (self.possible_languages is None or d.lang in self.possible_languages)
                     and d.prob >= self.threshold
                 ]
@@ -0,0 +1,159 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+from functools import lru_cache
+
+import numpy as np
+from langdetect.detector import Detector
+from langdetect.detector_factory import PROFILES_DIRECTORY, DetectorFactory
+from langdetect.lang_detect_exception import ErrorCode, LangDetectException
+from langdetect.utils.ngram import NGram
+
+MAGIC = b'LDPS'
+VERSION = 1
+HEADER = struct.Struct('<4sIIII')  # magic, version, number of languages, number of n-grams, length of language list
+
+
+def ngram_key(ngram: str) -> int:
+    """Stable 64-bit key of an n-gram, the same in every process
+
+    Args:
+        ngram (str): N-gram
+
+    Returns:
+        int: Key
+    """
+    return int.from_bytes(hashlib.blake2b(ngram.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def compile_profile_store(path: str | os.PathLike[str], profile_directory: str = PROFILES_DIRECTORY) -> None:
+    """Compile langdetect language profiles into a binary file that can be memory-mapped.
+
+    The file holds a header, the language list, the sorted 64-bit keys of all n-grams and a float64 matrix with one row of language probabilities per n-gram. The file is written to a temporary file and moved into place, so concurrent readers never see a partial file.
+
+    Args:
+        path (str | os.PathLike[str]): Path to save the profile store
+        profile_directory (str, optional): Folder with langdetect JSON profiles. Defaults to the profiles shipped with langdetect.
+
+    Raises:
+        ValueError: If two n-grams have the same key
+    """
+    factory = DetectorFactory()
+    factory.load_profile(profile_directory)
+
+    words = list(factory.word_lang_prob_map)
+    keys = np.fromiter((ngram_key(word) for word in words), dtype='<u8', count=len(words))
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    if len(keys) > 1 and (keys[1:] == keys[:-1]).any():  # pragma: no cover
+        raise ValueError('N-gram key collision in language profiles')
+    probs = np.array([factory.word_lang_prob_map[words[i]] for i in order], dtype='<f8')
+
+    langs = '\n'.join(factory.langlist).encode('utf-8')
+    header = HEADER.pack(MAGIC, VERSION, len(factory.langlist), len(words), len(langs)) + langs
+    header += b'\0' * (-len(header) % 8)
+
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    with tempfile.NamedTemporaryFile('wb', dir=folder, delete=False) as file:
+        file.write(header)
+        file.write(keys.tobytes())
+        file.write(probs.tobytes())
+    os.chmod(file.name, 0o644)
+    os.replace(file.name, path)
+
+
+class MappedDetectorFactory(DetectorFactory):
+    """Detector factory backed by a memory-mapped profile store. The store is mapped read-only, so processes using the same store share its pages instead of each building their own profile dictionaries."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        super().__init__()
+        with open(path, 'rb') as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n_langs, n_words, langs_length = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC or version != VERSION:
+            raise LangDetectException(ErrorCode.FormatError, f'Not a profile store: "{path}"')
+        offset = HEADER.size
+        self.langlist = self.buffer[offset : offset + langs_length].decode('utf-8').split('\n')
+        offset += langs_length + (-(offset + langs_length) % 8)
+        self.keys = np.frombuffer(self.buffer, dtype='<u8', count=n_words, offset=offset)
+        self.probs = np.frombuffer(
+            self.buffer, dtype='<f8', count=n_words * n_langs, offset=offset + 8 * n_words
+        ).reshape(n_words, n_langs)
+
+    def load_profile(self, profile_directory: str) -> None:
+        """Profiles cannot be added to a factory backed by a profile store, since all its profiles come from the compiled store. Compile a new store with `compile_profile_store` instead.
+
+        Args:
+            profile_directory (str): Folder of langdetect profiles
+
+        Raises:
+            LangDetectException: Always, the profiles of the store are already loaded
+        """
+        raise LangDetectException(
+            ErrorCode.DuplicateLangError, f'Profiles are loaded from the profile store, not from "{profile_directory}"'
+        )
+
+    def _create_detector(self) -> Detector:
+        return MappedDetector(self)
+
+
+class MappedDetector(Detector):  # type: ignore[misc]
+    """Detector that looks n-grams up in a memory-mapped profile store. It extracts the same n-grams in the same order as `Detector` and uses the same probabilities, so it gives the same results."""
+
+    def __init__(self, factory: MappedDetectorFactory) -> None:
+        super().__init__(factory)
+        self.keys = factory.keys
+        self.probs = factory.probs
+        self.rows: dict[int, list[float]] = {}
+
+    def _extract_ngrams(self) -> list[int]:  # type: ignore[override]
+        """Extract n-grams from target text as rows in the profile store"""
+        candidates = []
+        ngram = NGram()
+        for ch in self.text:
+            ngram.add_char(ch)
+            if ngram.capitalword:
+                continue
+            for n in range(1, NGram.N_GRAM + 1):
+                if len(ngram.grams) < n:
+                    break
+                w = ngram.grams[-n:]
+                if w and w != ' ':
+                    candidates.append(w)
+        if not candidates:
+            return []
+        unique = {w: ngram_key(w) for w in candidates}
+        keys = np.fromiter((unique[w] for w in candidates), dtype='<u8', count=len(candidates))
+        rows = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        return rows[self.keys[rows] == keys].tolist()
+
+    def _update_lang_prob(self, prob: list[float], word: int, alpha: float) -> bool:  # type: ignore[override]
+        """Update language probabilities with the n-gram in row `word` of the profile store"""
+        if (lang_prob_map := self.rows.get(word)) is None:
+            lang_prob_map = self.rows[word] = self.probs[word].tolist()
+        weight = alpha / self.BASE_FREQ
+        for i in range(len(prob)):
+            prob[i] *= weight + lang_prob_map[i]
+        return True
+
+
+@lru_cache(maxsize=None)
+def get_profile_store(path: str) -> MappedDetectorFactory:
+    """Get the detector factory for a profile store, compiling the store first if it does not exist. The factory is created once per process.
+
+    Args:
+        path (str): Path to the profile store
+
+    Returns:
+        MappedDetectorFactory: Detector factory
+    """
+    if not os.path.exists(path):
+        compile_profile_store(path)
+    return MappedDetectorFactory(path)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    pass
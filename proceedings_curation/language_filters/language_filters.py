@@ -1,4 +1,7 @@
-from typing import List
+from bisect import bisect_left
+from collections import Counter
+from functools import partial
+from typing import List, Sequence
 
 from proceedings_curation.language_detectors.language_detectors import LangDetect, LanguageDetector
 
@@ -11,37 +14,100 @@ class LanguageFilter:
         languages: str | List[str],
         keep_undetected: bool = False,
         language_detector: LanguageDetector | None = None,
+        min_length: int | None = None,
+        context: int = 2,
     ) -> None:
         """Create a language filter for paragraphs.
 
+        If min_length is set, the language of paragraphs shorter than min_length is not detected. Instead, such paragraphs are assigned the most common language of the `context` nearest detected paragraphs on each side, with ties going to the nearest paragraph.
+
         Args:
             languages (str | List[str]): List of languages to keep
             keep_undetected (bool, optional): Keep paragraphs with undetected language. Defaults to False.
             language_detector (LanguageDetector | None, optional): Language detector. Defaults to None.
+            min_length (int | None, optional): Minimum length of paragraphs to detect. Defaults to None.
+            context (int, optional): Number of detected paragraphs on each side used for short paragraphs. Defaults to 2.
         """
         self.languages = languages if isinstance(languages, list) else [languages]
         self.keep_undetected = keep_undetected
+        self.min_length = min_length
+        self.context = context
 
         if isinstance(language_detector, LanguageDetector):
             self.language_detector = language_detector
         else:
             self.language_detector = LangDetect(possible_languages=self.languages)
 
-    def filter(self, paragraphs: List[str]) -> List[str]:
-        """Filter paragraphs by language. If keep_undetected is True, paragraphs with undetected language will be kept. If keep_undetected is False, paragraphs with undetected language will be removed. If a language detector is provided, it will be used to detect the language of the paragraphs. If no language detector is provided, a LangDetect language detector will be used. If a paragraph is detected as one of the languages provided in the constructor, it will be kept. If a paragraph is detected as an undetected language and keep_undetected is True, it will be kept. If a paragraph is detected as an undetected language and keep_undetected is False, it will be removed.
+    def filter(self, paragraphs: Sequence[str], languages: Sequence[str | None] | None = None) -> List[str]:
+        """Filter paragraphs by language. If keep_undetected is True, paragraphs with undetected language will be kept. If keep_undetected is False, paragraphs with undetected language will be removed. If a language detector is provided, it will be used to detect the language of the paragraphs. If no language detector is provided, a LangDetect language detector will be used. If a paragraph is detected as one of the languages provided in the constructor, it will be kept. If a paragraph is detected as an undetected language and keep_undetected is True, it will be kept. If a paragraph is detected as an undetected language and keep_undetected is False, it will be removed. If the languages of the paragraphs are already known, they can be passed to skip detection.
 
         Args:
-            paragraphs (List[str]): List of paragraphs
+            paragraphs (Sequence[str]): List of paragraphs
+            languages (Sequence[str | None] | None, optional): Detected language of each paragraph. Defaults to None.
 
         Returns:
             List[str]: Filtered list of paragraphs
         """
-        return [
-            paragraph
-            for paragraph in paragraphs
-            if self.language_detector.detect(paragraph) in self.languages
-            or (self.keep_undetected and self.language_detector.detect(paragraph) is None)
+        if languages is None:
+            languages = self.detect_languages(paragraphs)
+        return [paragraph for paragraph, language in zip(paragraphs, languages) if self.keep(language)]
+
+    def detect_languages(self, paragraphs: Sequence[str]) -> List[str | None]:
+        """Detect the language of each paragraph. If min_length is set, paragraphs shorter than min_length are assigned the language of their context instead.
+
+        Args:
+            paragraphs (Sequence[str]): List of paragraphs
+
+        Returns:
+            List[str | None]: Detected language of each paragraph, None if language could not be detected
+        """
+        if self.min_length is None:
+            return [self.language_detector.detect(paragraph) for paragraph in paragraphs]
+        skipped = [len(paragraph) < self.min_length for paragraph in paragraphs]
+        languages = [
+            None if skip else self.language_detector.detect(paragraph) for paragraph, skip in zip(paragraphs, skipped)
         ]
+        return smooth_languages(languages, skipped, self.context)
+
+    def keep(self, language: str | None) -> bool:
+        """Check if a paragraph with the given detected language should be kept.
+
+        Args:
+            language (str | None): Detected language, None if language could not be detected
+
+        Returns:
+            bool: True if the paragraph should be kept
+        """
+        return language in self.languages or (self.keep_undetected and language is None)
+
+
+def smooth_languages(languages: List[str | None], skipped: List[bool], context: int = 2) -> List[str | None]:
+    """Assign skipped paragraphs the most common language of the `context` nearest detected paragraphs on each side. Ties go to the language of the nearest paragraph, preceding before following.
+
+    Args:
+        languages (List[str | None]): Detected language of each paragraph
+        skipped (List[bool]): Whether detection was skipped for each paragraph
+        context (int, optional): Number of detected paragraphs on each side. Defaults to 2.
+
+    Returns:
+        List[str | None]: Language of each paragraph, None if it could neither be detected nor inferred from context
+    """
+    detected = [i for i, (language, skip) in enumerate(zip(languages, skipped)) if not skip and language is not None]
+    smoothed = list(languages)
+    for i, skip in enumerate(skipped):
+        if not skip or not detected:
+            continue
+        position = bisect_left(detected, i)
+        neighbours = detected[max(position - context, 0) : position + context]
+        nearest = sorted(neighbours, key=partial(_distance, i))
+        counts = Counter(languages[j] for j in neighbours)
+        smoothed[i] = max((languages[j] for j in nearest), key=counts.__getitem__)
+    return smoothed
+
+
+def _distance(i: int, j: int) -> tuple[int, int]:
+    """Sort key of paragraph j by its distance to paragraph i, the earlier paragraph first on ties"""
+    return abs(j - i), j
 
 
 if __name__ == '__main__':  # pragma: no cover
@@ -0,0 +1,154 @@
+import os
+from enum import Enum
+
+import pandas as pd
+
+from proceedings_curation.metadata.schema import INDEX_NAME
+
+# Meetings are matched within a record and volume of the proceedings
+RECORD_KEY = ['record_number', 'volume']
+
+# Meeting ids are the record number followed by a 4 digit number of the meeting within the record
+MEETINGS_PER_RECORD = 10000
+
+
+class Change(str, Enum):
+    added = 'added'
+    modified = 'modified'
+    removed = 'removed'
+
+
+def renumber_meetings(previous: pd.DataFrame, index: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Give the meetings of a new metadata index the meeting ids they have in the previous index, and find the meetings that changed.
+
+    Meetings are matched within each record and volume: first rows that are the same in both indexes, then rows with the same pages, which are modified meetings. Both keep their previous meeting id. Other meetings of the new index are added and get the next free meeting ids of their record, and other meetings of the previous index are removed. Only records with changes get new meeting ids, so an unchanged record is the same as in the previous index.
+
+    Args:
+        previous (pd.DataFrame): Previous metadata index, e.g. loaded with `load_metadata_index`
+        index (pd.DataFrame): New metadata index, created with `create_metadata_index`
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: New metadata index with stable meeting ids, and the change set with the meeting id, record number, volume, change and changed columns of each added, modified or removed meeting
+    """
+    columns = index.columns.tolist()
+    previous = previous.reindex(columns=columns)
+    new = _meetings(index)
+    old = _meetings(previous)
+
+    # Same rows, then same pages
+    same = new.merge(old, on=[*RECORD_KEY, 'row_hash', 'row_occurrence'], how='inner', suffixes=('', '_previous'))
+    unmatched_new = new[~new.position.isin(same.position)]
+    unmatched_old = old[~old.position.isin(same.position_previous)]
+    unmatched_new = unmatched_new.assign(
+        pages_occurrence=unmatched_new.groupby([*RECORD_KEY, 'pages'], dropna=False).cumcount()
+    )
+    unmatched_old = unmatched_old.assign(
+        pages_occurrence=unmatched_old.groupby([*RECORD_KEY, 'pages'], dropna=False).cumcount()
+    )
+    modified = unmatched_new.merge(
+        unmatched_old, on=[*RECORD_KEY, 'pages', 'pages_occurrence'], how='inner', suffixes=('', '_previous')
+    )
+
+    meeting_ids = pd.Series(pd.NA, index=new.position, dtype='Int64')
+    meeting_ids.loc[same.position] = same.meeting_id_previous.to_numpy()
+    meeting_ids.loc[modified.position] = modified.meeting_id_previous.to_numpy()
+
+    # Added meetings are numbered after the highest meeting id of their record in either index
+    added = new[meeting_ids.isna().to_numpy()]
+    if len(added) > 0:
+        used = pd.concat([old.meeting_id, new.meeting_id[meeting_ids.notna().to_numpy()]])
+        next_number = (used // MEETINGS_PER_RECORD).to_frame('record').assign(number=used % MEETINGS_PER_RECORD + 1)
+        start = next_number.groupby('record').number.max()
+        records = added.record_number.astype('int64')
+        meeting_ids.loc[added.position] = (
+            records * MEETINGS_PER_RECORD
+            + records.map(start).fillna(0).astype('int64')
+            + added.groupby('record_number').cumcount()
+        ).to_numpy()
+
+    result = index.copy()
+    result.index = pd.Index(meeting_ids.to_numpy(dtype='int64'), name=INDEX_NAME)
+
+    removed = old[~old.position.isin(same.position_previous) & ~old.position.isin(modified.position_previous)]
+    changed_columns = [
+        ','.join(
+            column
+            for column in columns
+            if not _same_value(index.iloc[new_position][column], previous.iloc[old_position][column])
+        )
+        for new_position, old_position in zip(modified.position, modified.position_previous)
+    ]
+    changes = pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    INDEX_NAME: meeting_ids.loc[added.position].to_numpy(dtype='int64'),
+                    'record_number': added.record_number.to_numpy(),
+                    'volume': added.volume.to_numpy(),
+                    'change': Change.added.value,
+                    'columns': '',
+                }
+            ),
+            pd.DataFrame(
+                {
+                    INDEX_NAME: modified.meeting_id_previous.to_numpy(dtype='int64'),
+                    'record_number': modified.record_number.to_numpy(),
+                    'volume': modified.volume.to_numpy(),
+                    'change': Change.modified.value,
+                    'columns': changed_columns,
+                }
+            ),
+            pd.DataFrame(
+                {
+                    INDEX_NAME: removed.meeting_id.to_numpy(dtype='int64'),
+                    'record_number': removed.record_number.to_numpy(),
+                    'volume': removed.volume.to_numpy(),
+                    'change': Change.removed.value,
+                    'columns': '',
+                }
+            ),
+        ],
+        ignore_index=True,
+    )
+    changes['volume'] = changes['volume'].astype('UInt8')
+    return result, changes.sort_values(INDEX_NAME, ignore_index=True)
+
+
+def _meetings(index: pd.DataFrame) -> pd.DataFrame:
+    """Record key, pages, row hash and position of each meeting, with the occurrence of the row hash within the record"""
+    meetings = pd.DataFrame(
+        {
+            'meeting_id': index.index.to_numpy(dtype='int64'),
+            'record_number': index['record_number'].to_numpy(dtype='int64'),
+            'volume': index['volume'].astype('Int64').to_numpy(),
+            'pages': index['pages'].astype('string').to_numpy(),
+            'row_hash': pd.util.hash_pandas_object(index.astype(object), index=False).to_numpy(),
+            'position': range(len(index)),
+        }
+    )
+    meetings['volume'] = meetings['volume'].astype('Int64')
+    meetings['row_occurrence'] = meetings.groupby([*RECORD_KEY, 'row_hash'], dropna=False).cumcount()
+    return meetings
+
+
+def _same_value(value: object, other: object) -> bool:
+    if pd.isna(value) or pd.isna(other):
+        return bool(pd.isna(value) and pd.isna(other))
+    return bool(value == other)
+
+
+def touched_meetings(changes: str | os.PathLike[str]) -> list[int]:
+    """Meeting ids of the added and modified meetings of a change set saved by `create_metadata_index`, e.g. to extract only those meetings
+
+    Args:
+        changes (str | os.PathLike[str]): Path to the change set, a CSV file
+
+    Returns:
+        list[int]: Meeting ids
+    """
+    change_set = pd.read_csv(changes, sep=';', encoding='utf-8-sig')
+    return change_set.loc[change_set.change.isin([Change.added.value, Change.modified.value]), INDEX_NAME].tolist()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    pass
@@ -0,0 +1,236 @@
+import datetime
+import hashlib
+import importlib.util
+import json
+import math
+import os
+import re
+from enum import Enum
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+# Bump to invalidate caches written by earlier versions
+CACHE_VERSION = 1
+CACHE_METADATA_KEY = b'proceedings_curation.excel_cache'
+
+# Control characters that a workbook can only store escaped as _xHHHH_, which openpyxl leaves escaped and calamine decodes
+ESCAPED_CHARACTERS = re.compile('[\x01-\x08\x0b\x0c\r\x0e-\x1f]')
+
+
+class Engine(str, Enum):
+    auto = 'auto'
+    calamine = 'calamine'
+    openpyxl = 'openpyxl'
+
+
+def resolve_engine(engine: Engine | str = Engine.auto) -> Engine:
+    """Engine used to read workbooks. 'auto' is the compiled calamine reader if python-calamine is installed, and openpyxl otherwise.
+
+    Args:
+        engine (Engine | str, optional): Engine. Defaults to Engine.auto.
+
+    Raises:
+        ImportError: If the calamine engine is requested and python-calamine is not installed
+
+    Returns:
+        Engine: calamine or openpyxl
+    """
+    engine = Engine(engine)
+    has_calamine = importlib.util.find_spec('python_calamine') is not None
+    if engine == Engine.auto:
+        return Engine.calamine if has_calamine else Engine.openpyxl
+    if engine == Engine.calamine and not has_calamine:
+        raise ImportError('python-calamine is required to read workbooks with the calamine engine')
+    return engine
+
+
+def read_workbook(path: Any, engine: Engine | str = Engine.auto, **kwargs: Any) -> pd.DataFrame:
+    """Read a workbook with `pd.read_excel` and an engine. The frames are the same whichever engine is used: calamine values are converted to what openpyxl returns, see `_as_openpyxl`.
+
+    Args:
+        path (Any): Path to the workbook, or a file-like object
+        engine (Engine | str, optional): Engine, see `resolve_engine`. Defaults to Engine.auto.
+        **kwargs: Options passed to `pd.read_excel`, e.g. `dtype`
+
+    Returns:
+        pd.DataFrame: Sheet
+    """
+    engine = resolve_engine(engine)
+    frame = pd.read_excel(path, engine=engine.value, **kwargs)
+    if engine == Engine.calamine:
+        frame.columns = frame.columns.map(_as_openpyxl) if frame.columns.dtype == object else frame.columns
+        if frame.index.dtype == object:
+            frame.index = frame.index.map(_as_openpyxl)
+        for i, dtype in enumerate(frame.dtypes):
+            column = frame.iloc[:, i]
+            if isinstance(dtype, pd.CategoricalDtype) and dtype.categories.dtype == object:
+                frame.isetitem(i, column.cat.rename_categories(dtype.categories.map(_as_openpyxl)))
+            elif dtype == object or isinstance(dtype, pd.StringDtype):
+                frame.isetitem(i, pd.Series(column.map(_as_openpyxl), index=frame.index, dtype=dtype))
+    return frame
+
+
+def _as_openpyxl(value: Any) -> Any:
+    """Convert a value read by calamine to the value read by openpyxl: dates are `datetime.datetime` instead of `pd.Timestamp`, and escaped control characters are left escaped"""
+    if isinstance(value, str):
+        return ESCAPED_CHARACTERS.sub(lambda match: f'_x{ord(match.group()):04X}_', value)
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    return value
+
+
+def cache_path(path: str | os.PathLike[str], **kwargs: Any) -> str:
+    """Path of the Parquet cache of a workbook read with some `pd.read_excel` options. The cache is a hidden file next to the workbook, with a digest of the options in its name, so reads with different options have their own cache.
+
+    Args:
+        path (str | os.PathLike[str]): Path to the workbook
+        **kwargs: Options passed to `pd.read_excel`
+
+    Returns:
+        str: Path to the cache
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    options = hashlib.sha256(_options_key(kwargs).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(directory, f'.{name}.{options}.parquet')
+
+
+def read_excel(
+    path: str | os.PathLike[str], cache: bool = True, engine: Engine | str = Engine.auto, **kwargs: Any
+) -> pd.DataFrame:
+    """Read a workbook with `pd.read_excel`, through a Parquet copy next to the workbook.
+
+    The copy is used while the size and modification time of the workbook are unchanged, or its SHA-256 hash is unchanged, and is rewritten otherwise. The copy does not depend on the engine, since both engines return the same frame. Dtypes and index are preserved, and object columns keep the type of each cell (e.g. a column with both numbers and strings). Without pyarrow, or if the copy cannot be written, the workbook is read directly.
+
+    Args:
+        path (str | os.PathLike[str]): Path to the workbook
+        cache (bool, optional): Use the Parquet copy. Defaults to True.
+        engine (Engine | str, optional): Engine used to read the workbook, see `resolve_engine`. Defaults to Engine.auto.
+        **kwargs: Options passed to `pd.read_excel`, e.g. `dtype`
+
+    Returns:
+        pd.DataFrame: Sheet, the same as `pd.read_excel(path, **kwargs)`
+    """
+    if not cache or not isinstance(path, (str, os.PathLike)):
+        return read_workbook(path, engine, **kwargs)
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel
+        import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+    except ImportError:  # pragma: no cover
+        return read_workbook(path, engine, **kwargs)
+
+    cached = cache_path(path, **kwargs)
+    stat = os.stat(path)
+    stamp = {'version': CACHE_VERSION, 'options': _options_key(kwargs), 'pandas': pd.__version__}
+    if os.path.exists(cached):
+        try:
+            metadata = json.loads(pyarrow.parquet.read_schema(cached).metadata[CACHE_METADATA_KEY])
+            if {key: metadata.get(key) for key in stamp} == stamp:
+                if metadata['size'] == stat.st_size and metadata['mtime_ns'] == stat.st_mtime_ns:
+                    logger.debug(f'Loading cached "{path}"')
+                    return _read_cache(cached)
+                if metadata['sha256'] == _file_hash(path):
+                    frame = _read_cache(cached)
+                    _write_cache(frame, cached, {**metadata, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns})
+                    return frame
+        except (OSError, KeyError, ValueError, pyarrow.ArrowException) as e:
+            logger.warning(f'Ignoring unreadable cache "{cached}": {e}')
+
+    frame = read_workbook(path, engine, **kwargs)
+    _write_cache(
+        frame, cached, {**stamp, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': _file_hash(path)}
+    )
+    return frame
+
+
+def _options_key(options: dict[str, Any]) -> str:
+    return repr(sorted(options.items()))
+
+
+def _file_hash(path: str | os.PathLike[str]) -> str:
+    with open(path, 'rb') as file:
+        return hashlib.file_digest(file, 'sha256').hexdigest()
+
+
+def _encode_value(value: Any) -> str | None:  # pylint: disable=too-many-return-statements
+    """Encode a cell of an object column as a string tagged with its type. Numpy scalars are encoded as the Python bool, int or float they hold."""
+    if isinstance(value, (float, np.floating)) and math.isnan(value):
+        return None
+    if value is None:
+        return 'n:'
+    if isinstance(value, (bool, np.bool_)):
+        return f'b:{int(value)}'
+    if isinstance(value, (int, np.integer)):
+        return f'i:{int(value)}'
+    if isinstance(value, (float, np.floating)):
+        return f'f:{float(value)!r}'
+    if isinstance(value, str):
+        return f's:{value}'
+    if isinstance(value, pd.Timestamp):
+        return f'p:{value.isoformat()}'
+    if isinstance(value, datetime.datetime):
+        return f'd:{value.isoformat()}'
+    if isinstance(value, datetime.date):
+        return f'a:{value.isoformat()}'
+    if isinstance(value, datetime.time):
+        return f't:{value.isoformat()}'
+    raise TypeError(f'Cannot cache value of type {type(value).__name__}')
+
+
+DECODERS = {
+    'n': lambda value: None,
+    'b': lambda value: bool(int(value)),
+    'i': int,
+    'f': float,
+    's': str,
+    'p': pd.Timestamp,
+    'd': datetime.datetime.fromisoformat,
+    'a': datetime.date.fromisoformat,
+    't': datetime.time.fromisoformat,
+}
+
+
+def _decode_value(value: str | None) -> Any:
+    if value is None:
+        return math.nan
+    return DECODERS[value[0]](value[2:])
+
+
+def _write_cache(frame: pd.DataFrame, cached: str, metadata: dict[str, Any]) -> None:
+    """Write a frame as Parquet with its object columns encoded, see `_encode_value`. Failing to write is logged and ignored."""
+    import pyarrow  # pylint: disable=import-outside-toplevel
+    import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+
+    try:
+        encoded = frame.copy(deep=False)
+        columns = [i for i, dtype in enumerate(frame.dtypes) if dtype == object]
+        for i in columns:
+            encoded.isetitem(
+                i, pd.Series([_encode_value(value) for value in frame.iloc[:, i]], index=frame.index, dtype=object)
+            )
+        table = pyarrow.Table.from_pandas(encoded)
+        table = table.replace_schema_metadata(
+            {**table.schema.metadata, CACHE_METADATA_KEY: json.dumps({**metadata, 'objects': columns})}
+        )
+        pyarrow.parquet.write_table(table, f'{cached}.tmp')
+        os.replace(f'{cached}.tmp', cached)
+    except (OSError, TypeError, ValueError, pyarrow.ArrowException) as e:
+        logger.warning(f'Could not cache "{cached}": {e}')
+
+
+def _read_cache(cached: str) -> pd.DataFrame:
+    import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+
+    table = pyarrow.parquet.read_table(cached)
+    frame = table.to_pandas()
+    for i in json.loads(table.schema.metadata[CACHE_METADATA_KEY])['objects']:
+        frame.isetitem(
+            i, pd.Series([_decode_value(value) for value in frame.iloc[:, i]], index=frame.index, dtype=object)
+        )
+    return frame
+
+
+if __name__ == '__main__':  # pragma: no cover
+    pass
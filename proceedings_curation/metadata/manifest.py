@@ -0,0 +1,84 @@
+import hashlib
+import os
+from typing import Any
+
+import pandas as pd
+
+from proceedings_curation.metadata.meetings import meeting_filename
+
+
+def file_hash(path: str | os.PathLike[str]) -> str:
+    """Return the SHA-256 hash of a file
+
+    Args:
+        path (str | os.PathLike[str]): Path to the file
+
+    Returns:
+        str: Hex digest
+    """
+    with open(path, 'rb') as file:
+        return hashlib.file_digest(file, 'sha256').hexdigest()
+
+
+def row_hash(row: pd.Series) -> str:
+    """Return the SHA-256 hash of a metadata index row
+
+    Args:
+        row (pd.Series): Metadata index row
+
+    Returns:
+        str: Hex digest
+    """
+    return hashlib.sha256(row.to_json(date_format='iso', default_handler=str).encode('utf-8')).hexdigest()
+
+
+def manifest_entry(
+    meeting_id: Any, row: pd.Series, input_path: str, previous: dict[str, Any] | None = None
+) -> dict[str, Any] | None:
+    """Return the manifest entry of a meeting. The text file is only hashed if its size or modification time differs from the previous entry.
+
+    Args:
+        meeting_id (Any): Meeting id
+        row (pd.Series): Metadata index row of the meeting
+        input_path (str): Path to the folder of text files
+        previous (dict[str, Any] | None, optional): Entry of the meeting in the previous manifest. Defaults to None.
+
+    Returns:
+        dict[str, Any] | None: Manifest entry, or None if the text file is not found
+    """
+    filename = meeting_filename(meeting_id, row)
+    path = os.path.join(input_path, filename)
+    if not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    if previous is not None and previous['size'] == stat.st_size and previous['mtime_ns'] == stat.st_mtime_ns:
+        text_hash = previous['text_hash']
+    else:
+        text_hash = file_hash(path)
+    return {
+        'meeting_id': str(meeting_id),
+        'file': filename,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'text_hash': text_hash,
+        'meta_hash': row_hash(row),
+    }
+
+
+def is_unchanged(entry: dict[str, Any], previous: dict[str, tuple[dict[str, Any], bytes]]) -> bool:
+    """Return True if the text file and metadata of a meeting are the same as in the previous build
+
+    Args:
+        entry (dict[str, Any]): Manifest entry of the meeting
+        previous (dict[str, tuple[dict[str, Any], bytes]]): Manifest entries and JSON lines of the previous build by meeting id
+
+    Returns:
+        bool: True if the record of the meeting can be reused
+    """
+    if (previous_entry := previous.get(entry['meeting_id'])) is None:
+        return False
+    return previous_entry[0]['text_hash'] == entry['text_hash'] and previous_entry[0]['meta_hash'] == entry['meta_hash']
+
+
+if __name__ == '__main__':  # pragma: no cover
+    pass
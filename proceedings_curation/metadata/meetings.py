@@ -0,0 +1,21 @@
+from typing import Any
+
+import pandas as pd
+
+
+def meeting_filename(meeting_id: Any, row: pd.Series) -> str:
+    """Return the name of the text file of a meeting
+
+    Args:
+        meeting_id (Any): Meeting id
+        row (pd.Series): Metadata index row of the meeting
+
+    Returns:
+        str: Name of the text file
+    """
+    year = row.conference_date if not pd.isna(row.date_meeting) else row.date_meeting.year
+    return f"{year}_{meeting_id}_{'_'.join(row.title_meeting.split()[:3]).lower()}.txt"
+
+
+if __name__ == '__main__':  # pragma: no cover
+    pass
@@ -0,0 +1,132 @@
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, Mapping, Sequence
+
+import pandas as pd
+from loguru import logger
+
+
+class Severity(str, Enum):
+    error = 'error'
+    nonfatal = 'nonfatal'
+    warning = 'warning'
+
+
+# Log level of each severity. Non-fatal violations are logged as errors, but do not stop validation.
+LOG_LEVELS = {Severity.error: 'ERROR', Severity.nonfatal: 'ERROR', Severity.warning: 'WARNING'}
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Validation rule. The check returns a boolean mask of the rows that break the rule."""
+
+    name: str
+    message: str
+    check: Callable[[pd.DataFrame], pd.Series]
+    columns: tuple[str, ...] = ()
+    severity: Severity = Severity.error
+
+
+@dataclass
+class Violation:
+    """Rows that break a rule, with the values of the rule's columns"""
+
+    rule: str
+    message: str
+    severity: Severity
+    rows: pd.DataFrame
+
+    def __str__(self) -> str:
+        return f"{self.message}\n{self.rows}"
+
+
+@dataclass
+class ValidationReport:
+    """Violations of all rules, in rule order"""
+
+    violations: list[Violation] = field(default_factory=list)
+
+    @property
+    def errors(self) -> list[Violation]:
+        return [violation for violation in self.violations if violation.severity == Severity.error]
+
+    @property
+    def nonfatal(self) -> list[Violation]:
+        return [violation for violation in self.violations if violation.severity == Severity.nonfatal]
+
+    @property
+    def warnings(self) -> list[Violation]:
+        return [violation for violation in self.violations if violation.severity == Severity.warning]
+
+    def log(self) -> None:
+        """Log each violation at the level of its severity, see `LOG_LEVELS`"""
+        for violation in self.violations:
+            logger.log(LOG_LEVELS[violation.severity], str(violation))
+
+    def raise_for_errors(self) -> None:
+        """Raise an error listing all violations of rules with severity 'error'
+
+        Raises:
+            ValueError: If any rule with severity 'error' is broken
+        """
+        if errors := self.errors:
+            raise ValueError('\n\n'.join(str(violation) for violation in errors))
+
+    def to_frame(self) -> pd.DataFrame:
+        """Report as a table with one row per violation and row, with the row id and the offending values
+
+        Returns:
+            pd.DataFrame: Columns rule, severity, message, row and values
+        """
+        return pd.DataFrame(
+            [
+                (
+                    violation.rule,
+                    violation.severity.value,
+                    violation.message,
+                    row_id,
+                    '; '.join(f'{column}={value}' for column, value in values.items()),
+                )
+                for violation in self.violations
+                for row_id, values in violation.rows.iterrows()
+            ],
+            columns=['rule', 'severity', 'message', 'row', 'values'],
+        )
+
+
+def validate(
+    frame: pd.DataFrame, rules: Sequence[Rule], severities: Mapping[str, Severity | str] | None = None
+) -> ValidationReport:
+    """Check all rules against a frame and collect the violations, instead of stopping at the first broken rule
+
+    Args:
+        frame (pd.DataFrame): Frame to validate, with any derived columns the rules need computed once up front
+        rules (Sequence[Rule]): Rules
+        severities (Mapping[str, Severity | str] | None, optional): Severity by rule name, overriding the severity of the rule. Defaults to None.
+
+    Raises:
+        ValueError: If a severity is given for an unknown rule
+
+    Returns:
+        ValidationReport: Violations
+    """
+    severities = dict(severities or {})
+    if unknown := severities.keys() - {rule.name for rule in rules}:
+        raise ValueError(f"Unknown rules: {', '.join(sorted(unknown))}")
+    report = ValidationReport()
+    for rule in rules:
+        mask = rule.check(frame).fillna(False).astype(bool)
+        if mask.any():
+            report.violations.append(
+                Violation(
+                    rule.name,
+                    rule.message,
+                    Severity(severities.get(rule.name, rule.severity)),
+                    frame.loc[mask, list(rule.columns)],
+                )
+            )
+    return report
+
+
+if __name__ == '__main__':  # pragma: no cover
+    pass
@@ -0,0 +1,98 @@
+import os
+
+import pandas as pd
+
+from proceedings_curation.metadata.excel import Engine, read_excel
+
+# Name of the index of the metadata index
+INDEX_NAME = 'meeting_id'
+
+# Dtypes of the metadata index columns. Text columns with few distinct values (e.g. one title per volume) are
+# categorical, other text columns are strings, and numbers use the narrowest integer type. Columns that can be
+# empty in the source workbooks use nullable integer types.
+METADATA_INDEX_DTYPES: dict[str, str] = {
+    'record_number': 'uint32',
+    'session_number': 'category',
+    'pages_in_doc': 'string',
+    'pages_in_pdf': 'string',
+    'date_meeting': 'datetime64[ns]',
+    'session_president': 'category',
+    'title_meeting': 'category',
+    'chapter': 'category',
+    'languages': 'category',
+    'document_codes': 'category',
+    'title': 'category',
+    'titles_in_other_languages': 'category',
+    'publication_date': 'uint16',
+    'volume': 'UInt8',
+    'physical_description': 'category',
+    'conference_name': 'category',
+    'conference_session': 'category',
+    'conference_location': 'category',
+    'conference_date': 'UInt16',
+    'corporate_subject': 'category',
+    'variant_title': 'category',
+    'filename': 'category',
+    'columns': 'UInt8',
+    'meeting_name_id': 'string',
+    'pages': 'string',
+    'first_page': 'uint16',
+    'last_page': 'uint16',
+    'language_codes': 'category',
+}
+
+
+def apply_schema(index: pd.DataFrame) -> pd.DataFrame:
+    """Convert the columns of a metadata index to the dtypes of `METADATA_INDEX_DTYPES`. Columns that are not in the schema are left as they are.
+
+    Text columns are converted through strings, so numbers and dates in text columns of a workbook (e.g. '12' in 'session_number') become the same strings as in the CSV file. Categories are plain Python strings and missing values are NaN, as in an object column.
+
+    Args:
+        index (pd.DataFrame): Metadata index
+
+    Returns:
+        pd.DataFrame: Metadata index with the schema dtypes
+    """
+    index = index.copy()
+    for column, dtype in METADATA_INDEX_DTYPES.items():
+        if column not in index.columns:
+            continue
+        if dtype == 'category':
+            index[column] = index[column].astype('string').astype(object).astype('category')
+        elif dtype == 'string':
+            index[column] = index[column].astype('string')
+        else:
+            index[column] = index[column].astype(dtype)
+    return index
+
+
+def load_metadata_index(metadata_index: str | os.PathLike[str], engine: Engine | str = Engine.auto) -> pd.DataFrame:
+    """Load a metadata index saved by `create_metadata_index` as CSV or Excel, with the dtypes of `METADATA_INDEX_DTYPES`. Text columns of a CSV file are read as strings, so numbers in text columns are not parsed.
+
+    Args:
+        metadata_index (str | os.PathLike[str]): Path to the metadata index, a .csv or .xlsx file
+        engine (Engine | str, optional): Engine used to read an Excel file, see `resolve_engine`. Defaults to Engine.auto.
+
+    Returns:
+        pd.DataFrame: Metadata index
+    """
+    if str(metadata_index).endswith('.csv'):
+        index = pd.read_csv(
+            metadata_index,
+            dtype={
+                column: 'string' for column, dtype in METADATA_INDEX_DTYPES.items() if dtype in ('category', 'string')
+            },
+            parse_dates=['date_meeting'],
+            index_col=0,
+            keep_default_na=False,
+            na_values='',
+            encoding='utf-8-sig',
+            sep=';',
+        )
+    else:
+        index = read_excel(metadata_index, engine=engine, index_col=INDEX_NAME)
+    return apply_schema(index)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    pass
@@ -1,54 +1,125 @@
-from typing import Any
+from typing import Optional, TypeVar
 
+import numpy as np
 import pandas as pd
 import typer
 import xlsxwriter  # pylint: disable=unused-import
 from loguru import logger
+from typing_extensions import Annotated
 
+from proceedings_curation.metadata.excel import Engine, read_excel
 
-def compare_excel(old: str, new: str, report: str) -> None:
+Frame = TypeVar('Frame', pd.DataFrame, pd.Series)
+
+
+def fill_missing(values: Frame) -> Frame:
+    """Replace missing values with 'NA'. Values are only converted to objects if any are missing, and pandas does not downcast the result.
+
+    Args:
+        values (pd.DataFrame | pd.Series): Values
+
+    Returns:
+        pd.DataFrame | pd.Series: Values with 'NA' for missing values
+    """
+    missing = values.isna()
+    if not missing.to_numpy().any():
+        return values
+    return values.astype(object).where(~missing, 'NA')
+
+
+def align_rows(old: pd.DataFrame, new: pd.DataFrame, key: str | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Index two sheets by a key column, so that rows are compared by key instead of by position
+
+    Args:
+        old (pd.DataFrame): First sheet
+        new (pd.DataFrame): Second sheet
+        key (str | None, optional): Key column, e.g. 'meeting_id'. If None, rows are aligned by position. Defaults to None.
+
+    Raises:
+        ValueError: If the key column is missing from a sheet or has duplicate values
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: Sheets indexed by the key
+    """
+    if key is None:
+        return old, new
+    for name, sheet in (('old', old), ('new', new)):
+        if key not in sheet.columns:
+            raise ValueError(f'Key column "{key}" not found in {name} sheet')
+        if sheet[key].duplicated().any():
+            duplicates = sheet.loc[sheet[key].duplicated(keep=False), key].unique().tolist()
+            raise ValueError(f'Key column "{key}" has duplicate values in {name} sheet: {duplicates}')
+    return old.set_index(key), new.set_index(key)
+
+
+def diff_sheets(old: pd.DataFrame, new: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Compare the rows and columns two sheets have in common, column by column. Missing values are equal to each other and shown as 'NA'. Changed cells are shown as 'old ---> new', other cells keep the old value.
+
+    Args:
+        old (pd.DataFrame): First sheet
+        new (pd.DataFrame): Second sheet, with rows aligned to the first sheet by index
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: All common rows in the column order of the first sheet, and the changed rows with the text columns and columns with changes
+    """
+    rows = old.index[old.index.isin(new.index)]
+    columns = [column for column in new.columns if column in old.columns]
+    changed = pd.DataFrame(index=rows)
+    changed_rows = np.zeros(len(rows), dtype=bool)
+    for column in columns:
+        old_values = old.loc[rows, column]
+        new_values = new.loc[rows, column]
+        old_cells = old_values.to_numpy(dtype=object)
+        new_cells = new_values.to_numpy(dtype=object)
+        old_missing = pd.isna(old_cells)
+        new_missing = pd.isna(new_cells)
+        unequal = ~((old_cells == new_cells) & ~old_missing & ~new_missing | old_missing & new_missing)
+        values = fill_missing(old_values)
+        if unequal.any():
+            values = values.astype(object)
+            values[unequal] = [
+                f'{old_value} ---> {new_value}'
+                for old_value, new_value in zip(values[unequal], fill_missing(new_values)[unequal])
+            ]
+            changed_rows |= unequal
+        changed[column] = values
+    diff = changed.loc[changed_rows].select_dtypes(include='object')
+    return changed.reindex(columns=old.columns.to_list()), diff
+
+
+def compare_excel(
+    old: str,
+    new: str,
+    report: str,
+    engine: Annotated[
+        Engine, typer.Option('--excel-engine', help="Excel reader, auto uses calamine if installed")
+    ] = Engine.auto,
+    key: Annotated[
+        Optional[str],
+        typer.Option(help="Column to align rows on, e.g. meeting_id. Rows are aligned by position by default"),
+    ] = None,
+) -> None:
     """Compare two excel sheets and create a diff sheet
 
     Args:
         old (str): Path to first sheet
         new (str): Path to second sheet
         report (str): Path to save report
+        engine (Engine, optional): Engine used to read the sheets, see `resolve_engine`. Defaults to Engine.auto.
+        key (str, optional): Column to align rows on, so that added or dropped rows do not show the rows after them as changed. Defaults to None, aligning rows by position.
     """
 
-    old = pd.read_excel(old).fillna('NA')
-    new = pd.read_excel(new).fillna('NA')
+    old_sheet, new_sheet = align_rows(read_excel(old, engine=engine), read_excel(new, engine=engine), key)
 
-    dropped_rows = list(set(old.index) - set(new.index))
-    dropped = old.loc[dropped_rows]
+    dropped = fill_missing(old_sheet[~old_sheet.index.isin(new_sheet.index)])
     logger.info('No rows dropped' if dropped.empty else f'Dropped {len(dropped)} row(s):\n{dropped}')
 
-    added_rows = list(set(new.index) - set(old.index))
-    added = new.loc[added_rows]
+    added = fill_missing(new_sheet[~new_sheet.index.isin(old_sheet.index)])
     logger.info('No rows added' if added.empty else f'Added {len(added)} row(s):\n{added}')
 
-    changes = pd.concat([old, new], axis='columns', keys=['old', 'new'], join='inner')
-
-    def report_diff(x: Any) -> str:
-        """Function to report the difference between two cells of two columns
-
-        Args:
-            x (Any): Cell values
-
-        Returns:
-            str: Difference between two cells
-        """
-        return x.iloc[0] if x.iloc[0] == x.iloc[1] else f'{x.iloc[0]} ---> {x.iloc[1]}'
-
-    changes = changes.swaplevel(axis='columns')[new.columns[0:]]
-    changed = changes.groupby(level=0, axis='columns').apply(lambda frame: frame.apply(report_diff, axis='columns'))
-    changed_text_columns = changed.select_dtypes(include='object')
-    diff = changed_text_columns[
-        changed_text_columns.apply(lambda x: x.str.contains('--->', na=False).any(), axis='columns')
-    ]  # pylint: disable=singleton-comparison
-    diff = diff.dropna(how='all').dropna(axis='columns', how='all')
+    changed, diff = diff_sheets(old_sheet, new_sheet)
 
     with pd.ExcelWriter(report, engine='xlsxwriter') as writer:  # pylint: disable=abstract-class-instantiated
-        changed = changed.reindex(columns=old.columns.to_list())  # Move
         changed.to_excel(writer, index=True, sheet_name='changed')
         diff.to_excel(writer, index=True, sheet_name='diff')
         if not added.empty:
@@ -0,0 +1,309 @@
+import json
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from typing import Any, Iterable, Optional
+
+import pandas as pd
+import typer
+from loguru import logger
+from typing_extensions import Annotated
+
+from proceedings_curation.language_detectors.language_detectors import LanguageDetector, LanguageDetectorFactory
+from proceedings_curation.metadata.meetings import meeting_filename
+from proceedings_curation.metadata.schema import load_metadata_index
+from proceedings_curation.tokenizers.tokenizers import RegexSentenceTokenizer, SimpleParagraphTokenizer
+
+COUNTS = ['characters', 'words', 'lines', 'paragraphs', 'sentences']
+
+# Number at the start of a paragraph, e.g. '12. ' or '(3) ', which is not a sentence of its own
+PARAGRAPH_NUMBER = re.compile(r'\(?\d+[.)]?\s+')
+
+_worker_state: dict[str, Any] = {}
+
+
+def create_language_detector(
+    language_detector: str | None, max_detect_chars: int | None = None, profile_store: str | None = None
+) -> LanguageDetector | None:
+    """Create the language detector of the report
+
+    Args:
+        language_detector (str | None): Language detector to use, None to not detect languages
+        max_detect_chars (int | None, optional): Detect long paragraphs adaptively from samples of at most this many characters. Defaults to None.
+        profile_store (str | None, optional): Path to a compiled language profile store. Defaults to None.
+
+    Returns:
+        LanguageDetector | None: Language detector
+    """
+    if language_detector is None:
+        return None
+    return LanguageDetectorFactory.get_language_detector(
+        language_detector, max_chars=max_detect_chars, profile_store=profile_store
+    )
+
+
+def text_statistics(text: str, language_detector: LanguageDetector | None = None) -> dict[str, Any]:
+    """Count the characters, words, lines, paragraphs and sentences of a text, and the characters of the paragraphs in each detected language. Paragraphs are tokenized with `SimpleParagraphTokenizer` and sentences with `RegexSentenceTokenizer`, so no language models are needed.
+
+    Args:
+        text (str): Text
+        language_detector (LanguageDetector | None, optional): Language detector. Defaults to None (no detection).
+
+    Returns:
+        dict[str, Any]: Counts, and characters by language ('und' for undetected paragraphs)
+    """
+    paragraphs = SimpleParagraphTokenizer().tokenize_spans(text)
+    sentence_tokenizer = RegexSentenceTokenizer()
+    languages: Counter[str] = Counter()
+    sentences = 0
+    for paragraph in paragraphs:
+        number = PARAGRAPH_NUMBER.match(paragraph)
+        sentences += len(sentence_tokenizer.tokenize(paragraph[number.end() :] if number else paragraph))
+        if language_detector is not None:
+            languages[language_detector.detect(paragraph) or 'und'] += len(paragraph)
+    return {
+        'characters': len(text),
+        'words': len(text.split()),
+        'lines': len(text.splitlines()),
+        'paragraphs': len(paragraphs),
+        'sentences': sentences,
+        'languages': dict(languages),
+    }
+
+
+def file_statistics(path: str, language_detector: LanguageDetector | None = None) -> dict[str, Any] | None:
+    """Statistics of a text file, see `text_statistics`
+
+    Args:
+        path (str): Path to the text file
+        language_detector (LanguageDetector | None, optional): Language detector. Defaults to None.
+
+    Returns:
+        dict[str, Any] | None: Statistics, or None if the file is not found
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as file:
+        return text_statistics(file.read(), language_detector)
+
+
+def _init_worker(language_detector: str | None, max_detect_chars: int | None, profile_store: str | None) -> None:
+    """Create the language detector once per worker process"""
+    _worker_state['language_detector'] = create_language_detector(language_detector, max_detect_chars, profile_store)
+
+
+def _file_statistics_in_worker(path: str) -> dict[str, Any] | None:
+    return file_statistics(path, _worker_state['language_detector'])
+
+
+def merge_statistics(total: dict[str, Any], statistics: dict[str, Any]) -> dict[str, Any]:
+    """Add the statistics of a meeting to an aggregate
+
+    Args:
+        total (dict[str, Any]): Aggregate, updated in place
+        statistics (dict[str, Any]): Statistics of a meeting or another aggregate
+
+    Returns:
+        dict[str, Any]: The aggregate
+    """
+    total['meetings'] = total.get('meetings', 0) + statistics.get('meetings', 1)
+    for count in COUNTS:
+        total[count] = total.get(count, 0) + statistics[count]
+    total['languages'] = dict(Counter(total.get('languages', {})) + Counter(statistics['languages']))
+    return total
+
+
+def language_shares(languages: dict[str, int]) -> dict[str, float]:
+    """Share of the characters in each language
+
+    Args:
+        languages (dict[str, int]): Characters by language
+
+    Returns:
+        dict[str, float]: Share of each language, largest first
+    """
+    total = sum(languages.values())
+    return {
+        language: round(characters / total, 4)
+        for language, characters in sorted(languages.items(), key=lambda item: (-item[1], item[0]))
+    }
+
+
+def corpus_statistics(  # pylint: disable=too-many-arguments, too-many-positional-arguments, too-many-locals
+    metadata_index: str,
+    input_path: str,
+    language_detector: str | None = 'langdetect',
+    max_detect_chars: int | None = None,
+    profile_store: str | None = None,
+    truncation_ratio: float = 0.25,
+    workers: int = 1,
+) -> dict[str, Any]:
+    """Compute the statistics of each meeting in a single pass over the text files, and the totals of each year and of the corpus.
+
+    A meeting is flagged as truncated if its text is empty or has fewer characters per page than truncation_ratio times the median of the corpus, which usually means the extraction stopped early. Meetings without a conference date are totalled under the year None, after the other years.
+
+    Args:
+        metadata_index (str): Path to the metadata index
+        input_path (str): Path to the folder of text files
+        language_detector (str | None, optional): Language detector to use, None to not detect languages. Defaults to 'langdetect'.
+        max_detect_chars (int | None, optional): Detect long paragraphs adaptively from samples of at most this many characters. Defaults to None.
+        profile_store (str | None, optional): Path to a compiled language profile store. Defaults to None.
+        truncation_ratio (float, optional): Fraction of the median characters per page below which a meeting is flagged as truncated. Defaults to 0.25.
+        workers (int, optional): Number of worker processes. Defaults to 1.
+
+    Returns:
+        dict[str, Any]: Report with the totals, the totals of each year and the statistics of each meeting
+    """
+    index = load_metadata_index(metadata_index)
+    meetings: list[dict[str, Any]] = [
+        {
+            'meeting_id': int(meeting_id),
+            'year': int(row.conference_date) if not pd.isna(row.conference_date) else None,
+            'file': meeting_filename(meeting_id, row),
+            'pages': int(row.last_page - row.first_page + 1) if not pd.isna(row.first_page + row.last_page) else None,
+        }
+        for meeting_id, row in index.iterrows()
+    ]
+    paths = [os.path.join(input_path, meeting['file']) for meeting in meetings]
+    logger.info(f"Computing statistics of {len(paths)} meetings in {input_path}")
+
+    with ExitStack() as stack:
+        results: Iterable[dict[str, Any] | None]
+        if workers > 1 and paths:
+            executor = stack.enter_context(
+                ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_worker,
+                    initargs=(language_detector, max_detect_chars, profile_store),
+                )
+            )
+            results = executor.map(_file_statistics_in_worker, paths, chunksize=max(1, len(paths) // (workers * 8)))
+        else:
+            detector = create_language_detector(language_detector, max_detect_chars, profile_store)
+            results = map(partial(file_statistics, language_detector=detector), paths)
+        found = []
+        for meeting, statistics in zip(meetings, results):
+            if statistics is None:
+                logger.warning(f"File not found: {meeting['file']}")
+                meeting['missing'] = True
+                continue
+            meeting.update(statistics, missing=False)
+            found.append(meeting)
+
+    per_page = [meeting['characters'] / meeting['pages'] for meeting in found if meeting['pages']]
+    median = float(pd.Series(per_page).median()) if per_page else 0.0
+    totals: dict[str, Any] = {'meetings': 0, **dict.fromkeys(COUNTS, 0), 'languages': {}}
+    years: dict[int | None, dict[str, Any]] = {}
+    for meeting in found:
+        meeting['characters_per_page'] = (
+            round(meeting['characters'] / meeting['pages'], 1) if meeting['pages'] else None
+        )
+        meeting['truncated'] = meeting['characters'] == 0 or (
+            meeting['characters_per_page'] is not None and meeting['characters_per_page'] < truncation_ratio * median
+        )
+        merge_statistics(totals, meeting)
+        merge_statistics(years.setdefault(meeting['year'], {}), meeting)
+
+    for aggregate in [totals, *years.values()]:
+        aggregate['languages'] = language_shares(aggregate['languages'])
+    for meeting in found:
+        meeting['languages'] = language_shares(meeting['languages'])
+    totals['missing'] = len(meetings) - len(found)
+    totals['truncated'] = sum(meeting['truncated'] for meeting in found)
+    totals['median_characters_per_page'] = round(median, 1)
+    logger.info(
+        f"{totals['meetings']} meetings, {totals['characters']} characters, {totals['paragraphs']} paragraphs, "
+        f"{totals['sentences']} sentences, {totals['missing']} missing, {totals['truncated']} possibly truncated"
+    )
+    return {
+        'totals': totals,
+        'years': dict(sorted(years.items(), key=lambda item: (item[0] is None, item[0] or 0))),
+        'meetings': meetings,
+    }
+
+
+def save_report(report: dict[str, Any], output_path: str) -> None:
+    """Save a report as JSON, or as CSV with one row per meeting and a second CSV file ({name}.years.csv) with one row per year. Language shares become one column per language.
+
+    Args:
+        report (dict[str, Any]): Report from `corpus_statistics`
+        output_path (str): Path to save the report, ending with .json or .csv
+
+    Raises:
+        ValueError: If the output path does not end with .json or .csv
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    if output_path.endswith('.json'):
+        with open(output_path, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    elif output_path.endswith('.csv'):
+        for rows, path, key in [
+            (report['meetings'], output_path, 'meeting_id'),
+            (
+                [{'year': year, **totals} for year, totals in report['years'].items()],
+                output_path[:-4] + '.years.csv',
+                'year',
+            ),
+        ]:
+            frame = pd.DataFrame(rows, columns=list(dict.fromkeys([key, *(column for row in rows for column in row)])))
+            if 'languages' in frame:
+                languages = pd.json_normalize(
+                    frame.pop('languages').map(lambda shares: shares if isinstance(shares, dict) else {}).tolist()
+                )
+                frame = frame.join(languages.add_prefix('language_'))
+            frame.to_csv(path, sep=';', index=False)
+    else:
+        raise ValueError(f'Unknown report format: "{output_path}", expected .json or .csv')
+
+
+def main(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+    metadata_index: str,
+    input_path: str,
+    output_path: Annotated[str, typer.Argument(help="Report path, .json or .csv")],
+    language_detector: Annotated[str, typer.Option(help="Language detector to use")] = 'langdetect',
+    detect_languages: Annotated[bool, typer.Option(help="Detect the language of each paragraph")] = True,
+    max_detect_chars: Annotated[
+        Optional[int],
+        typer.Option(help="Detect long paragraphs adaptively from samples of at most this many characters"),
+    ] = None,
+    profile_store: Annotated[
+        Optional[str], typer.Option(help="Compiled language profile store, created if it does not exist")
+    ] = None,
+    truncation_ratio: Annotated[
+        float, typer.Option(help="Flag meetings with fewer characters per page than this fraction of the median")
+    ] = 0.25,
+    workers: Annotated[int, typer.Option(help="Number of worker processes")] = 1,
+) -> None:
+    """Compute the number of characters, words, lines, paragraphs and sentences, the detected language shares and the characters per page of each meeting, with totals per year and for the corpus, and save them as a JSON or CSV report. Meetings that look truncated are flagged.
+
+    Args:
+        metadata_index (str): Path to the metadata index
+        input_path (str): Path to the folder of text files
+        output_path (str): Path to save the report, .json or .csv
+        language_detector (str, optional): Language detector to use. Defaults to 'langdetect'.
+        detect_languages (bool, optional): Detect the language of each paragraph. Defaults to True.
+        max_detect_chars (int, optional): Detect long paragraphs adaptively from samples of at most this many characters. Defaults to None.
+        profile_store (str, optional): Compiled language profile store. Defaults to None.
+        truncation_ratio (float, optional): Fraction of the median characters per page below which a meeting is flagged as truncated. Defaults to 0.25.
+        workers (int, optional): Number of worker processes. Defaults to 1.
+    """
+    if not output_path.endswith(('.json', '.csv')):
+        raise typer.BadParameter(f'Report path must end with .json or .csv: "{output_path}"')
+    report = corpus_statistics(
+        metadata_index,
+        input_path,
+        language_detector if detect_languages else None,
+        max_detect_chars,
+        profile_store,
+        truncation_ratio,
+        workers,
+    )
+    save_report(report, output_path)
+    logger.success(f"Report saved in {output_path}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    typer.run(main)
@@ -1,20 +1,44 @@
+import json
 import os
 import random
 import re
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from enum import Enum
+from functools import partial
+from typing import Any, Iterable, Iterator, Optional
 
-import jsonlines
-import nltk
 import pandas as pd
 import typer
 from dotenv import load_dotenv
 from loguru import logger
 from typing_extensions import Annotated
 
+from proceedings_curation.metadata.manifest import is_unchanged, manifest_entry
+from proceedings_curation.metadata.meetings import meeting_filename
+from proceedings_curation.metadata.schema import load_metadata_index
+from proceedings_curation.tokenizers.tokenizers import get_sentence_tokenizer, sent_tokenize
+from proceedings_curation.writers.offset_index import write_offset_index
+from proceedings_curation.writers.writers import JsonlWriter, ParquetDatasetWriter, read_lines
+
 load_dotenv()
 
+# Version of the records and the manifest. Increase it when the records change, so datasets are rebuilt in full.
+MANIFEST_VERSION = 1
+
+
+class Compression(str, Enum):
+    none = 'none'
+    gz = 'gz'
+    zst = 'zst'
+
+
+class Sampling(str, Enum):
+    full = 'full'
+    window = 'window'
+
 
-def create_jsonl_dataset(
+def create_jsonl_dataset(  # pylint: disable=too-many-arguments, too-many-positional-arguments
     metadata_index: str,
     input_path: str,
     output_path: str,
@@ -22,10 +46,28 @@ def create_jsonl_dataset(
     number_of_files: Annotated[Optional[int], typer.Argument()] = None,
     sentences_per_file: Annotated[Optional[int], typer.Argument()] = None,
     seed: Annotated[Optional[int], typer.Option(help="Random seed for sampling")] = None,
+    compression: Annotated[Compression, typer.Option(help="Compress the dataset with gzip or zstd")] = Compression.none,
+    sampling: Annotated[
+        Sampling, typer.Option(help="Tokenize the full text or a window around a random offset when sampling sentences")
+    ] = Sampling.full,
+    workers: Annotated[int, typer.Option(help="Number of worker processes")] = 1,
+    parquet: Annotated[
+        bool, typer.Option(help="Also write the records as a Parquet dataset partitioned by year")
+    ] = False,
+    incremental: Annotated[
+        bool, typer.Option(help="Reuse the records of meetings that did not change since the previous build")
+    ] = False,
+    exclude: Annotated[
+        Optional[str], typer.Option(help="File with names of text files to leave out, one per line")
+    ] = None,
 ) -> None:
     """Create a JSONL dataset from a folder of text files using a metadata index. Create a sample of the dataset by specifying the number of files to include and the number of sentences per file to keep. Use a random seed for reproducibility.
 
-    The metadata index is a CSV file with the following columns:
+    With window sampling, sentences are sampled from a window of text around a random offset, so only the window is tokenized. Each file is sampled with its own random generator, seeded with the seed and the meeting id, so the sample of a file does not depend on the other files.
+
+    With more than one worker, files are read, cleaned and sampled in a process pool. Records are written in index order and sampling only uses per-record random generators, so the dataset is the same as for a serial run.
+
+    The metadata index is a CSV file, loaded with the dtypes of `METADATA_INDEX_DTYPES`, with the following columns:
     - filename: Name of the PDF file
     - title_meeting: Title of the meeting
     - date_meeting: Date of the meeting
@@ -37,7 +79,7 @@ def create_jsonl_dataset(
     The text files are named using the following convention:
     - {conference_date}_{index}_{title_meeting}.txt
 
-    The JSONL dataset is a file where each line is a JSON object with the following
+    The JSONL dataset is a file, optionally compressed with gzip (.jsonl.gz) or zstd (.jsonl.zst), where each line is a JSON object with the following
     keys:
     - text: Text of the meeting
     - meta: a dictionary with the following keys:
@@ -46,6 +88,12 @@ def create_jsonl_dataset(
         - date: Date of the meeting
         - source: {BASE_URL}/{filename}#page={first_page} (where BASE_URL is defined in environment variables)
 
+    Optionally, the same records are also written as a Parquet dataset ({dataset_name}.parquet), partitioned by year, with the columns text, file, title, date and source, and meeting_id, year (conference_date) and language_codes from the metadata index. Writing Parquet requires pyarrow.
+
+    A manifest ({dataset_name}.manifest.json) with a hash of the text file and of the metadata index row of each record is saved next to the dataset. In an incremental build, only new meetings and meetings whose text file or metadata changed are read again, the records of unchanged meetings are copied from the previous dataset and meetings that are no longer in the index are dropped. A dataset built with other options is rebuilt in full.
+
+    An uncompressed dataset also gets a sidecar index ({dataset_name}.jsonl.idx) with the byte offset and length of each record, for random access with `JsonlDataset`.
+
     Args:
         metadata_index (str): Path to the metadata index
         input_path (str): Path to the folder of text files
@@ -54,43 +102,292 @@ def create_jsonl_dataset(
         number_of_files (int, optional): Number of files to sample. Defaults to None.
         sentences_per_file (int, optional): Number of sentences to keep per file. Defaults to None.
         seed (int, optional): Random seed for sampling. Defaults to 42.
+        compression (Compression, optional): Compression of the dataset. Defaults to 'none'.
+        sampling (Sampling, optional): Sentence sampling, 'full' or 'window'. Defaults to 'full'.
+        workers (int, optional): Number of worker processes. Defaults to 1.
+        parquet (bool, optional): Also write a Parquet dataset. Defaults to False.
+        incremental (bool, optional): Reuse unchanged records from the previous build. Defaults to False.
+        exclude (str, optional): File with names of text files to leave out, e.g. near-duplicates found by find_near_duplicates. Defaults to None.
     """
     # Load metadata index
-    index = pd.read_csv(
-        metadata_index,
-        parse_dates=['date_meeting'],
-        index_col=0,
-        keep_default_na=False,
-        na_values='',
-        encoding='utf-8-sig',
-        sep=';',
-    )
+    index = load_metadata_index(metadata_index)
 
     # Create output folder
     os.makedirs(output_path, exist_ok=True)
 
+    if exclude is not None:
+        with open(exclude, 'r', encoding='utf-8') as file:
+            excluded = {line.strip() for line in file if line.strip()}
+        keep = [meeting_filename(i, row) not in excluded for i, row in index.iterrows()]
+        logger.info(f"Excluding {len(keep) - sum(keep)} files listed in {exclude}")
+        index = index[keep]
+
+    if number_of_files is not None:
+        index = index.sample(n=number_of_files, random_state=seed)
+
+    # Find records that can be reused from the previous build
+    extension = '.jsonl' if compression == Compression.none else f'.jsonl.{compression.value}'
+    dataset_path = os.path.join(output_path, f'{dataset_name}{extension}')
+    manifest_path = os.path.join(output_path, f'{dataset_name}.manifest.json')
+    options = {
+        'version': MANIFEST_VERSION,
+        'number_of_files': number_of_files,
+        'sentences_per_file': sentences_per_file,
+        'seed': seed,
+        'sampling': sampling.value,
+        'base_url': os.getenv('BASE_URL'),
+    }
+    previous = load_previous_records(dataset_path, manifest_path, options) if incremental else {}
+    entries = [
+        manifest_entry(i, row, input_path, previous[str(i)][0] if str(i) in previous else None)
+        for i, row in index.iterrows()
+    ]
+    reused = [
+        previous[entry['meeting_id']][1] if entry is not None and is_unchanged(entry, previous) else None
+        for entry in entries
+    ]
+    rebuild = [(i, row) for (i, row), line in zip(index.iterrows(), reused) if line is None]
+    if incremental:
+        logger.info(f"Reusing {len(index) - len(rebuild)} records, building {len(rebuild)} records")
+
     # Create JSONL dataset
-    with jsonlines.open(os.path.join(output_path, f'{dataset_name}.jsonl'), 'w') as writer:
-        if number_of_files is not None:
-            index = index.sample(n=number_of_files, random_state=seed)
-        for i, row in index.iterrows():
-            year = row.conference_date if not pd.isna(row.date_meeting) else row.date_meeting.year
-            filename = f"{year}_{i}_{'_'.join(row.title_meeting.split()[:3]).lower()}.txt"
-            if not os.path.exists(os.path.join(input_path, filename)):
-                logger.error(f"File {filename} not found")
-                continue
-            with open(os.path.join(input_path, filename), 'r', encoding='utf-8') as file:
-                text = file.read()
-                text = remove_unusual_line_terminators(text)
-                if sentences_per_file is not None:
-                    text = extract_n_consecutive_sentences(text, sentences_per_file, seed=seed)
-            meta = {
-                'file': filename,
-                'title': row.title_meeting,
-                'date': row.date_meeting.strftime('%Y-%m-%d') if not pd.isna(row.date_meeting) else None,
-                'source': f"{os.getenv('BASE_URL')}{row.filename}#page={row.first_page}",
-            }
-            writer.write({'text': text, 'meta': meta})
+    build = partial(
+        create_record,
+        input_path=input_path,
+        sentences_per_file=sentences_per_file,
+        seed=seed,
+        sampling=sampling,
+    )
+    temporary_path = os.path.join(output_path, f'{dataset_name}.tmp{extension}')
+    with ExitStack() as stack:
+        writer = stack.enter_context(JsonlWriter(temporary_path))
+        parquet_writer = (
+            stack.enter_context(
+                ParquetDatasetWriter(os.path.join(output_path, f'{dataset_name}.parquet'), parquet_schema())
+            )
+            if parquet
+            else None
+        )
+        built: Iterable[tuple[dict[str, Any] | None, str | None]]
+        if workers > 1 and rebuild:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            built = executor.map(
+                build,
+                [i for i, _ in rebuild],
+                [row for _, row in rebuild],
+                chunksize=max(1, len(rebuild) // (workers * 8)),
+            )
+        else:
+            built = (build(i, row) for i, row in rebuild)
+        written = write_records(writer, index, merge_records(reused, built), parquet_writer)
+    os.replace(temporary_path, dataset_path)
+    save_manifest(
+        manifest_path, options, [entry for entry, span in zip(entries, written) if span and entry is not None]
+    )
+
+    # Create offset index
+    if compression == Compression.none:
+        spans = [(int(i), meeting_filename(i, row), span) for (i, row), span in zip(index.iterrows(), written) if span]
+        write_offset_index(
+            f'{dataset_path}.idx',
+            [meeting_id for meeting_id, _, _ in spans],
+            [filename for _, filename, _ in spans],
+            [span[0] for _, _, span in spans],
+            [span[1] for _, _, span in spans],
+        )
+
+
+def create_record(
+    meeting_id: Any,
+    row: pd.Series,
+    input_path: str,
+    sentences_per_file: Optional[int] = None,
+    seed: Optional[int] = None,
+    sampling: Sampling = Sampling.full,
+) -> tuple[dict[str, Any] | None, str | None]:
+    """Read, clean and optionally sample the text file of a meeting and create its dataset record
+
+    Args:
+        meeting_id (Any): Meeting id
+        row (pd.Series): Metadata index row of the meeting
+        input_path (str): Path to the folder of text files
+        sentences_per_file (Optional[int], optional): Number of sentences to keep. Defaults to None.
+        seed (Optional[int], optional): Random seed for sampling. Defaults to None.
+        sampling (Sampling, optional): Sentence sampling. Defaults to 'full'.
+
+    Returns:
+        tuple[dict[str, Any] | None, str | None]: Record, or None and an error message if the file is not found
+    """
+    filename = meeting_filename(meeting_id, row)
+    if not os.path.exists(os.path.join(input_path, filename)):
+        return None, f"File {filename} not found"
+    with open(os.path.join(input_path, filename), 'r', encoding='utf-8') as file:
+        text = file.read()
+        text = remove_unusual_line_terminators(text)
+        if sentences_per_file is not None and sampling == Sampling.window:
+            text = sample_n_consecutive_sentences(
+                text, sentences_per_file, file_random(seed, meeting_id), language=sentence_language(row.language_codes)
+            )
+        elif sentences_per_file is not None:
+            text = extract_n_consecutive_sentences(
+                text, sentences_per_file, seed=seed, language=sentence_language(row.language_codes)
+            )
+    meta = {
+        'file': filename,
+        'title': row.title_meeting,
+        'date': row.date_meeting.strftime('%Y-%m-%d') if not pd.isna(row.date_meeting) else None,
+        'source': f"{os.getenv('BASE_URL')}{row.filename}#page={row.first_page}",
+    }
+    return {'text': text, 'meta': meta}, None
+
+
+def merge_records(
+    reused: Iterable[bytes | None], built: Iterable[tuple[dict[str, Any] | None, str | None]]
+) -> Iterator[tuple[dict[str, Any] | bytes | None, str | None]]:
+    """Merge reused records with built records in index order
+
+    Args:
+        reused (Iterable[bytes | None]): JSON line of each reused record, None for records that are built
+        built (Iterable[tuple[dict[str, Any] | None, str | None]]): Results of `create_record` for the built records
+
+    Raises:
+        ValueError: If the number of built records is not the number of records to build
+
+    Yields:
+        tuple[dict[str, Any] | bytes | None, str | None]: Record or JSON line, and error message
+    """
+    results = iter(built)
+    for line in reused:
+        if line is not None:
+            yield line, None
+            continue
+        for result in results:
+            yield result
+            break
+        else:
+            raise ValueError('Fewer built records than records to build')
+    for _ in results:
+        raise ValueError('More built records than records to build')
+
+
+def write_records(
+    writer: JsonlWriter,
+    index: pd.DataFrame,
+    results: Iterable[tuple[dict[str, Any] | bytes | None, str | None]],
+    parquet_writer: ParquetDatasetWriter | None = None,
+) -> list[tuple[int, int] | None]:
+    """Write records in order and log the errors of missing files
+
+    Args:
+        writer (JsonlWriter): Dataset writer
+        index (pd.DataFrame): Metadata index, in the order of the results
+        results (Iterable[tuple[dict[str, Any] | bytes | None, str | None]]): Results of `create_record` or JSON lines of reused records
+        parquet_writer (ParquetDatasetWriter | None, optional): Parquet dataset writer. Defaults to None.
+
+    Returns:
+        list[tuple[int, int] | None]: Byte offset and length of each record, None for records that were not written
+    """
+    written: list[tuple[int, int] | None] = []
+    for (meeting_id, row), (record, error) in zip(index.iterrows(), results):
+        if record is None:
+            logger.error(error)
+            written.append(None)
+            continue
+        if isinstance(record, bytes):
+            written.append(writer.write_line(record))
+            record = json.loads(record) if parquet_writer is not None else None
+        else:
+            written.append(writer.write(record))
+        if parquet_writer is not None and record is not None:
+            parquet_writer.write(parquet_row(meeting_id, row, record))
+    return written
+
+
+def load_previous_records(
+    dataset_path: str, manifest_path: str, options: dict[str, Any]
+) -> dict[str, tuple[dict[str, Any], bytes]]:
+    """Load the manifest entries and JSON lines of the previous build. Nothing is loaded if the dataset or the manifest is missing, the dataset was built with other options, or the dataset and the manifest do not match.
+
+    Args:
+        dataset_path (str): Path to the previous dataset
+        manifest_path (str): Path to the previous manifest
+        options (dict[str, Any]): Options of this build
+
+    Returns:
+        dict[str, tuple[dict[str, Any], bytes]]: Manifest entry and JSON line by meeting id
+    """
+    if not os.path.exists(dataset_path) or not os.path.exists(manifest_path):
+        logger.info("No previous build found")
+        return {}
+    with open(manifest_path, 'r', encoding='utf-8') as file:
+        manifest = json.load(file)
+    if manifest.get('options') != options:
+        logger.info("Previous build used other options")
+        return {}
+    lines = list(read_lines(dataset_path))
+    if len(lines) != len(manifest['records']):
+        logger.warning(f"Manifest does not match {dataset_path}")
+        return {}
+    return {entry['meeting_id']: (entry, line) for entry, line in zip(manifest['records'], lines)}
+
+
+def save_manifest(manifest_path: str, options: dict[str, Any], entries: list[dict[str, Any]]) -> None:
+    """Save the manifest of a build, with one entry per record in dataset order
+
+    Args:
+        manifest_path (str): Path to the manifest
+        options (dict[str, Any]): Options of the build
+        entries (list[dict[str, Any]]): Manifest entries
+    """
+    temporary_path = f'{manifest_path}.tmp'
+    with open(temporary_path, 'w', encoding='utf-8') as file:
+        json.dump({'options': options, 'records': entries}, file, indent=1)
+    os.replace(temporary_path, manifest_path)
+
+
+def parquet_schema() -> Any:
+    """Return the Arrow schema of the Parquet dataset
+
+    Returns:
+        Any: `pyarrow.Schema`
+    """
+    import pyarrow as pa  # pylint: disable=import-outside-toplevel
+
+    return pa.schema(
+        [
+            ('meeting_id', pa.int64()),
+            ('year', pa.int32()),
+            ('language_codes', pa.string()),
+            ('file', pa.string()),
+            ('title', pa.string()),
+            ('date', pa.date32()),
+            ('source', pa.string()),
+            ('text', pa.large_string()),
+        ]
+    )
+
+
+def parquet_row(meeting_id: Any, row: pd.Series, record: dict[str, Any]) -> dict[str, Any]:
+    """Flatten a dataset record and add the meeting id, year and language codes from the metadata index
+
+    Args:
+        meeting_id (Any): Meeting id
+        row (pd.Series): Metadata index row of the meeting
+        record (dict[str, Any]): Dataset record
+
+    Returns:
+        dict[str, Any]: Row of the Parquet dataset
+    """
+    return {
+        'meeting_id': int(meeting_id),
+        'year': int(row.conference_date),
+        'language_codes': row.language_codes if isinstance(row.language_codes, str) else None,
+        'file': record['meta']['file'],
+        'title': record['meta']['title'],
+        'date': row.date_meeting.date() if not pd.isna(row.date_meeting) else None,
+        'source': record['meta']['source'],
+        'text': record['text'],
+    }
 
 
 def remove_unusual_line_terminators(text: str) -> str:
@@ -107,30 +404,98 @@ def remove_unusual_line_terminators(text: str) -> str:
     return cleaned_text
 
 
-def extract_n_consecutive_sentences(text: str, n: int, seed: Optional[int] = None) -> str:
+def sentence_language(language_codes: str | None) -> str | None:
+    """Return the language to tokenize sentences with from the language codes of a meeting. Meetings with several languages, e.g. 'eng+fre', are tokenized as English.
+
+    Args:
+        language_codes (str | None): Language codes of the meeting
+
+    Returns:
+        str | None: Language code, or None for English
+    """
+    if not isinstance(language_codes, str) or '+' in language_codes:
+        return None
+    return language_codes.strip() or None
+
+
+def file_random(seed: Optional[int], meeting_id: object) -> random.Random:
+    """Return the random generator for sampling a file, seeded with the seed and the meeting id. Without a seed the generator is seeded randomly.
+
+    Args:
+        seed (Optional[int]): Random seed for sampling
+        meeting_id (object): Meeting id of the file
+
+    Returns:
+        random.Random: Random generator
+    """
+    return random.Random(f'{seed}:{meeting_id}') if seed is not None else random.Random()
+
+
+def extract_n_consecutive_sentences(
+    text: str,
+    n: int,
+    seed: Optional[int] = None,
+    language: Optional[str] = None,
+    rng: Optional[random.Random] = None,
+) -> str:
     """Return a string with n consecutive sentences extracted from a text. If n is greater than the number of sentences in the text, return the full text.
 
     Args:
         text (str): The input text
         n (int): The number of sentences to extract
         seed (Optional[int], optional): Random seed for sampling. Defaults to None.
+        language (Optional[str], optional): Language of the text, see `get_sentence_tokenizer`. Defaults to None (English).
+        rng (Optional[random.Random], optional): Random generator to use instead of the seed. Defaults to None.
 
     Returns:
         str: A substring of the input text with n consecutive sentences randomly selected
     """
-    sentences = nltk.sent_tokenize(text)
+    sentences = sent_tokenize(text, language)
 
     if n >= len(sentences):
         return text
 
-    if seed is not None:
-        random.seed(seed)
+    if rng is None:
+        rng = random.Random(seed)
 
-    start_index = random.randint(0, len(sentences) - n)
+    start_index = rng.randint(0, len(sentences) - n)
     extracted_sentences = sentences[start_index : start_index + n]
 
     return ' '.join(extracted_sentences)
 
 
+def sample_n_consecutive_sentences(
+    text: str, n: int, rng: random.Random, language: Optional[str] = None, window_size: int = 4096
+) -> str:
+    """Return a string with n consecutive sentences sampled from a window of text around a random offset. Only the window is tokenized. Sentences cut by the edges of the window are not sampled. If the window holds fewer than n whole sentences, it is doubled until it covers the full text, and then the sentences are extracted with `extract_n_consecutive_sentences`.
+
+    Args:
+        text (str): The input text
+        n (int): The number of sentences to extract
+        rng (random.Random): Random generator
+        language (Optional[str], optional): Language of the text, see `get_sentence_tokenizer`. Defaults to None (English).
+        window_size (int, optional): Number of characters in the first window. Defaults to 4096.
+
+    Returns:
+        str: n consecutive sentences from the text joined by spaces
+    """
+    tokenizer = get_sentence_tokenizer(language)
+    offset = rng.randrange(len(text)) if text else 0
+    size = window_size
+    while n > 0 and size < len(text):
+        start = max(0, min(offset - size // 2, len(text) - size))
+        end = start + size
+        spans = list(tokenizer.span_tokenize(text[start:end]))
+        if start > 0:
+            spans = spans[1:]
+        if end < len(text):
+            spans = spans[:-1]
+        if len(spans) >= n:
+            start_index = rng.randint(0, len(spans) - n)
+            return ' '.join(text[start + i : start + j] for i, j in spans[start_index : start_index + n])
+        size *= 2
+    return extract_n_consecutive_sentences(text, n, language=language, rng=rng)
+
+
 if __name__ == "__main__":  # pragma: no cover
     typer.run(create_jsonl_dataset)
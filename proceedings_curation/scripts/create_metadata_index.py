@@ -1,27 +1,125 @@
 import os
+from typing import Mapping, Optional
 
 import pandas as pd
 import typer
 from loguru import logger
+from typing_extensions import Annotated
+
+from proceedings_curation.metadata.changes import Change, renumber_meetings
+from proceedings_curation.metadata.excel import Engine, read_excel
+from proceedings_curation.metadata.rules import Rule, Severity, validate
+from proceedings_curation.metadata.schema import apply_schema, load_metadata_index
+
+# Rules checked on the proceedings index, see `validation_frame` for the derived columns
+PROCEEDINGS_INDEX_RULES = [
+    Rule(
+        'trailing_dash_pages_in_pdf',
+        "Trailing '-' in 'pages_in_pdf' column",
+        lambda frame: frame['pages_in_pdf'].str.endswith('-'),
+        ('record_number', 'pages_in_pdf'),
+    ),
+    Rule(
+        'trailing_dash_pages_in_doc',
+        "Trailing '-' in 'pages_in_doc' column",
+        lambda frame: frame['pages_in_doc'].str.endswith('-'),
+        ('record_number', 'pages_in_doc'),
+    ),
+    Rule(
+        'invalid_pages',
+        "Invalid page range in 'pages_in_pdf' column",
+        lambda frame: frame['first_page'].isna() | frame['last_page'].isna(),
+        ('record_number', 'title_meeting', 'pages_in_pdf'),
+    ),
+    Rule(
+        'last_page_before_first_page',
+        "Last page smaller than first page",
+        lambda frame: frame['last_page'] < frame['first_page'],
+        ('record_number', 'title_meeting', 'pages_in_pdf'),
+    ),
+    Rule(
+        'invalid_date_meeting',
+        "Date errors in Proceedings index, 'Date meeting' column",
+        lambda frame: frame['date_meeting'].isna(),
+        ('record_number', 'title_meeting', 'date_meeting'),
+        Severity.nonfatal,
+    ),
+    Rule(
+        'date_out_of_range',
+        "Dates out of range",
+        lambda frame: (frame['meeting_year'] < frame['conference_date'].min())
+        | (frame['meeting_year'] > frame['conference_date'].max()),
+        ('record_number', 'title_meeting', 'date_meeting'),
+        Severity.nonfatal,
+    ),
+    Rule(
+        'year_mismatch',
+        "Years do not match",
+        lambda frame: frame['meeting_year'].notna() & (frame['meeting_year'] != frame['conference_date']),
+        ('record_number', 'title_meeting', 'meeting_year', 'conference_date'),
+        Severity.nonfatal,
+    ),
+]
+
+
+def validation_frame(idxp: pd.DataFrame) -> pd.DataFrame:
+    """Compute the columns the proceedings index rules check, once for all rules: stripped page ranges, first and last page, meeting date and year
+
+    Args:
+        idxp (pd.DataFrame): Proceedings index with normalized column names
+
+    Returns:
+        pd.DataFrame: Columns for `PROCEEDINGS_INDEX_RULES`, with the index of the proceedings index
+    """
+    pages_in_pdf = idxp['pages_in_pdf'].astype('string').str.strip()
+    pages = pages_in_pdf.str.split('-')
+    date_meeting = pd.to_datetime(idxp['date_meeting'], errors='coerce')
+    return pd.DataFrame(
+        {
+            'record_number': idxp['record_number'],
+            'title_meeting': idxp['title_meeting'],
+            'pages_in_pdf': pages_in_pdf,
+            'pages_in_doc': idxp['pages_in_doc'].astype('string').str.strip(),
+            'first_page': pd.to_numeric(pages.str.get(0), errors='coerce'),
+            'last_page': pd.to_numeric(pages.str.get(-1), errors='coerce'),
+            'date_meeting': date_meeting,
+            'meeting_year': date_meeting.dt.year,
+            'conference_date': idxp['conference_date'],
+        },
+        index=idxp.index,
+    )
 
 
 def create_metadata_index(
-    proceedings_index: str | os.PathLike[str], proceedings_metadata: str | os.PathLike[str]
+    proceedings_index: str | os.PathLike[str],
+    proceedings_metadata: str | os.PathLike[str],
+    severities: Mapping[str, Severity | str] | None = None,
+    validation_report: str | os.PathLike[str] | None = None,
+    engine: Engine | str = Engine.auto,
 ) -> pd.DataFrame:
     """Create metadata index by merging and updating `proceedings_index` and `proceedings_metadata`
 
+    The proceedings index is checked against all `PROCEEDINGS_INDEX_RULES` in one pass. Violations of rules with severity 'warning' are logged as warnings, violations of rules with severity 'nonfatal' (the date checks) are logged as errors, and violations of rules with severity 'error' are logged as errors and then raised together.
+
     Args:
         proceedings_index (str | os.PathLike): Path to proceedings index
         proceedings_metadata (str | os.PathLike): Path to proceedings metadata
+        severities (Mapping[str, Severity | str] | None, optional): Severity by rule name, overriding the default severity of the rule. Defaults to None.
+        validation_report (str | os.PathLike | None, optional): Path to save the violations as CSV. Defaults to None.
+        engine (Engine | str, optional): Engine used to read the workbooks, see `resolve_engine`. Defaults to Engine.auto.
+
+    Raises:
+        ValueError: If any rule with severity 'error' is broken
 
     Returns:
-        pd.DataFrame: Merged and updated index of `proceedings_index` and `proceedings_metadata`
+        pd.DataFrame: Merged and updated index of `proceedings_index` and `proceedings_metadata`, with the dtypes of `METADATA_INDEX_DTYPES`
     """
 
     # Load proceedings index
     logger.info(f'Loading proceedings index: "{proceedings_index}"')
-    idxp = pd.read_excel(
+    idxp = read_excel(
         proceedings_index,
+        engine=engine,
         dtype={
             'Record number': 'uint32',
             'Publication date': 'uint16',
@@ -37,45 +135,23 @@ def create_metadata_index(
     # Strip and lowercase column names
     idxp.columns = idxp.columns.str.strip().str.replace(' ', '_').str.lower()
 
-    if idxp['pages_in_pdf'].str.strip().str.endswith('-').fillna(False).any():
-        raise ValueError(
-            f"Trailing '-' in 'pages_in_pdf' column\n{idxp[idxp['pages_in_pdf'].str.strip().str.endswith('-').fillna(False)]['pages_in_pdf']}"
-        )
-
-    if idxp['pages_in_doc'].str.strip().str.endswith('-').fillna(False).any():
-        raise ValueError(
-            f"Trailing '-' in 'pages_in_doc' column\n{idxp[idxp['pages_in_doc'].str.strip().str.endswith('-').fillna(False)]['pages_in_doc']}"
-        )
+    # Validate the proceedings index
+    checked = validation_frame(idxp)
+    report = validate(checked, PROCEEDINGS_INDEX_RULES, severities)
+    report.log()
+    if validation_report is not None:
+        report.to_frame().to_csv(validation_report, sep=';', index=False, encoding='utf-8-sig')
+        logger.info(f'Saved validation report: "{validation_report}"')
+    report.raise_for_errors()
 
     # Date to datetime
-    idxp['date_meeting'] = pd.to_datetime(idxp['date_meeting'], errors='coerce')
-    if nat := idxp['date_meeting'].isnull().sum():
-        logger.error(
-            f"{nat} errors in Proceedings index, 'Date meeting' column\n{idxp[idxp['date_meeting'].isnull()][['record_number', 'title_meeting', 'date_meeting']]}"
-        )
-
-    # Check if meeting dates are within conference date range
-    if len(
-        invalid_dates := idxp.query(
-            'date_meeting.dt.year < conference_date.min() | date_meeting.dt.year > conference_date.max()'
-        )
-    ):
-        logger.error(f"Dates out of range\n{invalid_dates[['record_number', 'title_meeting', 'date_meeting']]}")
-
-    # Check that year in date_meeting is the same as conference_date
-    if len(
-        invalid_years := idxp.query('date_meeting.dt.year != conference_date').assign(
-            date_meeting=lambda x: x['date_meeting'].dt.year
-        )
-    ):
-        logger.error(
-            f"Years do not match\n{invalid_years[['record_number', 'title_meeting', 'date_meeting', 'conference_date']]}"
-        )
+    idxp['date_meeting'] = checked['date_meeting']
 
     # Load proceedings metadata
     logger.info(f'Loading proceedings metadata: "{proceedings_metadata}"')
-    idxm = pd.read_excel(
+    idxm = read_excel(
         proceedings_metadata,
+        engine=engine,
         usecols=['record_number', 'year', 'filename', 'columns', 'volume'],
         dtype={'record_number': 'uint32', 'year': 'uint16', 'columns': 'uint8', 'volume': 'Int64'},
     )
@@ -116,11 +192,6 @@ def create_metadata_index(
         raise ValueError("Null values in 'pages' column")
     idx[['first_page', 'last_page']] = idx['pages'].str.split('-', n=1, expand=True).astype('uint16')
 
-    if (idx['last_page'] < idx['first_page']).any():
-        raise ValueError(
-            f"Last page smaller than first page\n{idx[idx['last_page'] < idx['first_page']][['record_number', 'title_meeting', 'pages']]}"
-        )
-
     idx['language_codes'] = (
         idx.languages.str.replace('|', ' ')
         .str.strip()
@@ -130,6 +201,7 @@ def create_metadata_index(
     )
 
     idx.set_index('meeting_id', inplace=True, drop=True)
+    idx = apply_schema(idx)
     logger.info(f'Created index ({idx.shape[0]} rows)')
     return idx
 
@@ -149,15 +221,75 @@ def save_metadata_index(idx: pd.DataFrame, filename: str | os.PathLike[str]) ->
     logger.info(f'Saved index: "{filename}"')
 
 
-def main(proceedings_index: str, proceedings_metadata: str, filename: str) -> None:
+def update_metadata_index(
+    idx: pd.DataFrame, previous: str | os.PathLike[str] | None, engine: Engine | str = Engine.auto
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Keep the meeting ids of a previous metadata index in a new metadata index and find the added, modified and removed meetings, see `renumber_meetings`
+
+    Args:
+        idx (pd.DataFrame): New metadata index
+        previous (str | os.PathLike | None): Path to the previous metadata index. If None or missing, all meetings are added.
+        engine (Engine | str, optional): Engine used to read the previous index, see `resolve_engine`. Defaults to Engine.auto.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: Metadata index with stable meeting ids, and change set
+    """
+    if previous is not None and os.path.exists(previous):
+        logger.info(f'Loading previous index: "{previous}"')
+        previous_idx = load_metadata_index(previous, engine)
+    else:
+        previous_idx = idx.iloc[0:0]
+    idx, changes = renumber_meetings(previous_idx, idx)
+    counts = {change: int((changes.change == change.value).sum()) for change in Change}
+    logger.info(
+        f"{counts[Change.added]} added, {counts[Change.modified]} modified and {counts[Change.removed]} removed meetings, "
+        f"{len(idx) - counts[Change.added] - counts[Change.modified]} unchanged"
+    )
+    return idx, changes
+
+
+def main(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+    proceedings_index: str,
+    proceedings_metadata: str,
+    filename: str,
+    warn: Annotated[
+        Optional[list[str]], typer.Option(help="Only warn about violations of this rule instead of failing")
+    ] = None,
+    validation_report: Annotated[Optional[str], typer.Option(help="Save the rule violations as CSV")] = None,
+    engine: Annotated[
+        Engine, typer.Option('--excel-engine', help="Excel reader, auto uses calamine if installed")
+    ] = Engine.auto,
+    incremental: Annotated[
+        bool, typer.Option(help="Keep the meeting ids of the meetings in the existing index FILENAME")
+    ] = False,
+    changes: Annotated[Optional[str], typer.Option(help="Save the added, modified and removed meetings as CSV")] = None,
+) -> None:
     """Create metadata index by merging and updating `proceedings_index` and `proceedings_metadata`
 
+    In an incremental build, meetings that are unchanged or modified since the existing index keep their meeting id, and added meetings get new meeting ids after the existing ones of their record, instead of all meetings being renumbered. The change set lists the meeting id, record number, volume and change of each added, modified or removed meeting, and the changed columns of modified meetings, e.g. for `extract_meetings --changes`.
+
     Args:
         proceedings_index (str | os.PathLike): Path to proceedings index
         metadata_index (str | os.PathLike): Path to proceedings metadata
         filename (str | os.PathLike): Path to save metadata index
+        warn (list[str], optional): Names of rules to only warn about, see `PROCEEDINGS_INDEX_RULES`. Defaults to None.
+        validation_report (str, optional): Path to save the rule violations as CSV. Defaults to None.
+        engine (Engine, optional): Engine used to read the workbooks. Defaults to Engine.auto.
+        incremental (bool, optional): Keep the meeting ids of the existing index. Defaults to False.
+        changes (str, optional): Path to save the change set as CSV. Defaults to None.
     """
-    idx = create_metadata_index(proceedings_index, proceedings_metadata)
+    idx = create_metadata_index(
+        proceedings_index,
+        proceedings_metadata,
+        {rule: Severity.warning for rule in warn or []},
+        validation_report,
+        engine,
+    )
+    if incremental or changes is not None:
+        idx, change_set = update_metadata_index(idx, filename if incremental else None, engine)
+        if changes is not None:
+            change_set.to_csv(changes, sep=';', index=False, encoding='utf-8-sig')
+            logger.info(f'Saved change set: "{changes}"')
     save_metadata_index(idx, filename)
 
 
@@ -1,17 +1,209 @@
 # pylint: disable=redefined-outer-name
 import os
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
+from functools import partial
+from typing import Any, Callable, Iterable, NamedTuple, Optional, Sequence
 
 import loguru
+import numpy as np
 import typer
 from typing_extensions import Annotated
 
+from proceedings_curation.deduplication.paragraphs import ParagraphDeduplicator, paragraph_fingerprints
 from proceedings_curation.language_detectors.language_detectors import LanguageDetectorFactory
 from proceedings_curation.language_filters.language_filters import LanguageFilter
-from proceedings_curation.tokenizers.tokenizers import TokenizerFactory
+from proceedings_curation.tokenizers.tokenizers import ParagraphTokenizer, TokenizerFactory
 
 
-def process_files(
+class DedupAction(str, Enum):
+    drop = 'drop'
+    count_only = 'count'
+
+
+class DedupMethod(str, Enum):
+    counter = 'counter'
+    bloom = 'bloom'
+
+
+class OutputSpec(NamedTuple):
+    """Languages to keep and where to save them"""
+
+    languages: list[str]
+    output_folder: str
+    keep_undetected: bool = False
+
+
+def parse_output_spec(spec: str, keep_undetected: bool = False) -> OutputSpec:
+    """Parse an output spec of the form `LANGUAGES:OUTPUT_FOLDER`, where LANGUAGES is a '+'-separated list of language codes, e.g. `fr+en:/data/fre_eng`
+
+    Args:
+        spec (str): Output spec
+        keep_undetected (bool, optional): Keep paragraphs with undetected languages. Defaults to False.
+
+    Raises:
+        ValueError: If the spec is invalid
+
+    Returns:
+        OutputSpec: Parsed output spec
+    """
+    languages, _, output_folder = spec.partition(':')
+    if not languages or not output_folder:
+        raise ValueError(f'Invalid output spec "{spec}", expected LANGUAGES:OUTPUT_FOLDER')
+    return OutputSpec(languages.split('+'), output_folder, keep_undetected)
+
+
+def create_pipeline(
+    tokenizer: str,
+    language_detector: str,
+    language_detector_options: dict[str, Any],
+    targets: Sequence[OutputSpec],
+    language_filter_options: dict[str, Any] | None = None,
+    tokenizer_language: str | None = None,
+) -> tuple[ParagraphTokenizer, list[LanguageFilter]]:
+    """Create the tokenizer and one language filter per output, all sharing the same language detector
+
+    Args:
+        tokenizer (str): Tokenizer to use
+        language_detector (str): Language detector to use
+        language_detector_options (dict[str, Any]): Language detector options
+        targets (Sequence[OutputSpec]): Outputs
+        language_filter_options (dict[str, Any] | None, optional): Language filter options. Defaults to None.
+        tokenizer_language (str | None, optional): Language of the sentence tokenizer. Defaults to None (English).
+
+    Returns:
+        tuple[ParagraphTokenizer, list[LanguageFilter]]: Tokenizer and language filters
+    """
+    paragraph_tokenizer = TokenizerFactory.get_tokenizer(tokenizer, language=tokenizer_language)
+    detector = LanguageDetectorFactory.get_language_detector(detector=language_detector, **language_detector_options)
+    language_filters = [
+        LanguageFilter(
+            target.languages,
+            keep_undetected=target.keep_undetected,
+            language_detector=detector,
+            **(language_filter_options or {}),
+        )
+        for target in targets
+    ]
+    return paragraph_tokenizer, language_filters
+
+
+def process_file(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+    filename: str,
+    input_folder: str,
+    targets: Sequence[OutputSpec],
+    tokenizer: ParagraphTokenizer,
+    language_filters: Sequence[LanguageFilter],
+    force_overwrite: bool = False,
+    deduplicate: Callable[[np.ndarray], np.ndarray] | None = None,
+    dedup_action: str = 'drop',
+) -> list[tuple[str, str]]:
+    """Tokenize, detect and filter a single file and save the filtered paragraphs for each output. Log records are returned rather than logged, so that they can be emitted in file order when files are processed in parallel.
+
+    With deduplication, the paragraphs of the file are fingerprinted and repeated paragraphs are dropped (or only counted) before language detection. Files that are skipped are still fingerprinted, so that paragraphs are counted across the whole corpus.
+
+    Args:
+        filename (str): Name of the text file
+        input_folder (str): Path to folder with text files
+        targets (Sequence[OutputSpec]): Outputs
+        tokenizer (ParagraphTokenizer): Paragraph tokenizer
+        language_filters (Sequence[LanguageFilter]): Language filter for each output
+        force_overwrite (bool, optional): Overwrite existing files. Defaults to False.
+        deduplicate (Callable[[np.ndarray], np.ndarray] | None, optional): Function from paragraph fingerprints to a mask of the paragraphs to keep, e.g. `ParagraphDeduplicator.keep`. Defaults to None (no deduplication).
+        dedup_action (str, optional): 'drop' to drop repeated paragraphs or 'count' to only log their number. Defaults to 'drop'.
+
+    Returns:
+        list[tuple[str, str]]: Log records as (level, message)
+    """
+    records = [('INFO', f"Processing {filename}")]
+    pending = [
+        (target, language_filter)
+        for target, language_filter in zip(targets, language_filters)
+        if force_overwrite or not os.path.exists(os.path.join(target.output_folder, filename))
+    ]
+    if not pending and deduplicate is None:
+        records.append(('INFO', f"File already exists. Skipping {filename}"))
+        return records
+    with open(os.path.join(input_folder, filename), 'r', encoding='utf-8') as file:
+        text = file.read()
+    if pending:
+        records.append(('INFO', f'Number of lines: {len(text.splitlines())}'))
+    paragraphs = tokenizer.tokenize_spans(text)
+    if deduplicate is not None:
+        keep = deduplicate(paragraph_fingerprints(paragraphs))
+        records.append(('INFO', f'Number of repeated paragraphs: {len(keep) - int(np.count_nonzero(keep))}'))
+        if dedup_action == 'drop':
+            paragraphs = paragraphs.subset(np.flatnonzero(keep).tolist())
+    if not pending:
+        records.append(('INFO', f"File already exists. Skipping {filename}"))
+        return records
+    records.append(('INFO', f'Number of paragraphs: {len(paragraphs)}'))
+    languages = language_filters[0].detect_languages(paragraphs)
+    for i, (paragraph, language) in enumerate(zip(paragraphs, languages)):
+        if language is None:
+            records.append(('WARNING', f'Unable to detect language for paragraph {i+1}: "{paragraph[:50]}"'))
+    for target, language_filter in pending:
+        label = f" ({'+'.join(target.languages)})" if len(targets) > 1 else ''
+        filtered_paragraphs = language_filter.filter(paragraphs, languages)
+        records.append(('INFO', f'Number of paragraphs kept{label}: {len(filtered_paragraphs)}'))
+        records.append(
+            (
+                'INFO',
+                f'Percentage of paragraphs kept{label}: {len(filtered_paragraphs)/max(len(paragraphs), 1)*100:.2f}%',
+            )
+        )
+        with open(os.path.join(target.output_folder, filename), 'w', encoding='utf-8') as file:
+            file.write('\n'.join(filtered_paragraphs))
+    return records
+
+
+_worker_state: dict[str, Any] = {}
+
+
+def _init_worker(
+    tokenizer: str,
+    language_detector: str,
+    language_detector_options: dict[str, Any],
+    targets: Sequence[OutputSpec],
+    language_filter_options: dict[str, Any],
+    tokenizer_language: str | None,
+) -> None:
+    """Create the tokenizer and language filters once per worker process"""
+    _worker_state['tokenizer'], _worker_state['language_filters'] = create_pipeline(
+        tokenizer, language_detector, language_detector_options, targets, language_filter_options, tokenizer_language
+    )
+
+
+def _fingerprint_file_in_worker(filename: str, input_folder: str) -> np.ndarray:
+    with open(os.path.join(input_folder, filename), 'r', encoding='utf-8') as file:
+        return paragraph_fingerprints(_worker_state['tokenizer'].tokenize_spans(file.read()))
+
+
+def _precomputed_keep(keep: np.ndarray, _fingerprints: np.ndarray) -> np.ndarray:
+    return keep
+
+
+def _process_file_in_worker(
+    filename: str,
+    keep: np.ndarray | None,
+    input_folder: str,
+    targets: Sequence[OutputSpec],
+    force_overwrite: bool,
+    dedup_action: str,
+) -> list[tuple[str, str]]:
+    return process_file(
+        filename,
+        input_folder,
+        targets,
+        _worker_state['tokenizer'],
+        _worker_state['language_filters'],
+        force_overwrite,
+        partial(_precomputed_keep, keep) if keep is not None else None,
+        dedup_action,
+    )
+
+
+def process_files(  # pylint: disable=too-many-arguments, too-many-positional-arguments
     input_folder: str,
     output_folder: str,
     tokenizer: str,
@@ -20,9 +212,24 @@ def process_files(
     language_detector: str = "langdetect",
     keep_undetected: bool = False,
     force_overwrite: bool = False,
+    outputs: Sequence[OutputSpec | tuple[list[str], str, bool]] | None = None,
+    workers: int = 1,
+    max_detect_chars: int | None = None,
+    profile_store: str | None = None,
+    min_detect_length: int | None = None,
+    tokenizer_language: str | None = None,
+    max_paragraph_repeats: int | None = None,
+    dedup_action: str = 'drop',
+    dedup_method: str = 'counter',
 ) -> None:
     """Process text files in a folder by tokenizing paragraphs, detecting languages, and filtering paragraphs based on language. Save filtered paragraphs to a new folder with the same filenames. Optionally, keep paragraphs with undetected languages. Optionally, overwrite existing files. Log information about the process.
 
+    Additional outputs, each a (languages, output_folder, keep_undetected) tuple, are written from the same tokenize and detect pass, so several language subsets can be extracted with a single pass over the corpus.
+
+    With more than one worker, files are processed in a process pool. Each worker creates its tokenizer and language detector once. Language detection is seeded per paragraph and log records are emitted in file order, so the output and the logs are the same as for a serial run.
+
+    With max_paragraph_repeats, paragraphs that occur more often than that across the corpus, such as boilerplate headers, are dropped before language detection. Files are deduplicated in file order; with workers, the paragraph fingerprints are computed in the pool first and the paragraphs to keep are decided in the main process, so the output is the same as for a serial run.
+
     Args:
         input_folder (str): Path to folder with text files
         output_folder (str): Path to save filtered text files
@@ -32,52 +239,109 @@ def process_files(
         language_detector (str, optional): Language detector to use. Defaults to "langdetect".
         keep_undetected (bool, optional): Keep paragraphs with undetected languages. Defaults to False.
         force_overwrite (bool, optional): Overwrite existing files. Defaults to False.
+        outputs (Sequence[OutputSpec | tuple[list[str], str, bool]] | None, optional): Additional outputs. Defaults to None.
+        workers (int, optional): Number of worker processes. Defaults to 1.
+        max_detect_chars (int | None, optional): Detect long paragraphs adaptively from samples of at most this many characters. Defaults to None.
+        profile_store (str | None, optional): Path to a compiled language profile store, created if it does not exist. Defaults to None.
+        min_detect_length (int | None, optional): Assign paragraphs shorter than this the language of their neighbours instead of detecting it. Defaults to None.
+        tokenizer_language (str | None, optional): Language of the sentence tokenizer, e.g. 'fr' or 'ar'. Defaults to None (English).
+        max_paragraph_repeats (int | None, optional): Keep at most this many occurrences of each paragraph. Defaults to None (no deduplication).
+        dedup_action (str, optional): 'drop' to drop repeated paragraphs or 'count' to only log their number. Defaults to 'drop'.
+        dedup_method (str, optional): 'counter' for exact counts or 'bloom' for a fixed-size Bloom filter, which only supports max_paragraph_repeats=1. Defaults to 'counter'.
     """
     loguru.logger.info(f"Processing files in {input_folder.replace(os.path.expanduser('~'), '~')}")
     text_files = sorted([filename for filename in os.listdir(input_folder) if filename.endswith('.txt')])
     loguru.logger.info(f"Number of files: {len(text_files)}")
 
-    tokenizer = TokenizerFactory.get_tokenizer(tokenizer)
-    loguru.logger.info(f"Using tokenizer: {tokenizer.__class__.__name__}")
-
-    language_detector_options = {"possible_languages": possible_languages, "threshold": None}
+    if isinstance(filter_languages, str):
+        filter_languages = [filter_languages]
+    targets = [OutputSpec(filter_languages, output_folder, keep_undetected)] + [
+        OutputSpec(*output) for output in outputs or []
+    ]
 
-    language_detector = LanguageDetectorFactory.get_language_detector(
-        detector=language_detector, **language_detector_options
+    language_detector_options = {
+        "possible_languages": possible_languages,
+        "threshold": None,
+        "max_chars": max_detect_chars,
+        "profile_store": profile_store,
+    }
+    language_filter_options = {"min_length": min_detect_length}
+    paragraph_tokenizer, language_filters = create_pipeline(
+        tokenizer, language_detector, language_detector_options, targets, language_filter_options, tokenizer_language
     )
 
+    loguru.logger.info(f"Using tokenizer: {paragraph_tokenizer.__class__.__name__}")
     loguru.logger.info(
-        f"Using language detector: {language_detector.__class__.__name__} with options: {language_detector_options}"
+        f"Using language detector: {language_filters[0].language_detector.__class__.__name__} with options: {language_detector_options}"
     )
 
-    language_filter = LanguageFilter(
-        filter_languages, keep_undetected=keep_undetected, language_detector=language_detector
-    )
-    loguru.logger.info(f"Keeping languages: {filter_languages}")
-    loguru.logger.info(f"Keeping undetected paragraphs: {keep_undetected}")
-
-    for filename in text_files:
-        input_file = os.path.join(input_folder, filename)
-        output_file = os.path.join(output_folder, filename)
-        loguru.logger.info(f"Processing {filename}")
-        if os.path.exists(output_file) and not force_overwrite:
-            loguru.logger.info(f"File already exists. Skipping {filename}")
-            continue
-        with open(input_file, 'r', encoding='utf-8') as file:
-            text = file.read()
-        loguru.logger.info(f'Number of lines: {len(text.splitlines())}')
-        paragraphs = tokenizer.tokenize(text)
-        loguru.logger.info(f'Number of paragraphs: {len(paragraphs)}')
-        for i, paragraph in enumerate(paragraphs):
-            language = language_detector.detect(paragraph)
-            if language is None:
-                loguru.logger.warning(f'Unable to detect language for paragraph {i+1}: "{paragraph[:50]}"')
-        filtered_paragraphs = language_filter.filter(paragraphs)
-        loguru.logger.info(f'Number of paragraphs kept: {len(filtered_paragraphs)}')
-        loguru.logger.info(f'Percentage of paragraphs kept: {len(filtered_paragraphs)/len(paragraphs)*100:.2f}%')
-        with open(output_file, 'w', encoding='utf-8') as file:
-            file.write('\n'.join(filtered_paragraphs))
-    loguru.logger.success(f"Files saved in {output_folder.replace(os.path.expanduser('~'), '~')}")
+    if min_detect_length is not None:
+        loguru.logger.info(
+            f"Assigning paragraphs shorter than {min_detect_length} characters the language of their neighbours"
+        )
+
+    deduplicator = None
+    if max_paragraph_repeats is not None:
+        deduplicator = ParagraphDeduplicator(max_paragraph_repeats, dedup_method)
+        loguru.logger.info(
+            f"Deduplicating paragraphs ({dedup_action}) repeated more than {max_paragraph_repeats} times using {dedup_method}"
+        )
+
+    for target in targets:
+        os.makedirs(target.output_folder, exist_ok=True)
+        if len(targets) > 1:
+            loguru.logger.info(f"Saving to: {target.output_folder.replace(os.path.expanduser('~'), '~')}")
+        loguru.logger.info(f"Keeping languages: {target.languages}")
+        loguru.logger.info(f"Keeping undetected paragraphs: {target.keep_undetected}")
+
+    if workers > 1:
+        loguru.logger.info(f"Using {workers} workers")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(
+                tokenizer,
+                language_detector,
+                language_detector_options,
+                targets,
+                language_filter_options,
+                tokenizer_language,
+            ),
+        ) as executor:
+            keeps: list[np.ndarray | None] = [None] * len(text_files)
+            if deduplicator is not None:
+                fingerprints = executor.map(partial(_fingerprint_file_in_worker, input_folder=input_folder), text_files)
+                keeps = [deduplicator.keep(file_fingerprints) for file_fingerprints in fingerprints]
+            results: Iterable[list[tuple[str, str]]] = executor.map(
+                partial(
+                    _process_file_in_worker,
+                    input_folder=input_folder,
+                    targets=targets,
+                    force_overwrite=force_overwrite,
+                    dedup_action=dedup_action,
+                ),
+                text_files,
+                keeps,
+            )
+            for records in results:
+                for level, message in records:
+                    loguru.logger.log(level, message)
+    else:
+        for filename in text_files:
+            for level, message in process_file(
+                filename,
+                input_folder,
+                targets,
+                paragraph_tokenizer,
+                language_filters,
+                force_overwrite,
+                deduplicator.keep if deduplicator is not None else None,
+                dedup_action,
+            ):
+                loguru.logger.log(level, message)
+
+    for target in targets:
+        loguru.logger.success(f"Files saved in {target.output_folder.replace(os.path.expanduser('~'), '~')}")
 
 
 class FilterLanguages(str, Enum):
@@ -99,6 +363,35 @@ def main(  # pylint: disable=too-many-arguments, too-many-positional-arguments
     keep_undetected: bool = False,
     force_overwrite: bool = False,
     logging_levels: list[str] | None = None,
+    output: (
+        Annotated[
+            list[str], typer.Option(help="Additional output as LANGUAGES:OUTPUT_FOLDER, e.g. fr+en:/data/fre_eng")
+        ]
+        | None
+    ) = None,
+    workers: Annotated[int, typer.Option(help="Number of worker processes")] = 1,
+    max_detect_chars: Annotated[
+        Optional[int],
+        typer.Option(help="Detect long paragraphs adaptively from samples of at most this many characters"),
+    ] = None,
+    profile_store: Annotated[
+        Optional[str], typer.Option(help="Compiled language profile store, created if it does not exist")
+    ] = None,
+    min_detect_length: Annotated[
+        Optional[int], typer.Option(help="Assign paragraphs shorter than this the language of their neighbours")
+    ] = None,
+    tokenizer_language: Annotated[
+        Optional[str], typer.Option(help="Language of the sentence tokenizer, e.g. fr or ar. Defaults to English")
+    ] = None,
+    max_paragraph_repeats: Annotated[
+        Optional[int], typer.Option(help="Keep at most this many occurrences of each paragraph across the corpus")
+    ] = None,
+    paragraph_dedup: Annotated[
+        DedupAction, typer.Option(help="Drop repeated paragraphs or only count them")
+    ] = DedupAction.drop,
+    paragraph_dedup_method: Annotated[
+        DedupMethod, typer.Option(help="Exact counter, or a Bloom filter for very large corpora (one occurrence only)")
+    ] = DedupMethod.counter,
 ) -> None:
     """Process text files in a folder by tokenizing paragraphs, detecting languages, and filtering paragraphs based on language. Save filtered paragraphs to a new folder with the same filenames. Optionally, keep paragraphs with undetected languages. Optionally, overwrite existing files. Log information about the process.
 
@@ -112,6 +405,15 @@ def main(  # pylint: disable=too-many-arguments, too-many-positional-arguments
         keep_undetected (bool, optional): Keep paragraphs with undetected languages. Defaults to False.
         force_overwrite (bool, optional): Overwrite existing files. Defaults to False.
         logging_levels (list[str], optional): Logging levels. Defaults to ['INFO', 'WARNING', 'DEBUG'].
+        output (Annotated[list[str], typer.Option()], optional): Additional outputs written in the same pass. Defaults to None.
+        workers (int, optional): Number of worker processes. Defaults to 1.
+        max_detect_chars (int | None, optional): Detect long paragraphs adaptively from samples of at most this many characters. Defaults to None.
+        profile_store (str | None, optional): Compiled language profile store, created if it does not exist. Defaults to None.
+        min_detect_length (int | None, optional): Assign paragraphs shorter than this the language of their neighbours instead of detecting it. Defaults to None.
+        tokenizer_language (str | None, optional): Language of the sentence tokenizer. Defaults to None (English).
+        max_paragraph_repeats (int | None, optional): Keep at most this many occurrences of each paragraph. Defaults to None (no deduplication).
+        paragraph_dedup (DedupAction, optional): Drop repeated paragraphs or only count them. Defaults to DedupAction.drop.
+        paragraph_dedup_method (DedupMethod, optional): Deduplication method. Defaults to DedupMethod.counter.
     """
 
     if filter_languages is None:
@@ -140,6 +442,15 @@ def main(  # pylint: disable=too-many-arguments, too-many-positional-arguments
         language_detector,
         keep_undetected,
         force_overwrite,
+        [parse_output_spec(spec, keep_undetected) for spec in output or []],
+        workers,
+        max_detect_chars,
+        profile_store,
+        min_detect_length,
+        tokenizer_language,
+        max_paragraph_repeats,
+        paragraph_dedup.value,
+        paragraph_dedup_method.value,
     )
 
 
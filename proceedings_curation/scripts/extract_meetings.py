@@ -1,21 +1,32 @@
 import os
 from datetime import datetime
+from enum import Enum
 from pathlib import Path
+from typing import TYPE_CHECKING, Optional
 
-import argh
 import pandas as pd
-from argh import arg
+import typer
 from loguru import logger
-from pdf_extract.interface import ITextExtractor
+from typing_extensions import Annotated
 
-from proceedings_curation.extractors import PDFBoxExtractorMod, TesseractExtractorMod
+from proceedings_curation.metadata.changes import touched_meetings
+from proceedings_curation.metadata.excel import Engine
+from proceedings_curation.metadata.schema import load_metadata_index
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pdf_extract.interface import ITextExtractor
+
+
+class Extractor(str, Enum):
+    pdfbox = 'pdfbox'
+    tesseract = 'tesseract'
 
 
 def extract_meetings(  # pylint: disable=redefined-outer-name
     index: pd.DataFrame,
     input_path: str | os.PathLike[str],
     output_path: str | os.PathLike[str],
-    extractor: ITextExtractor,
+    extractor: 'ITextExtractor',
     page_numbers: bool = False,
     page_sep: str = '',
     force: bool = False,
@@ -31,6 +42,7 @@ def extract_meetings(  # pylint: disable=redefined-outer-name
         page_sep (str, optional): Page separator. Defaults to ''.
         force (bool, optional): Force overwrite existing files. Defaults to False.
     """
+    from proceedings_curation.extractors import TesseractExtractorMod  # pylint: disable=import-outside-toplevel
 
     Path(output_path).mkdir(parents=True, exist_ok=True)
 
@@ -54,24 +66,18 @@ def extract_meetings(  # pylint: disable=redefined-outer-name
         )
 
 
-@arg(
-    '-e',
-    '--extractor',
-    choices=[
-        'pdfbox',
-        'tesseract',
-    ],
-    default='pdfbox',
-)
-def main(
-    metadata_index: str | os.PathLike[str],
-    input_path: str | os.PathLike[str],
-    output_path: str | os.PathLike[str],
-    *,
-    extractor: str = 'pdfbox',
+def main(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+    metadata_index: Annotated[Path, typer.Argument()],
+    input_path: Annotated[Path, typer.Argument()],
+    output_path: Annotated[Path, typer.Argument()],
+    extractor: Annotated[Extractor, typer.Option('--extractor', '-e')] = Extractor.pdfbox,
     page_numbers: bool = False,
     page_sep: str = '',
     force: bool = False,
+    excel_engine: Annotated[Engine, typer.Option(help="Excel reader, auto uses calamine if installed")] = Engine.auto,
+    changes: Annotated[
+        Optional[Path], typer.Option(help="Only extract the added and modified meetings of a change set")
+    ] = None,
 ) -> None:
     """Extract text from PDF files
 
@@ -80,13 +86,20 @@ def main(
         metadata_index (str | os.PathLike): Path to metadata index
         input_path (str | os.PathLike): Path to PDF files
         output_path (str | os.PathLike): Path to save extracted text
+        extractor (Extractor, optional): PDF text extractor. Defaults to 'pdfbox'.
         page_numbers (bool, optional): Extract page numbers. Defaults to False.
         page_sep (str, optional): Page separator. Defaults to ''.
         force (bool, optional): Force overwrite existing files. Defaults to False.
+        excel_engine (Engine, optional): Engine used to read the metadata index. Defaults to Engine.auto.
+        changes (str | os.PathLike, optional): Change set saved by `create_metadata_index --changes`. Only its added and modified meetings are extracted, overwriting existing files. Defaults to None.
 
     Raises:
         FileNotFoundError: If any file in the index is not found in the input path
     """
+    from proceedings_curation.extractors import (  # pylint: disable=import-outside-toplevel
+        PDFBoxExtractorMod,
+        TesseractExtractorMod,
+    )
 
     input_path = Path(input_path)
     output_path = Path(output_path)
@@ -97,12 +110,16 @@ def main(
         format='{time:YYYY-MM-DD HH:mm:ss.SSS} | {level} | {message}',
     )
 
-    index = load_index(metadata_index)
+    index = load_index(metadata_index, excel_engine)
+    if changes is not None:
+        index = index[index.index.isin(touched_meetings(changes))]
+        force = True
+        logger.info(f'Extracting {len(index)} added or modified meetings')
 
     check_source_files(input_path, index)
 
-    extractor = TesseractExtractorMod() if extractor == 'tesseract' else PDFBoxExtractorMod()
-    extract_meetings(index, input_path, output_path, extractor, page_numbers, page_sep, force)
+    text_extractor = TesseractExtractorMod() if extractor == Extractor.tesseract else PDFBoxExtractorMod()
+    extract_meetings(index, input_path, output_path, text_extractor, page_numbers, page_sep, force)
 
     logger.remove(logfile)
 
@@ -120,31 +137,19 @@ def check_source_files(input_path: str | os.PathLike[str], metadata_index: pd.Da
         logger.info(f'Found all source files in {input_path}')
 
 
-def load_index(metadata_index: str | os.PathLike[str]) -> pd.DataFrame:
-    """Load metadata index
+def load_index(metadata_index: str | os.PathLike[str], engine: Engine | str = Engine.auto) -> pd.DataFrame:
+    """Load metadata index with the dtypes of `METADATA_INDEX_DTYPES`
 
     Args:
         metadata_index (str | os.PathLike[str]): Path to metadata index
+        engine (Engine | str, optional): Engine used to read an Excel file, see `resolve_engine`. Defaults to Engine.auto.
 
     Returns:
         pd.DataFrame: Metadata index
     """
     logger.info('Loading index')
-    index = pd.read_excel(
-        metadata_index,
-        index_col='meeting_id',
-        dtype={
-            'record_number': 'uint32',
-            'publication_date': 'uint16',
-            'conference_date': 'uint16',
-            'columns': 'uint8',
-            'first_page': 'uint16',
-            'last_page': 'uint16',
-        },
-    )
-
-    return index
+    return load_metadata_index(metadata_index, engine)
 
 
 if __name__ == '__main__':  # pragma: no cover
-    argh.dispatch_command(main)
+    typer.run(main)
@@ -0,0 +1,105 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import typer
+from loguru import logger
+from typing_extensions import Annotated
+
+from proceedings_curation.deduplication.deduplication import MinHasher, duplicate_exclusions, find_near_duplicates
+
+
+def file_signature(filename: str, input_folder: str, minhasher: MinHasher) -> np.ndarray:
+    """MinHash signature of a text file
+
+    Args:
+        filename (str): Name of the text file
+        input_folder (str): Folder with text files
+        minhasher (MinHasher): MinHasher
+
+    Returns:
+        np.ndarray: Signature
+    """
+    with open(os.path.join(input_folder, filename), 'r', encoding='utf-8') as file:
+        return minhasher.signature(file.read())
+
+
+def find_near_duplicate_meetings(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+    input_folder: str,
+    report: str,
+    exclusions: str,
+    threshold: float = 0.8,
+    num_perm: int = 128,
+    bands: int = 16,
+    shingle_size: int = 5,
+    workers: int = 1,
+) -> None:
+    """Find near-duplicate meeting texts with MinHash and locality-sensitive hashing. Save a report of the near-duplicate pairs and an exclusion list with the text files to leave out of the dataset, all but the earliest meeting of each group of near-duplicates.
+
+    Args:
+        input_folder (str): Folder with meeting text files
+        report (str): Path to save the report (CSV)
+        exclusions (str): Path to save the exclusion list, one file name per line
+        threshold (float, optional): Minimum estimated Jaccard similarity of near-duplicates. Defaults to 0.8.
+        num_perm (int, optional): Length of the MinHash signatures. Defaults to 128.
+        bands (int, optional): Number of LSH bands. Defaults to 16.
+        shingle_size (int, optional): Number of words in a shingle. Defaults to 5.
+        workers (int, optional): Number of worker processes. Defaults to 1.
+    """
+    filenames = sorted(filename for filename in os.listdir(input_folder) if filename.endswith('.txt'))
+    logger.info(f"Computing signatures of {len(filenames)} files in {input_folder}")
+
+    minhasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size)
+    signature = partial(file_signature, input_folder=input_folder, minhasher=minhasher)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            signatures = list(executor.map(signature, filenames, chunksize=max(1, len(filenames) // (workers * 8))))
+    else:
+        signatures = [signature(filename) for filename in filenames]
+
+    pairs = find_near_duplicates(
+        np.vstack(signatures) if signatures else np.empty((0, num_perm), dtype=np.uint64), threshold, bands
+    )
+    excluded = duplicate_exclusions(filenames, pairs)
+    logger.info(f"Found {len(pairs)} near-duplicate pairs, excluding {len(excluded)} files")
+
+    for path in [report, exclusions]:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    pd.DataFrame(
+        [(filenames[i], filenames[j], round(score, 4)) for i, j, score in pairs],
+        columns=['file', 'duplicate_file', 'similarity'],
+    ).to_csv(report, sep=';', index=False)
+    with open(exclusions, 'w', encoding='utf-8') as file:
+        file.writelines(f'{filename}\n' for filename in excluded)
+    logger.success(f"Report saved in {report}, exclusion list saved in {exclusions}")
+
+
+def main(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+    input_folder: str,
+    report: str,
+    exclusions: str,
+    threshold: Annotated[float, typer.Option(help="Minimum estimated Jaccard similarity")] = 0.8,
+    num_perm: Annotated[int, typer.Option(help="Length of the MinHash signatures")] = 128,
+    bands: Annotated[int, typer.Option(help="Number of LSH bands, must divide num-perm")] = 16,
+    shingle_size: Annotated[int, typer.Option(help="Number of words in a shingle")] = 5,
+    workers: Annotated[int, typer.Option(help="Number of worker processes")] = 1,
+) -> None:
+    """Find near-duplicate meeting texts and save a report and an exclusion list for create_jsonl_dataset --exclude.
+
+    Args:
+        input_folder (str): Folder with meeting text files
+        report (str): Path to save the report (CSV)
+        exclusions (str): Path to save the exclusion list
+        threshold (float, optional): Minimum estimated Jaccard similarity. Defaults to 0.8.
+        num_perm (int, optional): Length of the MinHash signatures. Defaults to 128.
+        bands (int, optional): Number of LSH bands. Defaults to 16.
+        shingle_size (int, optional): Number of words in a shingle. Defaults to 5.
+        workers (int, optional): Number of worker processes. Defaults to 1.
+    """
+    find_near_duplicate_meetings(input_folder, report, exclusions, threshold, num_perm, bands, shingle_size, workers)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    typer.run(main)
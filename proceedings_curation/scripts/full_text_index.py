@@ -0,0 +1,160 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from typing import Any, Iterable, Optional
+
+import pandas as pd
+import typer
+from loguru import logger
+from typing_extensions import Annotated
+
+from proceedings_curation.metadata.manifest import manifest_entry
+from proceedings_curation.metadata.schema import load_metadata_index
+from proceedings_curation.search.inverted_index import InvertedIndex, QueryError, meeting_postings
+from proceedings_curation.tokenizers.tokenizers import TokenizerFactory
+
+
+def index_postings(
+    path: str, tokenizer: str = 'simple', tokenizer_language: str | None = None
+) -> tuple[bytes, dict[str, bytes]]:
+    """Read a meeting text file and encode its paragraph offsets and postings
+
+    Args:
+        path (str): Path to the text file
+        tokenizer (str, optional): Paragraph tokenizer. Defaults to 'simple'.
+        tokenizer_language (str | None, optional): Language of the sentence tokenizer. Defaults to None (English).
+
+    Returns:
+        tuple[bytes, dict[str, bytes]]: Encoded paragraph offsets and positions by term, see `meeting_postings`
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        return meeting_postings(file.read(), TokenizerFactory.get_tokenizer(tokenizer, language=tokenizer_language))
+
+
+def meeting_metadata(row: pd.Series) -> dict[str, Any]:
+    """Year, title and language codes of a meeting from its metadata index row
+
+    Args:
+        row (pd.Series): Metadata index row
+
+    Returns:
+        dict[str, Any]: Metadata stored in the index
+    """
+    return {
+        'year': int(row.conference_date) if not pd.isna(row.conference_date) else None,
+        'title': row.title_meeting if isinstance(row.title_meeting, str) else None,
+        'language_codes': row.language_codes if isinstance(row.language_codes, str) else None,
+    }
+
+
+def index_meetings(  # pylint: disable=too-many-locals
+    metadata_index: str,
+    input_path: str,
+    index_path: str,
+    tokenizer: Annotated[str, typer.Option(help="Paragraph tokenizer, simple or nltk")] = 'simple',
+    tokenizer_language: Annotated[
+        Optional[str], typer.Option(help="Language of the sentence tokenizer of the nltk tokenizer")
+    ] = None,
+    workers: Annotated[int, typer.Option(help="Number of worker processes")] = 1,
+) -> None:
+    """Build or update a full-text index of the meeting texts in a folder, with the year, title and language codes of each meeting from the metadata index.
+
+    The index is an SQLite database with the positions (paragraph and word) of each word of each meeting. Indexing is incremental: only new meetings and meetings whose text file or metadata changed are read, and meetings that are no longer in the metadata index or whose text file is missing are removed. An index built with another tokenizer is rebuilt in full.
+
+    Args:
+        metadata_index (str): Path to the metadata index
+        input_path (str): Path to the folder of text files
+        index_path (str): Path to the index
+        tokenizer (str, optional): Paragraph tokenizer. Defaults to 'simple'.
+        tokenizer_language (str, optional): Language of the sentence tokenizer. Defaults to None (English).
+        workers (int, optional): Number of worker processes. Defaults to 1.
+    """
+    index = load_metadata_index(metadata_index)
+
+    os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+    with InvertedIndex(index_path) as inverted_index:
+        settings = f'{tokenizer}:{tokenizer_language or ""}'
+        if inverted_index.setting('tokenizer') != settings:
+            for meeting_id in inverted_index.meetings():
+                inverted_index.remove_meeting(meeting_id)
+            inverted_index.commit()
+            inverted_index.set_setting('tokenizer', settings)
+        indexed = inverted_index.meetings()
+
+        changed = []
+        current = set()
+        for meeting_id, row in index.iterrows():
+            entry = manifest_entry(meeting_id, row, input_path, indexed.get(int(meeting_id)))
+            if entry is None:
+                logger.warning(f"File not found for meeting {meeting_id}")
+                continue
+            current.add(int(meeting_id))
+            previous = indexed.get(int(meeting_id))
+            if (
+                previous is None
+                or previous['text_hash'] != entry['text_hash']
+                or previous['meta_hash'] != entry['meta_hash']
+            ):
+                changed.append((int(meeting_id), entry, meeting_metadata(row)))
+
+        removed = indexed.keys() - current
+        logger.info(
+            f"Indexing {len(changed)} new or changed meetings, keeping {len(current) - len(changed)}, removing {len(removed)}"
+        )
+        for meeting_id in removed:
+            inverted_index.remove_meeting(meeting_id)
+
+        postings = partial(index_postings, tokenizer=tokenizer, tokenizer_language=tokenizer_language)
+        paths = [os.path.join(input_path, entry['file']) for _, entry, _ in changed]
+        with ExitStack() as stack:
+            built: Iterable[tuple[bytes, dict[str, bytes]]]
+            if workers > 1 and changed:
+                executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+                built = executor.map(postings, paths, chunksize=max(1, len(paths) // (workers * 8)))
+            else:
+                built = map(postings, paths)
+            for (meeting_id, entry, metadata), (paragraphs, term_positions) in zip(changed, built):
+                inverted_index.add_meeting(meeting_id, entry, metadata, paragraphs, term_positions)
+        inverted_index.commit()
+        logger.success(f"Index saved in {index_path} with {len(inverted_index)} meetings")
+
+
+def search_meetings(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+    index_path: str,
+    query: str,
+    year_from: Annotated[Optional[int], typer.Option(help="Earliest year")] = None,
+    year_to: Annotated[Optional[int], typer.Option(help="Latest year")] = None,
+    language: Annotated[Optional[str], typer.Option(help="Language code of the meetings, e.g. eng")] = None,
+    limit: Annotated[Optional[int], typer.Option(help="Maximum number of meetings")] = None,
+) -> None:
+    """Search the full-text index and print the matching meetings, one per line, with the numbers of the matching paragraphs.
+
+    Terms separated by spaces or AND must all occur in a meeting, OR matches either side, NOT or a leading '-' excludes meetings, parentheses group, and double quotes match a phrase within a paragraph, e.g. 'education AND (peace OR "human rights") -war'.
+
+    Args:
+        index_path (str): Path to the index
+        query (str): Query
+        year_from (int, optional): Earliest year. Defaults to None.
+        year_to (int, optional): Latest year. Defaults to None.
+        language (str, optional): Language code of the meetings, e.g. 'eng'. Defaults to None.
+        limit (int, optional): Maximum number of meetings. Defaults to None.
+    """
+    if not os.path.exists(index_path):
+        raise typer.BadParameter(f'Index not found: "{index_path}"')
+    with InvertedIndex(index_path) as inverted_index:
+        try:
+            hits = inverted_index.search(query, year_from, year_to, language, limit)
+        except QueryError as error:
+            raise typer.BadParameter(str(error)) from error
+    for hit in hits:
+        paragraphs = ','.join(str(paragraph + 1) for paragraph in hit.paragraphs)
+        typer.echo(f"{hit.meeting_id}\t{hit.year}\t{hit.file}\t{hit.title}\t{paragraphs}")
+    logger.info(f"{len(hits)} meetings found")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    app = typer.Typer()
+    app.command()(index_meetings)
+    app.command()(search_meetings)
+    app()
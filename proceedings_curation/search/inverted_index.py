@@ -0,0 +1,485 @@
+import os
+import re
+import sqlite3
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+
+from proceedings_curation.tokenizers.tokenizers import ParagraphTokenizer, word_tokenize
+
+# Version of the index schema and postings. Increase it when they change, so indexes are rebuilt in full.
+INDEX_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS meetings (
+    meeting_id INTEGER PRIMARY KEY,
+    file TEXT NOT NULL,
+    year INTEGER,
+    title TEXT,
+    language_codes TEXT,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    text_hash TEXT NOT NULL,
+    meta_hash TEXT NOT NULL,
+    paragraphs BLOB NOT NULL,
+    terms BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS terms (term_id INTEGER PRIMARY KEY, term TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS postings (
+    term_id INTEGER NOT NULL,
+    meeting_id INTEGER NOT NULL,
+    positions BLOB NOT NULL,
+    PRIMARY KEY (term_id, meeting_id)
+) WITHOUT ROWID;
+"""
+
+
+def encode_varints(values: Iterable[int]) -> bytes:
+    """Encode non-negative integers as LEB128 varints, 7 bits per byte
+
+    Args:
+        values (Iterable[int]): Non-negative integers
+
+    Returns:
+        bytes: Encoded integers
+    """
+    encoded = bytearray()
+    for value in values:
+        while value > 0x7F:
+            encoded.append(value & 0x7F | 0x80)
+            value >>= 7
+        encoded.append(value)
+    return bytes(encoded)
+
+
+def decode_varints(data: bytes) -> np.ndarray:
+    """Decode LEB128 varints of up to 63 bits, all at once
+
+    Args:
+        data (bytes): Encoded integers
+
+    Returns:
+        np.ndarray: Integers (int64)
+    """
+    if not data:
+        return np.empty(0, dtype=np.int64)
+    encoded = np.frombuffer(data, dtype=np.uint8)
+    last = np.flatnonzero(encoded < 0x80)
+    first = np.concatenate([[0], last[:-1] + 1])
+    shifts = (np.arange(len(encoded)) - np.repeat(first, last - first + 1)) * 7
+    return np.add.reduceat((encoded & 0x7F).astype(np.int64) << shifts, first)
+
+
+def encode_positions(positions: Sequence[tuple[int, int]]) -> bytes:
+    """Encode sorted (paragraph, word) positions of a term in a meeting. Paragraphs are delta-encoded, and so are words within the same paragraph.
+
+    Args:
+        positions (Sequence[tuple[int, int]]): Sorted paragraph numbers and word numbers within the paragraph
+
+    Returns:
+        bytes: Encoded positions
+    """
+    values = []
+    last_paragraph = last_word = 0
+    for paragraph, word in positions:
+        values.append(paragraph - last_paragraph)
+        values.append(word - last_word if paragraph == last_paragraph else word)
+        last_paragraph, last_word = paragraph, word
+    return encode_varints(values)
+
+
+def decode_positions(data: bytes) -> np.ndarray:
+    """Decode positions encoded with `encode_positions`
+
+    Args:
+        data (bytes): Encoded positions
+
+    Returns:
+        np.ndarray: Paragraph numbers and word numbers within the paragraph, one row per position
+    """
+    values = decode_varints(data)
+    paragraph_deltas, word_values = values[::2], values[1::2]
+    # Words are cumulative within runs of positions in the same paragraph
+    words = np.cumsum(word_values)
+    run_starts = np.maximum.accumulate(np.where(paragraph_deltas != 0, np.arange(len(words)), 0))
+    words = words - words[run_starts] + word_values[run_starts] if len(words) else words
+    return np.column_stack([np.cumsum(paragraph_deltas), words])
+
+
+def meeting_postings(text: str, tokenizer: ParagraphTokenizer) -> tuple[bytes, dict[str, bytes]]:
+    """Tokenize a meeting text into paragraphs and words and encode the postings of each word
+
+    Args:
+        text (str): Meeting text
+        tokenizer (ParagraphTokenizer): Paragraph tokenizer
+
+    Returns:
+        tuple[bytes, dict[str, bytes]]: Encoded (start, end) character offsets of the paragraphs, and encoded positions by term
+    """
+    paragraphs = tokenizer.tokenize_spans(text)
+    positions: dict[str, list[tuple[int, int]]] = defaultdict(list)
+    for i, paragraph in enumerate(paragraphs):
+        for j, word in enumerate(word_tokenize(paragraph)):
+            positions[word].append((i, j))
+    offsets = []
+    last_end = 0
+    for start, end in paragraphs.spans():
+        offsets += [start - last_end, end - start]
+        last_end = end
+    return encode_varints(offsets), {
+        term: encode_positions(term_positions) for term, term_positions in positions.items()
+    }
+
+
+@dataclass
+class Hit:
+    """Meeting matching a query, with the paragraphs in which the query terms were found"""
+
+    meeting_id: int
+    file: str
+    year: int | None
+    title: str | None
+    language_codes: str | None
+    paragraphs: list[int] = field(default_factory=list)
+    spans: list[tuple[int, int]] = field(default_factory=list)
+
+
+class QueryError(ValueError):
+    """Invalid search query"""
+
+
+QUERY_TOKEN = re.compile(r'\s*(?:(")([^"]*)"|(\()|(\))|(-)|([^\s()"]+))')
+
+
+def parse_query(query: str) -> Any:
+    """Parse a boolean query into a tree of tuples. Terms separated by spaces or AND must all occur, OR matches either side, NOT or a leading '-' excludes meetings, parentheses group, and double quotes match a phrase within a paragraph. A term that tokenizes into several words, e.g. 'co-operation', is a phrase.
+
+    Args:
+        query (str): Query, e.g. 'education AND (peace OR "human rights") -war'
+
+    Raises:
+        QueryError: If the query is invalid or empty
+
+    Returns:
+        Any: ('and', left, right), ('or', left, right), ('not', operand) or ('phrase', words)
+    """
+    tokens: list[tuple[str, Any]] = []
+    position = 0
+    query = query.strip()
+    while position < len(query):
+        match = QUERY_TOKEN.match(query, position)
+        if match is None:
+            raise QueryError(f'Invalid query: "{query}"')
+        position = match.end()
+        if match.group(1):
+            tokens.append(('phrase', match.group(2)))
+        elif match.group(3) or match.group(4):
+            tokens.append((match.group(3) or match.group(4), None))
+        elif match.group(5):
+            tokens.append(('NOT', None))
+        elif match.group(6) in ('AND', 'OR', 'NOT'):
+            tokens.append((match.group(6), None))
+        else:
+            tokens.append(('phrase', match.group(6)))
+
+    def phrase(text: str) -> Any:
+        words = word_tokenize(text)
+        if not words:
+            raise QueryError(f'No words in "{text}"')
+        return ('phrase', tuple(words))
+
+    def parse_or(i: int) -> tuple[Any, int]:
+        node, i = parse_and(i)
+        while i < len(tokens) and tokens[i][0] == 'OR':
+            right, i = parse_and(i + 1)
+            node = ('or', node, right)
+        return node, i
+
+    def parse_and(i: int) -> tuple[Any, int]:
+        node, i = parse_unary(i)
+        while i < len(tokens) and tokens[i][0] not in ('OR', ')'):
+            if tokens[i][0] == 'AND':
+                i += 1
+            right, i = parse_unary(i)
+            node = ('and', node, right)
+        return node, i
+
+    def parse_unary(i: int) -> tuple[Any, int]:
+        if i >= len(tokens):
+            raise QueryError(f'Unexpected end of query: "{query}"')
+        kind, value = tokens[i]
+        if kind == 'NOT':
+            operand, i = parse_unary(i + 1)
+            return ('not', operand), i
+        if kind == '(':
+            node, i = parse_or(i + 1)
+            if i >= len(tokens) or tokens[i][0] != ')':
+                raise QueryError(f'Missing closing parenthesis: "{query}"')
+            return node, i + 1
+        if kind == 'phrase':
+            return phrase(value), i + 1
+        raise QueryError(f'Unexpected {kind} in query: "{query}"')
+
+    if not tokens:
+        raise QueryError('Empty query')
+    tree, end = parse_or(0)
+    if end != len(tokens):
+        raise QueryError(f'Unexpected {tokens[end][0]} in query: "{query}"')
+    return tree
+
+
+class InvertedIndex:
+    """Inverted full-text index of meeting texts in an SQLite database. For each term and meeting, the paragraph and word positions of the term are stored as a varint-encoded blob, so a term is looked up with a single primary key range scan and phrases are matched from the positions. Meetings are indexed and removed one at a time, so the index can be updated incrementally."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Open an index, creating it if it does not exist. An index with another version is cleared.
+
+        Args:
+            path (str | os.PathLike[str]): Path to the SQLite database
+        """
+        self.path = os.fspath(path)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.execute('PRAGMA synchronous = NORMAL')
+        self.connection.execute('PRAGMA cache_size = -65536')
+        self.connection.executescript(SCHEMA)
+        if self.setting('version') != str(INDEX_VERSION):
+            with self.connection:
+                for table in ['postings', 'terms', 'meetings', 'settings']:
+                    self.connection.execute(f'DELETE FROM {table}')  # nosec
+                self.connection.execute('INSERT INTO settings VALUES (?, ?)', ('version', str(INDEX_VERSION)))
+        self.term_ids: dict[str, int] | None = None
+
+    def setting(self, key: str) -> str | None:
+        """Value of a setting of the index, e.g. the tokenizer it was built with
+
+        Args:
+            key (str): Setting
+
+        Returns:
+            str | None: Value, or None if it is not set
+        """
+        row = self.connection.execute('SELECT value FROM settings WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_setting(self, key: str, value: str) -> None:
+        """Set a setting of the index
+
+        Args:
+            key (str): Setting
+            value (str): Value
+        """
+        with self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO settings VALUES (?, ?)', (key, value))
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM meetings').fetchone()[0]
+
+    def meetings(self) -> dict[int, dict[str, Any]]:
+        """Indexed meetings with their file name, size, modification time and hashes, as in the manifest of `create_jsonl_dataset`
+
+        Returns:
+            dict[int, dict[str, Any]]: Meetings by meeting id
+        """
+        rows = self.connection.execute('SELECT meeting_id, file, size, mtime_ns, text_hash, meta_hash FROM meetings')
+        return {
+            row[0]: {'file': row[1], 'size': row[2], 'mtime_ns': row[3], 'text_hash': row[4], 'meta_hash': row[5]}
+            for row in rows
+        }
+
+    def _term_id(self, term: str) -> int:
+        if self.term_ids is None:
+            self.term_ids = dict(self.connection.execute('SELECT term, term_id FROM terms'))
+        if (term_id := self.term_ids.get(term)) is None:
+            term_id = self.connection.execute('INSERT INTO terms (term) VALUES (?)', (term,)).lastrowid
+            assert term_id is not None
+            self.term_ids[term] = term_id
+        return term_id
+
+    def add_meeting(
+        self,
+        meeting_id: int,
+        entry: dict[str, Any],
+        metadata: dict[str, Any],
+        paragraphs: bytes,
+        postings: dict[str, bytes],
+    ) -> None:
+        """Add or replace a meeting, without committing
+
+        Args:
+            meeting_id (int): Meeting id
+            entry (dict[str, Any]): File name, size, modification time and hashes of the meeting, see `meetings`
+            metadata (dict[str, Any]): Year, title and language codes of the meeting
+            paragraphs (bytes): Encoded paragraph offsets from `meeting_postings`
+            postings (dict[str, bytes]): Encoded positions by term from `meeting_postings`
+        """
+        self.remove_meeting(meeting_id)
+        term_ids = sorted((self._term_id(term), positions) for term, positions in postings.items())
+        self.connection.execute(
+            'INSERT INTO meetings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                meeting_id,
+                entry['file'],
+                metadata.get('year'),
+                metadata.get('title'),
+                metadata.get('language_codes'),
+                entry['size'],
+                entry['mtime_ns'],
+                entry['text_hash'],
+                entry['meta_hash'],
+                paragraphs,
+                encode_varints(np.diff([0] + [term_id for term_id, _ in term_ids]).tolist()),
+            ),
+        )
+        self.connection.executemany(
+            'INSERT INTO postings VALUES (?, ?, ?)',
+            ((term_id, meeting_id, positions) for term_id, positions in term_ids),
+        )
+
+    def remove_meeting(self, meeting_id: int) -> None:
+        """Remove a meeting and its postings, without committing. The postings are found from the term ids stored with the meeting, so they are deleted by primary key.
+
+        Args:
+            meeting_id (int): Meeting id
+        """
+        row = self.connection.execute('SELECT terms FROM meetings WHERE meeting_id = ?', (meeting_id,)).fetchone()
+        if row is None:
+            return
+        self.connection.executemany(
+            'DELETE FROM postings WHERE term_id = ? AND meeting_id = ?',
+            ((term_id, meeting_id) for term_id in np.cumsum(decode_varints(row[0])).tolist()),
+        )
+        self.connection.execute('DELETE FROM meetings WHERE meeting_id = ?', (meeting_id,))
+
+    def commit(self) -> None:
+        """Commit added and removed meetings"""
+        self.connection.commit()
+
+    def _postings(self, term: str) -> dict[int, np.ndarray]:
+        # Positions as paragraph << 32 | word, so that the next word of a phrase is at position + 1
+        rows = self.connection.execute(
+            'SELECT meeting_id, positions FROM postings WHERE term_id = (SELECT term_id FROM terms WHERE term = ?)',
+            (term,),
+        )
+        postings = {}
+        for meeting_id, data in rows:
+            positions = decode_positions(data)
+            postings[meeting_id] = positions[:, 0] << 32 | positions[:, 1]
+        return postings
+
+    def _phrase(self, words: Sequence[str]) -> dict[int, set[int]]:
+        postings = [self._postings(words[0])]
+        meetings = set(postings[0])
+        for word in words[1:]:
+            if not meetings:
+                return {}
+            postings.append(self._postings(word))
+            meetings &= set(postings[-1])
+        matches: dict[int, set[int]] = {}
+        for meeting_id in meetings:
+            positions = postings[0][meeting_id]
+            found = np.ones(len(positions), dtype=bool)
+            for i, word_postings in enumerate(postings[1:]):
+                found &= np.isin(positions + i + 1, word_postings[meeting_id])
+            if found.any():
+                matches[meeting_id] = set((positions[found] >> 32).tolist())
+        return matches
+
+    def _evaluate(self, node: Any) -> dict[int, set[int]]:
+        kind = node[0]
+        if kind == 'phrase':
+            return self._phrase(node[1])
+        if kind == 'not':
+            excluded = self._evaluate(node[1])
+            return {
+                row[0]: set()
+                for row in self.connection.execute('SELECT meeting_id FROM meetings')
+                if row[0] not in excluded
+            }
+        left, right = self._evaluate(node[1]), self._evaluate(node[2])
+        if kind == 'and':
+            return {meeting_id: left[meeting_id] | right[meeting_id] for meeting_id in left.keys() & right.keys()}
+        return {
+            meeting_id: left.get(meeting_id, set()) | right.get(meeting_id, set())
+            for meeting_id in left.keys() | right.keys()
+        }
+
+    def search(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        query: str,
+        year_from: int | None = None,
+        year_to: int | None = None,
+        language: str | None = None,
+        limit: int | None = None,
+    ) -> list[Hit]:
+        """Find the meetings matching a query, see `parse_query`
+
+        Args:
+            query (str): Query
+            year_from (int | None, optional): Earliest year. Defaults to None.
+            year_to (int | None, optional): Latest year. Defaults to None.
+            language (str | None, optional): Language code that must be among the language codes of the meeting, e.g. 'eng'. Defaults to None.
+            limit (int | None, optional): Maximum number of hits. Defaults to None.
+
+        Raises:
+            QueryError: If the query is invalid
+
+        Returns:
+            list[Hit]: Hits sorted by year and meeting id, with the matching paragraphs and their character offsets
+        """
+        matches = self._evaluate(parse_query(query))
+        conditions: list[str] = []
+        parameters: list[Any] = []
+        if year_from is not None:
+            conditions.append('year >= ?')
+            parameters.append(year_from)
+        if year_to is not None:
+            conditions.append('year <= ?')
+            parameters.append(year_to)
+        if language is not None:
+            conditions.append("'+' || language_codes || '+' LIKE ?")
+            parameters.append(f'%+{language}+%')
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        hits = []
+        for meeting_id, file, year, title, language_codes, paragraphs in self.connection.execute(
+            'SELECT meeting_id, file, year, title, language_codes, paragraphs FROM meetings '  # nosec
+            f'{where} ORDER BY year, meeting_id',
+            parameters,
+        ):
+            if meeting_id not in matches:
+                continue
+            offsets = decode_varints(paragraphs)
+            ends = np.cumsum(offsets)[1::2]
+            starts = ends - offsets[1::2]
+            matching_paragraphs = sorted(matches[meeting_id])
+            hits.append(
+                Hit(
+                    meeting_id,
+                    file,
+                    year,
+                    title,
+                    language_codes,
+                    matching_paragraphs,
+                    [(int(starts[paragraph]), int(ends[paragraph])) for paragraph in matching_paragraphs],
+                )
+            )
+            if limit is not None and len(hits) >= limit:
+                break
+        return hits
+
+    def close(self) -> None:
+        """Close the database"""
+        self.connection.close()
+
+    def __enter__(self) -> 'InvertedIndex':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    pass
@@ -1,5 +1,84 @@
 # pylint: disable=useless-parent-delegation
-import nltk
+import re
+from array import array
+from functools import lru_cache
+from typing import Iterable, Iterator, Protocol, Sequence, overload
+
+# Line that starts a paragraph: a digit or a digit in parenthesis after any leading whitespace. Digits are those of
+# str.isdigit, decimal digits and digits such as superscripts and circled numbers.
+PARAGRAPH_START = re.compile(
+    r'\s*\(?[\d\xb2\xb3\xb9\u1369-\u1371\u19da\u2070\u2074-\u2079\u2080-\u2089\u2460-\u2468\u2474-\u247c'
+    r'\u2488-\u2490\u24ea\u24f5-\u24fd\u24ff\u2776-\u277e\u2780-\u2788\u278a-\u2792\U00010a40-\U00010a43'
+    r'\U00010e60-\U00010e68\U00011052-\U0001105a\U0001f100-\U0001f10a]'
+)
+
+
+class ParagraphSpans(Sequence[str]):
+    """Paragraphs as (start, end) offsets into the original text. Paragraph strings are only created when accessed."""
+
+    def __init__(self, text: str, starts: array, ends: array) -> None:
+        """Create paragraph spans
+
+        Args:
+            text (str): Original text
+            starts (array): Start offset of each paragraph
+            ends (array): End offset of each paragraph
+        """
+        self.text = text
+        self.starts = starts
+        self.ends = ends
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        """Paragraph with newlines replaced by spaces, as returned by `ParagraphTokenizer.tokenize`"""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self.source(index).replace('\n', ' ')
+
+    def __iter__(self) -> Iterator[str]:
+        for start, end in zip(self.starts, self.ends):
+            yield self.text[start:end].replace('\n', ' ')
+
+    def source(self, index: int) -> str:
+        """Exact slice of the original text covered by a paragraph
+
+        Args:
+            index (int): Paragraph index
+
+        Returns:
+            str: Slice of the original text
+        """
+        return self.text[self.starts[index] : self.ends[index]]
+
+    def spans(self) -> Iterator[tuple[int, int]]:
+        """Iterate over (start, end) offsets of the paragraphs
+
+        Returns:
+            Iterator[tuple[int, int]]: Paragraph offsets
+        """
+        return zip(self.starts, self.ends)
+
+    def subset(self, indices: Iterable[int]) -> 'ParagraphSpans':
+        """Paragraphs at some indices, sharing the original text
+
+        Args:
+            indices (Iterable[int]): Paragraph indices
+
+        Returns:
+            ParagraphSpans: Selected paragraphs
+        """
+        indices = list(indices)
+        return ParagraphSpans(
+            self.text, array('q', (self.starts[i] for i in indices)), array('q', (self.ends[i] for i in indices))
+        )
 
 
 class ParagraphTokenizer:
@@ -22,6 +101,20 @@ class ParagraphTokenizer:
         """
         raise NotImplementedError("Tokenize method must be implemented")
 
+    def tokenize_spans(self, text: str) -> ParagraphSpans:
+        """Tokenize text into paragraph offsets. The paragraphs of the spans are the same as the paragraphs returned by `tokenize`.
+
+        Args:
+            text (str): Text to tokenize
+
+        Raises:
+            NotImplementedError: NotImplementedError is raised if the method is not implemented
+
+        Returns:
+            ParagraphSpans: Paragraph offsets into the text
+        """
+        raise NotImplementedError("Tokenize spans method must be implemented")
+
 
 class SimpleParagraphTokenizer(ParagraphTokenizer):
     """Simple paragraph tokenizer that splits text into paragraphs based on newlines"""
@@ -40,30 +133,78 @@ class SimpleParagraphTokenizer(ParagraphTokenizer):
         Returns:
             list[str]: List of paragraphs
         """
-        paragraphs = []
-        paragraph = ''
+        return list(self._tokenize_lines(text.split('\n')))
+
+    def tokenize_stream(self, lines: Iterable[str]) -> Iterator[str]:
+        """Tokenize lines into paragraphs lazily
+
+        Args:
+            lines (Iterable[str]): Lines with or without trailing newline, e.g. an open file
+
+        Returns:
+            Iterator[str]: Paragraphs
+        """
+        return self._tokenize_lines(line[:-1] if line.endswith('\n') else line for line in lines)
+
+    def tokenize_spans(self, text: str) -> ParagraphSpans:
+        """Tokenize text into paragraph offsets based on newlines. Each span covers the paragraph without leading and trailing whitespace.
+
+        Args:
+            text (str): Text to tokenize
+
+        Returns:
+            ParagraphSpans: Paragraph offsets into the text
+        """
+        starts, ends = array('q'), array('q')
+        offset = paragraph_start = 0
+        first: int | None = None
+        last = 0
+        nonempty = False
         for line in text.split('\n'):
-            if line.strip() and (
-                line.strip()[0].isdigit()
-                or (len(line.strip()) > 1 and line.strip()[0] == '(' and line.strip()[1].isdigit())
-            ):
-                if paragraph:
-                    paragraphs.append(
-                        paragraph.strip()
-                    )  # Trim whitespaces from the beginning and the end of the paragraph
-                paragraph = line
+            stripped = line.lstrip()
+            if PARAGRAPH_START.match(line):
+                if nonempty:
+                    starts.append(paragraph_start if first is None else first)
+                    ends.append(paragraph_start if first is None else last)
+                paragraph_start, first, nonempty = offset, None, bool(line)
             else:
-                paragraph += ' ' + line
-        if len(paragraph.strip()) > 0:
-            paragraphs.append(paragraph.strip())  # Trim whitespaces from the beginning and the end of the paragraph
-        return paragraphs
+                nonempty = True
+            if stripped:
+                if first is None:
+                    first = offset + len(line) - len(stripped)
+                last = offset + len(stripped.rstrip()) + len(line) - len(stripped)
+            offset += len(line) + 1
+        if first is not None:
+            starts.append(first)
+            ends.append(last)
+        return ParagraphSpans(text, starts, ends)
+
+    @staticmethod
+    def _tokenize_lines(lines: Iterable[str]) -> Iterator[str]:
+        """A paragraph starts at a line starting with a number or a number in parenthesis and continues until the next such line. Lines are collected in a list and joined once per paragraph."""
+        parts = ['']
+        for line in lines:
+            if PARAGRAPH_START.match(line):
+                if paragraph := ' '.join(parts):
+                    yield paragraph.strip()  # Trim whitespaces from the beginning and the end of the paragraph
+                parts = [line]
+            else:
+                parts.append(line)
+        if paragraph := ' '.join(parts).strip():
+            yield paragraph
 
 
 class NLTKParagraphTokenizer(ParagraphTokenizer):
     """Paragraph tokenizer that uses NLTK to tokenize text into paragraphs"""
 
-    def __init__(self) -> None:
+    def __init__(self, language: str | None = None) -> None:
+        """Create a paragraph tokenizer that uses the sentence tokenizer for a language
+
+        Args:
+            language (str | None, optional): Language hint, see `get_sentence_tokenizer`. Defaults to None (English).
+        """
         super().__init__()
+        self.language = language
 
     def tokenize(self, text: str) -> list[str]:
         """Tokenize text into paragraphs using NLTK
@@ -74,20 +215,137 @@ class NLTKParagraphTokenizer(ParagraphTokenizer):
         Returns:
             list[str]: List of paragraphs
         """
-        paragraphs = nltk.sent_tokenize(text)
+        paragraphs = get_sentence_tokenizer(self.language).tokenize(text)
         paragraphs = [paragraph.replace('\n', ' ') for paragraph in paragraphs]
         return paragraphs
 
+    def tokenize_spans(self, text: str) -> ParagraphSpans:
+        """Tokenize text into paragraph offsets using NLTK
+
+        Args:
+            text (str): Text to tokenize
+
+        Returns:
+            ParagraphSpans: Paragraph offsets into the text
+        """
+        starts, ends = array('q'), array('q')
+        for start, end in get_sentence_tokenizer(self.language).span_tokenize(text):
+            starts.append(start)
+            ends.append(end)
+        return ParagraphSpans(text, starts, ends)
+
+
+class SentenceTokenizer(Protocol):
+    def tokenize(self, text: str) -> list[str]: ...
+
+    def span_tokenize(self, text: str) -> Iterator[tuple[int, int]]: ...
+
+
+class RegexSentenceTokenizer:
+    """Sentence tokenizer for languages without a Punkt model. Sentences end at '.', '!', '?' or the Arabic question mark followed by whitespace, or at CJK full stops, exclamation and question marks."""
+
+    SENTENCE = re.compile(r'\S.*?(?:[.!?\u061f\u06d4]+(?=\s|$)|[\u3002\uff01\uff1f\uff0e]+|$)', re.DOTALL)
+
+    def span_tokenize(self, text: str) -> Iterator[tuple[int, int]]:
+        """Tokenize text into sentence offsets
+
+        Args:
+            text (str): Text to tokenize
+
+        Yields:
+            tuple[int, int]: Start and end offset of each sentence
+        """
+        for match in self.SENTENCE.finditer(text):
+            yield match.start(), match.start() + len(match.group().rstrip())
+
+    def tokenize(self, text: str) -> list[str]:
+        """Tokenize text into sentences
+
+        Args:
+            text (str): Text to tokenize
+
+        Returns:
+            list[str]: List of sentences
+        """
+        return [text[start:end] for start, end in self.span_tokenize(text)]
+
+
+# Punkt models by ISO 639-1 and ISO 639-2 language code
+PUNKT_LANGUAGES = {
+    'en': 'english',
+    'eng': 'english',
+    'fr': 'french',
+    'fre': 'french',
+    'fra': 'french',
+    'es': 'spanish',
+    'spa': 'spanish',
+    'ru': 'russian',
+    'rus': 'russian',
+}
+
+# Languages that are tokenized with RegexSentenceTokenizer
+REGEX_LANGUAGES = {'ar', 'ara', 'zh', 'zh-cn', 'zh-tw', 'chi', 'zho', 'ja', 'jpn', 'ko', 'kor'}
+
+
+@lru_cache(maxsize=None)
+def get_sentence_tokenizer(language: str | None = None) -> SentenceTokenizer:
+    """Get a sentence tokenizer for a language. Punkt models are loaded once per process and language. English, French, Spanish and Russian use their Punkt models, Arabic, Chinese, Japanese and Korean use a `RegexSentenceTokenizer`, and other languages use the English Punkt model.
+
+    Args:
+        language (str | None, optional): ISO 639-1 or ISO 639-2 language code or Punkt model name. Defaults to None (English).
+
+    Returns:
+        SentenceTokenizer: Sentence tokenizer
+    """
+    language = (language or 'en').lower()
+    if language in REGEX_LANGUAGES:
+        return RegexSentenceTokenizer()
+    from nltk.tokenize.punkt import PunktTokenizer  # pylint: disable=import-outside-toplevel
+
+    return PunktTokenizer(
+        PUNKT_LANGUAGES.get(language, language if language in PUNKT_LANGUAGES.values() else 'english')
+    )
+
+
+def sent_tokenize(text: str, language: str | None = None) -> list[str]:
+    """Tokenize text into sentences with the sentence tokenizer for a language
+
+    Args:
+        text (str): Text to tokenize
+        language (str | None, optional): Language hint, see `get_sentence_tokenizer`. Defaults to None (English).
+
+    Returns:
+        list[str]: List of sentences
+    """
+    return get_sentence_tokenizer(language).tokenize(text)
+
+
+# Runs of word characters, with each CJK ideograph a word of its own since Chinese is written without spaces
+WORD = re.compile(r'[㐀-䶿一-鿿豈-﫿]|[^\W㐀-䶿一-鿿豈-﫿]+')
+
+
+def word_tokenize(text: str) -> list[str]:
+    """Tokenize text into case-folded words, e.g. for indexing and searching
+
+    Args:
+        text (str): Text to tokenize
+
+    Returns:
+        list[str]: List of words
+    """
+    return WORD.findall(text.casefold())
+
 
 class TokenizerFactory:
     """Factory class for paragraph tokenizers"""
 
     @staticmethod
-    def get_tokenizer(tokenizer: str) -> ParagraphTokenizer:
+    def get_tokenizer(tokenizer: str, language: str | None = None) -> ParagraphTokenizer:
         """Get paragraph tokenizer based on the name
 
         Args:
             tokenizer (str): Name of the tokenizer
+            language (str | None, optional): Language hint for the NLTK tokenizer. Defaults to None.
 
         Raises:
             ValueError: ValueError is raised if the tokenizer is invalid
@@ -98,7 +356,7 @@ class TokenizerFactory:
         if tokenizer == "simple":
             return SimpleParagraphTokenizer()
         if tokenizer == "nltk":
-            return NLTKParagraphTokenizer()
+            return NLTKParagraphTokenizer(language)
         raise ValueError("Invalid tokenizer")
 
 
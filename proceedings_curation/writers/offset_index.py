@@ -0,0 +1,161 @@
+import mmap
+import os
+import struct
+import tempfile
+from typing import Any, Iterator, Sequence
+
+import numpy as np
+
+from proceedings_curation.writers.writers import loads
+
+MAGIC = b'JLIX'
+VERSION = 1
+HEADER = struct.Struct('<4sIQQ')  # magic, version, number of records, length of file name list
+
+
+def write_offset_index(
+    path: str | os.PathLike[str],
+    meeting_ids: Sequence[int],
+    files: Sequence[str],
+    offsets: Sequence[int],
+    lengths: Sequence[int],
+) -> None:
+    """Write the sidecar index of a JSONL dataset, with the meeting id, file name, byte offset and length of each record in dataset order.
+
+    The file holds a header, the int64 meeting ids, the uint64 offsets and the uint32 lengths of the records, and the file names. It is written to a temporary file and moved into place.
+
+    Args:
+        path (str | os.PathLike[str]): Path to save the index
+        meeting_ids (Sequence[int]): Meeting id of each record
+        files (Sequence[str]): File name of each record
+        offsets (Sequence[int]): Byte offset of each record
+        lengths (Sequence[int]): Length in bytes of each record, including the line terminator
+    """
+    names = '\n'.join(files).encode('utf-8')
+    folder = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile('wb', dir=folder, delete=False) as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(offsets), len(names)))
+        file.write(np.asarray(meeting_ids, dtype='<i8').tobytes())
+        file.write(np.asarray(offsets, dtype='<u8').tobytes())
+        lengths_bytes = np.asarray(lengths, dtype='<u4').tobytes()
+        file.write(lengths_bytes + b'\0' * (-len(lengths_bytes) % 8))
+        file.write(names)
+    os.chmod(file.name, 0o644)
+    os.replace(file.name, path)
+
+
+class JsonlDataset:
+    """Random access to the records of an uncompressed JSONL dataset through its sidecar index (dataset.jsonl.idx). The dataset and the index are memory-mapped, so a record is read without reading the records before it."""
+
+    def __init__(self, path: str | os.PathLike[str], index_path: str | os.PathLike[str] | None = None) -> None:
+        """Open a dataset
+
+        Args:
+            path (str | os.PathLike[str]): Path to the dataset
+            index_path (str | os.PathLike[str] | None, optional): Path to the index. Defaults to the dataset path with '.idx' appended.
+
+        Raises:
+            ValueError: If the index is not an offset index
+        """
+        self.path = os.fspath(path)
+        self.index_path = os.fspath(index_path) if index_path is not None else f'{self.path}.idx'
+        with open(self.index_path, 'rb') as file:
+            self.index = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, names_length = HEADER.unpack_from(self.index)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'Not an offset index: "{self.index_path}"')
+        offset = HEADER.size
+        self.meeting_ids = np.frombuffer(self.index, dtype='<i8', count=count, offset=offset)
+        self.offsets = np.frombuffer(self.index, dtype='<u8', count=count, offset=offset + 8 * count)
+        self.lengths = np.frombuffer(self.index, dtype='<u4', count=count, offset=offset + 16 * count)
+        offset += 16 * count + 4 * count + (-4 * count % 8)
+        self.files = self.index[offset : offset + names_length].decode('utf-8').split('\n') if count else []
+        self.positions: dict[int, int] | None = None
+        self.file_positions: dict[str, int] | None = None
+        with open(self.path, 'rb') as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(file.fileno()).st_size else b''
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, position: int) -> Any:
+        """Record at a position in the dataset"""
+        return loads(self.line(position))
+
+    def __iter__(self) -> Iterator[Any]:
+        for position in range(len(self)):
+            yield self[position]
+
+    def line(self, position: int) -> bytes:
+        """JSON line at a position in the dataset
+
+        Args:
+            position (int): Position of the record
+
+        Returns:
+            bytes: JSON line, including the line terminator
+        """
+        start = int(self.offsets[position])
+        return self.data[start : start + int(self.lengths[position])]
+
+    def get(self, meeting_id: int) -> Any:
+        """Record of a meeting
+
+        Args:
+            meeting_id (int): Meeting id
+
+        Raises:
+            KeyError: If the meeting is not in the dataset
+
+        Returns:
+            Any: Record
+        """
+        if self.positions is None:
+            self.positions = {int(meeting_id): i for i, meeting_id in enumerate(self.meeting_ids)}
+        return self[self.positions[meeting_id]]
+
+    def get_by_file(self, file: str) -> Any:
+        """Record of a meeting text file
+
+        Args:
+            file (str): Name of the text file, as in meta.file
+
+        Raises:
+            KeyError: If the file is not in the dataset
+
+        Returns:
+            Any: Record
+        """
+        if self.file_positions is None:
+            self.file_positions = {file: i for i, file in enumerate(self.files)}
+        return self[self.file_positions[file]]
+
+    def sample(self, n: int, seed: int | None = None) -> list[Any]:
+        """Random sample of records, without replacement. Only the sampled records are read.
+
+        Args:
+            n (int): Number of records
+            seed (int | None, optional): Random seed. Defaults to None.
+
+        Returns:
+            list[Any]: Records
+        """
+        positions = np.random.default_rng(seed).choice(len(self), size=min(n, len(self)), replace=False)
+        return [self[int(position)] for position in positions]
+
+    def close(self) -> None:
+        """Unmap the dataset and the index"""
+        self.meeting_ids = self.offsets = self.lengths = np.empty(0)
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.index.close()
+
+    def __enter__(self) -> 'JsonlDataset':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    pass
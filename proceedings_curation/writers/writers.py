@@ -0,0 +1,287 @@
+import datetime
+import gzip
+import io
+import json
+import math
+import os
+import shutil
+from enum import Enum
+from types import TracebackType
+from typing import IO, Any, Iterable, Iterator, Sequence
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+
+def dumps(record: Any) -> bytes:
+    """Serialize a record to compact UTF-8 JSON. Uses orjson if it is installed. Without orjson, values are converted the way orjson converts them: NaN and infinity become null, and numpy values, dates and enums are serialized instead of raising.
+
+    Args:
+        record (Any): Record to serialize
+
+    Returns:
+        bytes: JSON without a trailing newline
+    """
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(_as_json(record), ensure_ascii=False, separators=(',', ':'), allow_nan=False).encode('utf-8')
+
+
+def _as_json(value: Any) -> Any:  # pylint: disable=too-many-return-statements
+    """Convert a value to the JSON types orjson would serialize it as"""
+    if isinstance(value, dict):
+        return {key: _as_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_as_json(item) for item in value]
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, np.ndarray):
+        return _as_json(value.tolist())
+    if isinstance(value, np.generic):
+        return _as_json(value.item())
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return _as_json(value.value)
+    return value
+
+
+def loads(line: bytes | str) -> Any:
+    """Deserialize a JSON line. Uses orjson if it is installed.
+
+    Args:
+        line (bytes | str): JSON
+
+    Returns:
+        Any: Record
+    """
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def open_compressed(path: str | os.PathLike[str], compresslevel: int | None = None) -> IO[bytes]:
+    """Open a file for writing binary data, compressed with gzip if the name ends with '.gz' or with zstd if it ends with '.zst'
+
+    Args:
+        path (str | os.PathLike[str]): Path to the file
+        compresslevel (int | None, optional): Compression level. Defaults to 6 for gzip and 3 for zstd.
+
+    Raises:
+        ImportError: If the file is zstd compressed and zstandard is not installed
+
+    Returns:
+        IO[bytes]: Writable binary file
+    """
+    name = os.fspath(path)
+    if name.endswith('.gz'):
+        return gzip.GzipFile(  # type: ignore[return-value]
+            name, 'wb', compresslevel=6 if compresslevel is None else compresslevel, mtime=0
+        )
+    if name.endswith('.zst'):
+        try:
+            import zstandard  # pylint: disable=import-outside-toplevel
+        except ImportError as e:  # pragma: no cover
+            raise ImportError('zstandard is required to write .zst files') from e
+        compressor = zstandard.ZstdCompressor(level=3 if compresslevel is None else compresslevel)
+        return compressor.stream_writer(open(name, 'wb'), closefd=True)  # pylint: disable=consider-using-with
+    return open(name, 'wb')  # pylint: disable=consider-using-with
+
+
+def read_lines(path: str | os.PathLike[str]) -> Iterator[bytes]:
+    """Read the lines of a file written with `open_compressed`, decompressing it by file extension
+
+    Args:
+        path (str | os.PathLike[str]): Path to the file
+
+    Raises:
+        ImportError: If the file is zstd compressed and zstandard is not installed
+
+    Yields:
+        bytes: Lines, including the line terminator
+    """
+    name = os.fspath(path)
+    if name.endswith('.gz'):
+        with gzip.open(name, 'rb') as file:
+            yield from file
+    elif name.endswith('.zst'):
+        try:
+            import zstandard  # pylint: disable=import-outside-toplevel
+        except ImportError as e:  # pragma: no cover
+            raise ImportError('zstandard is required to read .zst files') from e
+        with (
+            open(name, 'rb') as compressed,
+            io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(compressed)) as file,
+        ):
+            yield from file
+    else:
+        with open(name, 'rb') as file:
+            yield from file
+
+
+class JsonlWriter:
+    """Write records as JSON lines. Lines are collected in a buffer and written in bulk, compressed by file extension, see `open_compressed`. The writer keeps track of the uncompressed byte offset of each line."""
+
+    def __init__(
+        self, path: str | os.PathLike[str], buffer_size: int = 1 << 20, compresslevel: int | None = None
+    ) -> None:
+        """Open a JSONL file for writing
+
+        Args:
+            path (str | os.PathLike[str]): Path to the file
+            buffer_size (int, optional): Number of bytes to collect before writing. Defaults to 1 MiB.
+            compresslevel (int | None, optional): Compression level, see `open_compressed`. Defaults to None.
+        """
+        self.path = path
+        self.buffer_size = buffer_size
+        self.file = open_compressed(path, compresslevel)
+        self.buffer: list[bytes] = []
+        self.buffered = 0
+        self.offset = 0
+
+    def write(self, record: Any) -> tuple[int, int]:
+        """Write a record
+
+        Args:
+            record (Any): Record to write
+
+        Returns:
+            tuple[int, int]: Uncompressed byte offset and length of the line
+        """
+        return self.write_line(dumps(record) + b'\n')
+
+    def write_line(self, line: bytes) -> tuple[int, int]:
+        """Write a serialized record, e.g. a line read from an earlier dataset with `read_lines`
+
+        Args:
+            line (bytes): JSON line, including the line terminator
+
+        Returns:
+            tuple[int, int]: Uncompressed byte offset and length of the line
+        """
+        offset = self.offset
+        self.offset += len(line)
+        self.buffer.append(line)
+        self.buffered += len(line)
+        if self.buffered >= self.buffer_size:
+            self.flush()
+        return offset, len(line)
+
+    def write_all(self, records: Iterable[Any]) -> None:
+        """Write records
+
+        Args:
+            records (Iterable[Any]): Records to write
+        """
+        for record in records:
+            self.write(record)
+
+    def flush(self) -> None:
+        """Write the buffered lines to the file"""
+        if self.buffer:
+            self.file.write(b''.join(self.buffer))
+            self.buffer.clear()
+            self.buffered = 0
+
+    def close(self) -> None:
+        """Write the buffered lines and close the file"""
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self) -> 'JsonlWriter':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class ParquetDatasetWriter:
+    """Write rows as a Parquet dataset, partitioned into hive style folders (e.g. year=1946/) by the partition columns. Rows are collected in batches and each batch is written as one file per partition. Requires pyarrow."""
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        schema: Any,
+        partition_cols: Sequence[str] = ('year',),
+        batch_size: int = 1000,
+    ) -> None:
+        """Create a Parquet dataset, replacing the dataset at the path if it exists
+
+        Args:
+            path (str | os.PathLike[str]): Path to the dataset folder
+            schema (Any): Arrow schema of the rows, a `pyarrow.Schema`
+            partition_cols (Sequence[str], optional): Columns to partition the dataset by. Defaults to ('year',).
+            batch_size (int, optional): Number of rows to collect before writing. Defaults to 1000.
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        try:
+            import pyarrow  # pylint: disable=import-outside-toplevel
+            import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+        except ImportError as e:  # pragma: no cover
+            raise ImportError('pyarrow is required to write Parquet datasets') from e
+        self.pa = pyarrow
+        self.path = os.fspath(path)
+        self.schema = schema
+        self.partition_cols = list(partition_cols)
+        self.batch_size = batch_size
+        self.rows: list[dict[str, Any]] = []
+        self.batches = 0
+        self.closed = False
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.makedirs(self.path)
+
+    def write(self, row: dict[str, Any]) -> None:
+        """Write a row
+
+        Args:
+            row (dict[str, Any]): Row with a value for each column of the schema
+        """
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the collected rows to the dataset"""
+        if self.rows:
+            self.pa.parquet.write_to_dataset(
+                self.pa.Table.from_pylist(self.rows, schema=self.schema),
+                self.path,
+                partition_cols=self.partition_cols,
+                basename_template=f'part-{self.batches}-{{i}}.parquet',
+                existing_data_behavior='overwrite_or_ignore',
+            )
+            self.rows.clear()
+            self.batches += 1
+
+    def close(self) -> None:
+        """Write the collected rows"""
+        if not self.closed:
+            self.flush()
+            self.closed = True
+
+    def __enter__(self) -> 'ParquetDatasetWriter':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    pass
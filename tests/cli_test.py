@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+
+import pandas as pd
+from typer.testing import CliRunner
+
+from proceedings_curation.cli import COMMANDS, app, load_command
+
+runner = CliRunner()
+
+
+class TestCli:
+    def test_help_lists_commands(self):
+        result = runner.invoke(app, ['--help'])
+        assert result.exit_code == 0
+        for name in COMMANDS:
+            assert name in result.output
+
+    def test_command_help(self):
+        result = runner.invoke(app, ['compare-excel', '--help'])
+        assert result.exit_code == 0
+        assert 'OLD' in result.output
+
+    def test_command_runs_script(self, tmpdir):
+        old = os.path.join(tmpdir, 'old.xlsx')
+        new = os.path.join(tmpdir, 'new.xlsx')
+        report = os.path.join(tmpdir, 'report.xlsx')
+        pd.DataFrame({'Column1': ['A', 'B']}).to_excel(old, index=False)
+        pd.DataFrame({'Column1': ['A', 'C']}).to_excel(new, index=False)
+        result = runner.invoke(app, ['compare-excel', old, new, report])
+        assert result.exit_code == 0
+        assert os.path.exists(report)
+
+    def test_command_missing_argument(self):
+        result = runner.invoke(app, ['compare-excel'])
+        assert result.exit_code != 0
+
+    def test_load_command(self):
+        for name in ['compare-excel', 'create-metadata-index', 'extract-meetings']:
+            assert load_command(name).name is not None
+
+    def test_help_does_not_import_dependencies(self):
+        code = (
+            'import sys\n'
+            'from proceedings_curation.cli import app\n'
+            'try:\n'
+            '    app(["--help"])\n'
+            'except SystemExit:\n'
+            '    pass\n'
+            'print(sorted({"pandas", "nltk", "langdetect"} & set(sys.modules)))\n'
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        assert result.stdout.strip().endswith('[]')
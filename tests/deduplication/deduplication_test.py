@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from proceedings_curation.deduplication.deduplication import (
+    MERSENNE_PRIME,
+    MinHasher,
+    candidate_pairs,
+    duplicate_exclusions,
+    find_near_duplicates,
+    shingle_hashes,
+    similarity,
+)
+
+WORDS = [f"word{i}" for i in range(400)]
+TEXT = ' '.join(WORDS)
+NEAR_DUPLICATE = ' '.join(WORDS[:390] + ['other'] * 10)
+DIFFERENT = ' '.join(f"different{i}" for i in range(400))
+
+
+class TestShingleHashes:
+    def test_number_of_shingles(self):
+        assert len(shingle_hashes(TEXT, 5)) == 396
+
+    def test_stable_and_case_insensitive(self):
+        assert np.array_equal(shingle_hashes("A b c d e f"), shingle_hashes("a B c d e f"))
+
+    def test_short_and_empty_text(self):
+        assert len(shingle_hashes("a b", 5)) == 1
+        assert len(shingle_hashes("", 5)) == 0
+
+
+class TestMinHasher:
+    def test_similarity_estimates_jaccard(self):
+        minhasher = MinHasher(num_perm=256)
+        first, second = shingle_hashes(TEXT), shingle_hashes(NEAR_DUPLICATE)
+        jaccard = len(np.intersect1d(first, second)) / len(np.union1d(first, second))
+        estimate = similarity(minhasher.signature(TEXT), minhasher.signature(NEAR_DUPLICATE))
+        assert abs(estimate - jaccard) < 0.1
+
+    def test_signature_is_deterministic(self):
+        assert np.array_equal(MinHasher().signature(TEXT), MinHasher().signature(TEXT))
+
+    def test_chunks_do_not_change_signature(self):
+        assert np.array_equal(MinHasher(chunk_size=7).signature(TEXT), MinHasher().signature(TEXT))
+
+    def test_empty_text(self):
+        assert (MinHasher().signature("") == MERSENNE_PRIME).all()
+
+
+class TestNearDuplicates:
+    @pytest.fixture(name="signatures")
+    def fixture_signatures(self):
+        minhasher = MinHasher()
+        return np.vstack([minhasher.signature(text) for text in [TEXT, DIFFERENT, NEAR_DUPLICATE, "", TEXT]])
+
+    def test_candidate_pairs(self, signatures):
+        pairs = candidate_pairs(signatures)
+        assert {(0, 2), (0, 4), (2, 4)} <= pairs
+        assert not any(3 in pair for pair in pairs)
+
+    def test_candidate_pairs_bands_must_divide_signature(self, signatures):
+        with pytest.raises(ValueError):
+            candidate_pairs(signatures, bands=7)
+
+    def test_find_near_duplicates(self, signatures):
+        pairs = find_near_duplicates(signatures, threshold=0.8)
+        assert [(i, j) for i, j, _ in pairs] == [(0, 2), (0, 4), (2, 4)]
+        assert pairs[1][2] == 1.0
+
+    def test_duplicate_exclusions_keep_first_name(self):
+        names = ['1950_3_c.txt', '1946_1_a.txt', '1960_4_d.txt', '1948_2_b.txt']
+        assert duplicate_exclusions(names, [(0, 2, 0.9), (2, 1, 0.9)]) == ['1950_3_c.txt', '1960_4_d.txt']
+        assert not duplicate_exclusions(names, [])
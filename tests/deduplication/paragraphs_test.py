@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from proceedings_curation.deduplication.paragraphs import (
+    BloomFilter,
+    FingerprintCounter,
+    ParagraphDeduplicator,
+    occurrence_numbers,
+    paragraph_fingerprints,
+)
+
+
+class TestParagraphFingerprints:
+    def test_paragraph_fingerprints(self):
+        fingerprints = paragraph_fingerprints(["a paragraph", "another paragraph", "a paragraph"])
+        assert fingerprints.dtype == np.uint64
+        assert fingerprints[0] == fingerprints[2]
+        assert fingerprints[0] != fingerprints[1]
+
+    def test_paragraph_fingerprints_of_no_paragraphs(self):
+        assert len(paragraph_fingerprints([])) == 0
+
+
+def test_occurrence_numbers():
+    assert occurrence_numbers(np.array([2, 0, 2, 2, 0])).tolist() == [0, 0, 1, 2, 1]
+
+
+class TestFingerprintCounter:
+    def test_add_returns_counts_in_order(self):
+        counter = FingerprintCounter()
+        assert counter.add(np.array([5, 3, 5], dtype=np.uint64)).tolist() == [1, 1, 2]
+        assert counter.add(np.array([3, 7, 5], dtype=np.uint64)).tolist() == [2, 1, 3]
+        assert len(counter) == 3
+
+    def test_get(self):
+        counter = FingerprintCounter()
+        counter.add(np.array([5, 3, 5], dtype=np.uint64))
+        assert counter.get(np.array([5, 3, 4], dtype=np.uint64)).tolist() == [2, 1, 0]
+
+    def test_counts_are_kept_when_buffer_is_merged(self):
+        counter = FingerprintCounter()
+        rng = np.random.default_rng(1)
+        fingerprints = rng.integers(0, 5000, size=20000).astype(np.uint64)
+        for batch in np.array_split(fingerprints, 20):
+            counter.add(batch)
+        unique, counts = np.unique(fingerprints, return_counts=True)
+        assert counter.get(unique).tolist() == counts.tolist()
+        assert len(counter) == len(unique)
+
+
+class TestBloomFilter:
+    def test_add_returns_seen_fingerprints(self):
+        bloom_filter = BloomFilter(1000)
+        assert bloom_filter.add(np.array([5, 3, 5], dtype=np.uint64)).tolist() == [False, False, True]
+        assert bloom_filter.add(np.array([3, 7], dtype=np.uint64)).tolist() == [True, False]
+
+    def test_false_positive_rate(self):
+        bloom_filter = BloomFilter(10000, error_rate=0.01)
+        bloom_filter.add(paragraph_fingerprints(str(i) for i in range(10000)))
+        false_positives = bloom_filter.contains(paragraph_fingerprints(f"other {i}" for i in range(10000)))
+        assert false_positives.mean() < 0.03
+
+
+class TestParagraphDeduplicator:
+    def test_keep(self):
+        deduplicator = ParagraphDeduplicator(max_repeats=2)
+        fingerprints = paragraph_fingerprints(["header", "text", "header"])
+        assert deduplicator.keep(fingerprints).tolist() == [True, True, True]
+        assert deduplicator.keep(fingerprints).tolist() == [False, True, False]
+
+    def test_keep_with_bloom_filter(self):
+        deduplicator = ParagraphDeduplicator(method='bloom', capacity=1000)
+        assert deduplicator.keep(paragraph_fingerprints(["header", "text", "header"])).tolist() == [True, True, False]
+        assert deduplicator.keep(paragraph_fingerprints(["header", "other"])).tolist() == [False, True]
+
+    def test_bloom_filter_with_max_repeats_raises_value_error(self):
+        with pytest.raises(ValueError):
+            ParagraphDeduplicator(max_repeats=2, method='bloom')
+
+    def test_unknown_method_raises_value_error(self):
+        with pytest.raises(ValueError):
+            ParagraphDeduplicator(method='unknown')
@@ -44,6 +44,62 @@ class TestLangDetect:
         text = "Un kilo de tomates."  # This is a sentence in French and Spanish
         assert lang_detect.detect(text) is None
 
+    def test_detect_langs_is_deterministic(self, lang_detect):
+        text = "Un kilo de tomates."
+        first = [(d.lang, d.prob) for d in lang_detect.detect_langs(text)]
+        assert first == [(d.lang, d.prob) for d in lang_detect.detect_langs(text)]
+
+    def test_detect_langs_does_not_depend_on_global_seed(self, monkeypatch, lang_detect):
+        text = "Un kilo de tomates."
+        expected = [(d.lang, d.prob) for d in lang_detect.detect_langs(text)]
+        monkeypatch.setattr("langdetect.detector_factory.DetectorFactory.seed", 1234)
+        assert [(d.lang, d.prob) for d in lang_detect.detect_langs(text)] == expected
+
+
+class TestAdaptiveLangDetect:
+    @pytest.fixture(name="long_text")
+    def fixture_long_text(self):
+        return " ".join(["Ceci est une phrase de test qui est assez longue pour la détection."] * 200)
+
+    def test_detect_long_text(self, long_text):
+        lang_detect = LangDetect(max_chars=1000)
+        assert lang_detect.detect(long_text) == 'fr'
+
+    def test_detect_long_text_uses_bounded_samples(self, monkeypatch, long_text):
+        lang_detect = LangDetect(max_chars=1000, window_size=200)
+        sample_lengths = []
+        detect_langs = lang_detect._detect_langs  # pylint: disable=protected-access
+
+        def recording_detect_langs(text):
+            sample_lengths.append(len(text))
+            return detect_langs(text)
+
+        monkeypatch.setattr(lang_detect, "_detect_langs", recording_detect_langs)
+        assert lang_detect.detect(long_text) == 'fr'
+        assert sample_lengths == [200]
+
+    def test_detect_falls_back_to_full_text_when_samples_are_ambiguous(self, monkeypatch):
+        lang_detect = LangDetect(max_chars=40, window_size=20, confidence=1.01)
+        sample_lengths = []
+        detect_langs = lang_detect._detect_langs  # pylint: disable=protected-access
+
+        def recording_detect_langs(text):
+            sample_lengths.append(len(text))
+            return detect_langs(text)
+
+        monkeypatch.setattr(lang_detect, "_detect_langs", recording_detect_langs)
+        text = "This is a test sentence. " * 4
+        assert lang_detect.detect(text) == 'en'
+        assert sample_lengths == [20, 41, len(text)]
+
+    def test_sample_short_text_returns_text(self):
+        lang_detect = LangDetect(window_size=10)
+        assert lang_detect.sample("short text", 2) == "short text"
+
+    def test_sample_evenly_spaced_windows(self):
+        lang_detect = LangDetect(window_size=2)
+        assert lang_detect.sample("aabbccddee", 3) == "aa cc ee"
+
 
 class TestLanguageDetector:
     def test_detect_not_implemented(self):
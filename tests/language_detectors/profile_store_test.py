@@ -0,0 +1,60 @@
+import os
+
+import pytest
+from langdetect.lang_detect_exception import LangDetectException
+
+from proceedings_curation.language_detectors.language_detectors import LangDetect
+from proceedings_curation.language_detectors.profile_store import (
+    MappedDetectorFactory,
+    compile_profile_store,
+    get_profile_store,
+)
+
+
+@pytest.fixture(name="profile_store", scope="module")
+def fixture_profile_store(tmp_path_factory):
+    path = tmp_path_factory.mktemp("profiles") / "profiles.bin"
+    compile_profile_store(path)
+    return str(path)
+
+
+class TestProfileStore:
+    def test_compile_profile_store(self, profile_store):
+        factory = MappedDetectorFactory(profile_store)
+        assert len(factory.langlist) == 55
+        assert factory.probs.shape == (len(factory.keys), 55)
+        assert not factory.probs.flags.writeable
+
+    def test_mapped_detector_gives_same_results_as_langdetect(self, profile_store):
+        texts = [
+            "This is a test sentence.",
+            "Un kilo de tomates.",
+            "Это тестовое предложение.",
+            "هذه جملة اختبار",
+            "这是一个测试句子。",
+        ]
+        mapped = LangDetect(profile_store=profile_store)
+        default = LangDetect()
+        for text in texts:
+            assert [(d.lang, d.prob) for d in mapped.detect_langs(text)] == [
+                (d.lang, d.prob) for d in default.detect_langs(text)
+            ]
+
+    def test_mapped_detector_with_invalid_text(self, profile_store):
+        assert LangDetect(profile_store=profile_store).detect("") is None
+
+    def test_get_profile_store_compiles_missing_store(self, tmp_path):
+        path = str(tmp_path / "missing" / "profiles.bin")
+        factory = get_profile_store(path)
+        assert os.path.exists(path)
+        assert get_profile_store(path) is factory
+
+    def test_load_invalid_profile_store_raises(self, tmp_path):
+        path = tmp_path / "invalid.bin"
+        path.write_bytes(b"\0" * 64)
+        with pytest.raises(Exception, match="Not a profile store"):
+            MappedDetectorFactory(path)
+
+    def test_load_profile_into_profile_store_raises(self, profile_store):
+        with pytest.raises(LangDetectException, match="loaded from the profile store"):
+            MappedDetectorFactory(profile_store).load_profile("profiles")
@@ -1,14 +1,16 @@
 import pytest
 
 from proceedings_curation.language_detectors.language_detectors import LanguageDetector
-from proceedings_curation.language_filters.language_filters import LanguageFilter
+from proceedings_curation.language_filters.language_filters import LanguageFilter, smooth_languages
 
 
 class MockLanguageDetector(LanguageDetector):
     def __init__(self, possible_languages: list[str]) -> None:
         self.possible_languages = possible_languages
+        self.calls = 0
 
     def detect(self, text: str) -> str | None:
+        self.calls += 1
         if "english" in text.lower():
             return "en"
         if "français" in text.lower():
@@ -54,3 +56,55 @@ def test_language_filter_with_default_language_detector():
     paragraphs = ["This is an English paragraph.", "Ceci est un paragraphe français."]
     filtered_paragraphs = language_filter.filter(paragraphs)
     assert filtered_paragraphs == ["This is an English paragraph."]
+
+
+def test_language_filter_detects_each_paragraph_once(mock_language_detector):
+    language_filter = LanguageFilter(languages="en", keep_undetected=True, language_detector=mock_language_detector)
+    paragraphs = ["This is an English paragraph.", "Ceci est un paragraphe français.", "Unknown language paragraph."]
+    language_filter.filter(paragraphs)
+    assert mock_language_detector.calls == 3
+
+
+def test_language_filter_with_languages_does_not_detect(mock_language_detector):
+    language_filter = LanguageFilter(languages="en", language_detector=mock_language_detector)
+    paragraphs = ["This is an English paragraph.", "Ceci est un paragraphe français."]
+    filtered_paragraphs = language_filter.filter(paragraphs, ["fr", "en"])
+    assert filtered_paragraphs == ["Ceci est un paragraphe français."]
+    assert mock_language_detector.calls == 0
+
+
+def test_language_filter_with_min_length_assigns_context_language(mock_language_detector):
+    language_filter = LanguageFilter(languages="en", min_length=12, language_detector=mock_language_detector)
+    paragraphs = [
+        "This is an English paragraph.",
+        "(Applause)",
+        "Another English paragraph.",
+        "Ceci est un paragraphe français.",
+        "12.",
+        "Encore un paragraphe français.",
+    ]
+    assert language_filter.detect_languages(paragraphs) == ["en", "en", "en", "fr", "fr", "fr"]
+    assert mock_language_detector.calls == 4
+    assert language_filter.filter(paragraphs) == paragraphs[:3]
+
+
+def test_smooth_languages_uses_majority_of_context():
+    languages = ["fr", "en", None, "en", "fr"]
+    skipped = [False, False, True, False, False]
+    assert smooth_languages(languages, skipped, context=2) == ["fr", "en", "en", "en", "fr"]
+
+
+def test_smooth_languages_breaks_ties_by_nearest_preceding_paragraph():
+    languages = ["en", None, None, "fr"]
+    skipped = [False, True, True, False]
+    assert smooth_languages(languages, skipped, context=1) == ["en", "en", "fr", "fr"]
+
+
+def test_smooth_languages_ignores_undetected_paragraphs():
+    languages = [None, None, "fr"]
+    skipped = [False, True, False]
+    assert smooth_languages(languages, skipped) == [None, "fr", "fr"]
+
+
+def test_smooth_languages_without_detected_paragraphs():
+    assert smooth_languages([None, None], [True, True]) == [None, None]
@@ -0,0 +1,93 @@
+import pandas as pd
+import pytest
+
+from proceedings_curation.metadata.changes import renumber_meetings, touched_meetings
+from proceedings_curation.metadata.schema import apply_schema
+
+
+def metadata_index(rows: list[tuple[int, int, str, str]], meeting_ids: list[int]) -> pd.DataFrame:
+    return apply_schema(
+        pd.DataFrame(
+            rows,
+            columns=['record_number', 'volume', 'pages', 'session_president'],
+            index=pd.Index(meeting_ids, name='meeting_id'),
+        )
+    )
+
+
+@pytest.fixture(name='previous')
+def fixture_previous():
+    return metadata_index(
+        [(1, 1, '1-10', 'A'), (1, 1, '11-20', 'B'), (1, 1, '21-30', 'C'), (2, 1, '1-5', 'D')],
+        [10000, 10001, 10002, 20000],
+    )
+
+
+def test_unchanged_index_keeps_meeting_ids(previous):
+    index = previous.reset_index(drop=True)
+
+    result, changes = renumber_meetings(previous, index)
+
+    assert result.index.tolist() == [10000, 10001, 10002, 20000]
+    assert changes.empty
+
+
+def test_modified_meeting_keeps_meeting_id(previous):
+    index = metadata_index(
+        [(1, 1, '1-10', 'A'), (1, 1, '11-20', 'E'), (1, 1, '21-30', 'C'), (2, 1, '1-5', 'D')], [0, 1, 2, 3]
+    )
+
+    result, changes = renumber_meetings(previous, index)
+
+    assert result.index.tolist() == [10000, 10001, 10002, 20000]
+    assert changes.to_dict('records') == [
+        {'meeting_id': 10001, 'record_number': 1, 'volume': 1, 'change': 'modified', 'columns': 'session_president'}
+    ]
+
+
+def test_added_and_removed_meetings(previous):
+    index = metadata_index(
+        [(1, 1, '1-10', 'A'), (1, 1, '5-8', 'F'), (1, 1, '21-30', 'C'), (2, 1, '1-5', 'D'), (3, 1, '1-2', 'G')],
+        [0, 1, 2, 3, 4],
+    )
+
+    result, changes = renumber_meetings(previous, index)
+
+    assert result.index.tolist() == [10000, 10003, 10002, 20000, 30000]
+    assert changes[['meeting_id', 'change']].values.tolist() == [
+        [10001, 'removed'],
+        [10003, 'added'],
+        [30000, 'added'],
+    ]
+
+
+def test_empty_previous_index_numbers_meetings_within_records(previous):
+    result, changes = renumber_meetings(previous.iloc[0:0], previous.reset_index(drop=True))
+
+    assert result.index.tolist() == [10000, 10001, 10002, 20000]
+    assert changes.change.tolist() == ['added'] * 4
+
+
+def test_touched_meetings(previous, tmp_path):
+    index = metadata_index([(1, 1, '1-10', 'A'), (1, 1, '11-20', 'E'), (1, 1, '31-40', 'F')], [0, 1, 2])
+    _, changes = renumber_meetings(previous, index)
+    changes_file = tmp_path / 'changes.csv'
+    changes.to_csv(changes_file, sep=';', index=False, encoding='utf-8-sig')
+
+    assert sorted(changes.change) == ['added', 'modified', 'removed', 'removed']
+    assert touched_meetings(changes_file) == [10001, 10003]
+
+
+@pytest.mark.parametrize('before, after', [(None, '1-10'), ('1-10', None)])
+def test_modified_nullable_string(previous, before, after):
+    previous = previous.assign(pages_in_doc=pd.array([before, '11-20', '21-30', '1-5'], dtype='string'))
+    index = previous.reset_index(drop=True).assign(
+        pages_in_doc=pd.array([after, '11-20', '21-30', '1-5'], dtype='string')
+    )
+
+    result, changes = renumber_meetings(previous, index)
+
+    assert result.index.tolist() == [10000, 10001, 10002, 20000]
+    assert changes.to_dict('records') == [
+        {'meeting_id': 10000, 'record_number': 1, 'volume': 1, 'change': 'modified', 'columns': 'pages_in_doc'}
+    ]
@@ -0,0 +1,158 @@
+import datetime
+import importlib.util
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from proceedings_curation.metadata import excel
+from proceedings_curation.metadata.excel import Engine, cache_path, read_excel, read_workbook, resolve_engine
+
+pytest.importorskip('pyarrow')
+
+
+@pytest.fixture(name='workbook')
+def fixture_workbook(tmp_path):
+    df = pd.DataFrame(
+        {
+            'record_number': [1, 2, 3],
+            'pages': ['1-10', 11, datetime.datetime(2020, 1, 10)],
+            'title': ['Title 1', None, 'Title 3'],
+            'chapter': ['A', 'B', 'A'],
+            'volume': [1, None, 2],
+        }
+    )
+    path = tmp_path / 'index.xlsx'
+    df.to_excel(path, index=False)
+    return path
+
+
+DTYPE = {'record_number': 'uint32', 'chapter': 'category', 'volume': 'Int64'}
+
+
+def test_read_excel_is_the_same_as_pd_read_excel(workbook):
+    expected = pd.read_excel(workbook, dtype=DTYPE)
+
+    for _ in range(2):
+        frame = read_excel(workbook, dtype=DTYPE)
+
+        pd.testing.assert_frame_equal(frame, expected)
+        assert [type(value) for value in frame.pages] == [str, int, datetime.datetime]
+        assert os.path.exists(cache_path(workbook, dtype=DTYPE))
+
+
+def test_cache_round_trip_of_numpy_scalars(tmp_path):
+    frame = pd.DataFrame({'value': pd.Series([np.float64(1.5), np.int64(3), np.bool_(True), np.float32(0.5), 'x'])})
+    cached = str(tmp_path / 'cache.parquet')
+
+    excel._write_cache(frame, cached, {})  # pylint: disable=protected-access
+    values = excel._read_cache(cached)['value'].tolist()  # pylint: disable=protected-access
+
+    assert values == [1.5, 3, True, 0.5, 'x']
+    assert [type(value) for value in values] == [float, int, bool, float, str]
+
+
+def test_read_excel_preserves_index(workbook):
+    pd.testing.assert_frame_equal(
+        read_excel(workbook, index_col='record_number'), read_excel(workbook, index_col='record_number')
+    )
+    assert read_excel(workbook, index_col='record_number').index.tolist() == [1, 2, 3]
+
+
+def test_read_excel_uses_cache(workbook, monkeypatch):
+    expected = read_excel(workbook, dtype=DTYPE)
+    monkeypatch.setattr(excel.pd, 'read_excel', lambda *args, **kwargs: pytest.fail('Workbook read'))
+
+    pd.testing.assert_frame_equal(read_excel(workbook, dtype=DTYPE), expected)
+
+    # Same content with a new modification time is found by hash
+    stat = os.stat(workbook)
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    pd.testing.assert_frame_equal(read_excel(workbook, dtype=DTYPE), expected)
+
+
+def test_read_excel_is_invalidated_by_changes(workbook):
+    read_excel(workbook)
+    pd.DataFrame({'record_number': [4]}).to_excel(workbook, index=False)
+
+    assert read_excel(workbook).record_number.tolist() == [4]
+
+
+def test_cache_path_depends_on_options(workbook):
+    assert cache_path(workbook) != cache_path(workbook, dtype=DTYPE)
+    assert os.path.dirname(cache_path(workbook)) == os.path.dirname(workbook)
+
+
+def test_read_excel_without_cache(workbook):
+    read_excel(workbook, cache=False)
+
+    assert not os.path.exists(cache_path(workbook))
+
+
+SOURCE_FOLDER = Path(__file__).parents[2] / 'data' / 'source'
+has_calamine = importlib.util.find_spec('python_calamine') is not None
+
+
+def test_resolve_engine():
+    assert resolve_engine('auto') == (Engine.calamine if has_calamine else Engine.openpyxl)
+    assert resolve_engine('openpyxl') == Engine.openpyxl
+    with pytest.raises(ValueError):
+        resolve_engine('xlrd')
+
+
+@pytest.mark.skipif(has_calamine, reason="python-calamine is installed")
+def test_resolve_engine_without_calamine():
+    with pytest.raises(ImportError):
+        resolve_engine('calamine')
+
+
+@pytest.mark.skipif(not has_calamine, reason="python-calamine is not installed")
+@pytest.mark.parametrize(
+    'filename, options',
+    [
+        ('proceedings_index.xlsx', {}),
+        (
+            'proceedings_index.xlsx',
+            {
+                'dtype': {
+                    'Record number': 'uint32',
+                    'Publication date': 'uint16',
+                    'Conference date ': 'Int64',
+                    'Volume': 'Int64',
+                    'Chapter': 'category',
+                }
+            },
+        ),
+        ('proceedings_metadata.xlsx', {}),
+        (
+            'proceedings_metadata.xlsx',
+            {
+                'usecols': ['record_number', 'year', 'filename', 'columns', 'volume'],
+                'dtype': {'record_number': 'uint32', 'year': 'uint16', 'columns': 'uint8', 'volume': 'Int64'},
+            },
+        ),
+    ],
+)
+def test_engines_return_the_same_frame(filename, options, tmp_path):
+    if not (SOURCE_FOLDER / filename).exists():
+        pytest.skip(f"{SOURCE_FOLDER / filename} not found")
+    path = shutil.copy(SOURCE_FOLDER / filename, tmp_path)
+
+    expected = read_workbook(path, 'openpyxl', **options)
+    frame = read_workbook(path, 'calamine', **options)
+
+    pd.testing.assert_frame_equal(frame, expected, check_exact=True)
+    for column in expected.columns[expected.dtypes == object]:
+        assert [type(value) for value in frame[column]] == [type(value) for value in expected[column]]
+
+
+@pytest.mark.skipif(not has_calamine, reason="python-calamine is not installed")
+def test_engines_return_the_same_frame_with_mixed_columns(workbook):
+    expected = read_workbook(workbook, 'openpyxl', dtype=DTYPE)
+    frame = read_workbook(workbook, 'calamine', dtype=DTYPE)
+
+    pd.testing.assert_frame_equal(frame, expected, check_exact=True)
+    assert [type(value) for value in frame.pages] == [str, int, datetime.datetime]
@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+from proceedings_curation.metadata.rules import Rule, Severity, validate
+
+RULES = [
+    Rule('negative', "Negative values", lambda frame: frame['value'] < 0, ('name', 'value')),
+    Rule('missing', "Missing values", lambda frame: frame['value'].isna(), ('name',), Severity.warning),
+    Rule('large', "Large values", lambda frame: frame['value'] > 100, ('value',)),
+    Rule('odd', "Odd values", lambda frame: frame['value'] % 2 == 1, ('value',), Severity.nonfatal),
+]
+
+
+@pytest.fixture(name='frame')
+def fixture_frame():
+    return pd.DataFrame({'name': ['a', 'b', 'c', 'd'], 'value': pd.array([1, -2, None, -4], dtype='Int64')})
+
+
+def test_validate_collects_all_violations(frame):
+    report = validate(frame, RULES)
+
+    assert [violation.rule for violation in report.violations] == ['negative', 'missing', 'odd']
+    assert report.violations[0].rows.index.tolist() == [1, 3]
+    assert report.violations[0].rows['value'].tolist() == [-2, -4]
+    assert [violation.rule for violation in report.errors] == ['negative']
+    assert [violation.rule for violation in report.warnings] == ['missing']
+    assert [violation.rule for violation in report.nonfatal] == ['odd']
+
+
+def test_raise_for_errors(frame):
+    with pytest.raises(ValueError, match="Negative values"):
+        validate(frame, RULES).raise_for_errors()
+
+
+def test_severities_override_rules(frame):
+    report = validate(frame, RULES, {'negative': 'warning'})
+
+    assert not report.errors
+    report.raise_for_errors()
+
+
+def test_unknown_rule_in_severities_raises_value_error(frame):
+    with pytest.raises(ValueError, match="Unknown rules: other"):
+        validate(frame, RULES, {'other': Severity.warning})
+
+
+def test_log(frame, caplog):
+    validate(frame, RULES).log()
+
+    assert "Negative values" in caplog.text
+    assert [record.levelname for record in caplog.records] == ['ERROR', 'WARNING', 'ERROR']
+
+
+def test_to_frame(frame):
+    report = validate(frame, RULES).to_frame()
+
+    assert report.columns.tolist() == ['rule', 'severity', 'message', 'row', 'values']
+    assert report.rule.tolist() == ['negative', 'negative', 'missing', 'odd']
+    assert report['values'].tolist() == ['name=b; value=-2', 'name=d; value=-4', 'name=c', 'value=1']
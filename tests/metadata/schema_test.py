@@ -0,0 +1,68 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from proceedings_curation.metadata.schema import METADATA_INDEX_DTYPES, apply_schema, load_metadata_index
+from proceedings_curation.scripts.create_metadata_index import save_metadata_index
+
+
+@pytest.fixture(name='metadata_index')
+def fixture_metadata_index():
+    return pd.DataFrame(
+        {
+            'record_number': [1, 1, 2],
+            'session_number': ['3X', 12, '4X'],
+            'pages_in_doc': ['1-10', datetime.datetime(2023, 11, 3), '21-30'],
+            'date_meeting': pd.to_datetime(['2020-01-01', '2020-01-02', None]),
+            'title_meeting': ['Meeting 1', 'Meeting 1', 'Meeting 2'],
+            'volume': [1.0, np.nan, 2.0],
+            'conference_date': [2020, 2020, 2021],
+            'variant_title': ['Variant title', None, None],
+            'first_page': [1, 11, 21],
+            'last_page': [10, 20, 30],
+            'notes': ['a', 'b', 'c'],
+        },
+        index=pd.Index([10000, 10001, 20000], name='meeting_id'),
+    )
+
+
+def test_apply_schema(metadata_index):
+    index = apply_schema(metadata_index)
+
+    for column in index.columns.drop('notes'):
+        assert str(index[column].dtype) == METADATA_INDEX_DTYPES[column], column
+    assert index.notes.dtype == object
+    assert index.session_number.tolist() == ['3X', '12', '4X']
+    assert index.pages_in_doc.tolist() == ['1-10', '2023-11-03 00:00:00', '21-30']
+    assert index.title_meeting.cat.categories.tolist() == ['Meeting 1', 'Meeting 2']
+    assert index.volume.tolist() == [1, pd.NA, 2]
+    assert [type(value) for _, row in index.iterrows() for value in (row.title_meeting, row.first_page)] == [
+        str,
+        int,
+    ] * 3
+    assert pd.isna(index.variant_title.iloc[1])
+
+
+def test_apply_schema_does_not_change_the_index(metadata_index):
+    apply_schema(metadata_index)
+
+    assert metadata_index.session_number.dtype == object
+
+
+@pytest.mark.parametrize('extension', ['csv', 'xlsx'])
+def test_load_metadata_index(metadata_index, tmp_path, extension):
+    filename = tmp_path / f'metadata_index.{extension}'
+    save_metadata_index(metadata_index, filename)
+
+    pd.testing.assert_frame_equal(load_metadata_index(filename), apply_schema(metadata_index), check_index_type=False)
+
+
+def test_csv_and_xlsx_have_the_same_dtypes(metadata_index, tmp_path):
+    save_metadata_index(metadata_index, tmp_path / 'metadata_index.csv')
+    save_metadata_index(metadata_index, tmp_path / 'metadata_index.xlsx')
+
+    pd.testing.assert_frame_equal(
+        load_metadata_index(tmp_path / 'metadata_index.csv'), load_metadata_index(tmp_path / 'metadata_index.xlsx')
+    )
@@ -3,7 +3,7 @@ import os
 import pandas as pd
 import pytest
 
-from proceedings_curation.scripts.compare_excel import compare_excel
+from proceedings_curation.scripts.compare_excel import compare_excel, diff_sheets
 
 
 @pytest.fixture(name='old_excel')
@@ -141,3 +141,55 @@ def test_compeare_excel_when_rows_added(old_excel, new_excel_added_rows, report_
         assert not added_rows_df.empty
         assert 'D' in added_rows_df['Column1'].values
         assert 4 in added_rows_df['Column2'].values
+
+
+def test_compare_excel_with_key(old_excel, report_path, tmpdir):
+    new_df = pd.DataFrame({'Column1': ['A', 'X', 'B', 'C'], 'Column2': [1, 9, 2, 4]})
+    new_path = os.path.join(tmpdir, 'new_inserted_row.xlsx')
+    new_df.to_excel(new_path, index=False)
+
+    compare_excel(old_excel, new_path, report_path, key='Column1')
+
+    with pd.ExcelFile(report_path) as xls:
+        diff_df = pd.read_excel(xls, sheet_name='diff')
+        added_rows_df = pd.read_excel(xls, sheet_name='added_rows')
+
+        assert diff_df['Column1'].tolist() == ['C']
+        assert diff_df['Column2'].tolist() == ['3 ---> 4']
+        assert added_rows_df['Column1'].tolist() == ['X']
+
+
+def test_compare_excel_with_duplicate_key(old_excel, report_path, tmpdir):
+    new_df = pd.DataFrame({'Column1': ['A', 'A'], 'Column2': [1, 2]})
+    new_path = os.path.join(tmpdir, 'new_duplicate_key.xlsx')
+    new_df.to_excel(new_path, index=False)
+
+    with pytest.raises(ValueError, match='duplicate values in new sheet'):
+        compare_excel(old_excel, new_path, report_path, key='Column1')
+
+
+def test_diff_sheets_treats_missing_values_as_equal():
+    old = pd.DataFrame({'Column1': ['A', None, 'C'], 'Column2': [1.0, float('nan'), 3.0]})
+    new = pd.DataFrame({'Column1': ['A', None, None], 'Column2': [1.0, float('nan'), 3.0]})
+
+    changed, diff = diff_sheets(old, new)
+
+    assert changed['Column1'].tolist() == ['A', 'NA', 'C ---> NA']
+    assert changed['Column2'].tolist() == [1.0, 'NA', 3.0]
+    assert diff.index.tolist() == [2]
+    assert diff.columns.tolist() == ['Column1', 'Column2']
+
+
+@pytest.mark.filterwarnings("error::FutureWarning")
+def test_compare_excel_with_missing_values_does_not_warn(report_path, tmpdir):
+    old_path = os.path.join(tmpdir, 'old_mixed.xlsx')
+    new_path = os.path.join(tmpdir, 'new_mixed.xlsx')
+    pd.DataFrame({'Column1': ['A', 'B', 'C'], 'Column2': ['x', 2, None]}).to_excel(old_path, index=False)
+    pd.DataFrame({'Column1': ['A', 'C', 'D'], 'Column2': ['x', None, 4]}).to_excel(new_path, index=False)
+
+    compare_excel(old_path, new_path, report_path, key='Column1')
+
+    with pd.ExcelFile(report_path) as xls:
+        assert pd.read_excel(xls, sheet_name='dropped_rows')['Column2'].tolist() == [2]
+        assert pd.read_excel(xls, sheet_name='added_rows')['Column2'].tolist() == [4]
+        assert pd.read_excel(xls, sheet_name='changed', keep_default_na=False)['Column2'].tolist() == ['x', 'NA']
@@ -0,0 +1,132 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from proceedings_curation.metadata.meetings import meeting_filename
+from proceedings_curation.metadata.schema import load_metadata_index
+from proceedings_curation.scripts.corpus_stats import (
+    corpus_statistics,
+    language_shares,
+    main,
+    merge_statistics,
+    save_report,
+    text_statistics,
+)
+
+ENGLISH = "This is a paragraph in English about education and science. It has two sentences."
+FRENCH = "Ceci est un paragraphe en français sur l'éducation et la science. Il a deux phrases."
+
+
+@pytest.fixture(name='metadata_index')
+def fixture_metadata_index(tmp_path):
+    path = tmp_path / 'metadata_index.csv'
+    path.write_text(
+        "meeting_id;filename;title_meeting;date_meeting;conference_date;language_codes;first_page;last_page\n"
+        "100;file1.pdf;First Meeting;1946-01-01;1946;eng;1;1\n"
+        "200;file2.pdf;Second Meeting;1946-02-02;1946;fre;1;1\n"
+        "300;file3.pdf;Third Meeting;1950-01-01;1950;eng+fre;1;2\n"
+        "400;file4.pdf;Fourth Meeting;1950-02-02;1950;eng;1;10\n"
+        "500;file5.pdf;Fifth Meeting;1952-01-01;1952;eng;1;1\n",
+        encoding='utf-8',
+    )
+    return str(path)
+
+
+@pytest.fixture(name='input_path')
+def fixture_input_path(tmp_path):
+    folder = tmp_path / 'input'
+    folder.mkdir()
+    (folder / '1946_100_first_meeting.txt').write_text(f"1. {ENGLISH}\n2. {ENGLISH}", encoding='utf-8')
+    (folder / '1946_200_second_meeting.txt').write_text(f"1. {FRENCH}\n2. {FRENCH}", encoding='utf-8')
+    (folder / '1950_300_third_meeting.txt').write_text(f"1. {ENGLISH}\n2. {FRENCH}\n3. {ENGLISH}", encoding='utf-8')
+    (folder / '1950_400_fourth_meeting.txt').write_text(f"1. {ENGLISH}", encoding='utf-8')
+    return str(folder)
+
+
+def test_text_statistics():
+    statistics = text_statistics(f"1. {ENGLISH}\n2. Short one!\n")
+    assert statistics == {
+        'characters': len(ENGLISH) + 18,
+        'words': 18,
+        'lines': 2,
+        'paragraphs': 2,
+        'sentences': 3,
+        'languages': {},
+    }
+
+
+def test_merge_statistics_and_language_shares():
+    first = {'characters': 3, 'words': 1, 'lines': 1, 'paragraphs': 1, 'sentences': 1, 'languages': {'en': 3}}
+    second = {'characters': 1, 'words': 1, 'lines': 1, 'paragraphs': 1, 'sentences': 1, 'languages': {'fr': 1}}
+    total = merge_statistics(merge_statistics({}, first), second)
+    assert total['meetings'] == 2
+    assert total['characters'] == 4
+    assert language_shares(total['languages']) == {'en': 0.75, 'fr': 0.25}
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_corpus_statistics(metadata_index, input_path, workers):
+    report = corpus_statistics(metadata_index, input_path, workers=workers)
+
+    assert report['totals']['meetings'] == 4
+    assert report['totals']['missing'] == 1
+    assert report['totals']['paragraphs'] == 8
+    assert set(report['totals']['languages']) == {'en', 'fr'}
+    assert list(report['years']) == [1946, 1950]
+    assert report['years'][1946]['meetings'] == 2
+    assert set(report['years'][1946]['languages']) == {'en', 'fr'}
+    meetings = {meeting['meeting_id']: meeting for meeting in report['meetings']}
+    assert meetings[100]['languages'] == {'en': 1.0}
+    assert meetings[500]['missing']
+    assert [meeting_id for meeting_id, meeting in meetings.items() if meeting.get('truncated')] == [400]
+    assert report['totals']['truncated'] == 1
+
+
+def test_corpus_statistics_without_conference_date(metadata_index, input_path):
+    with open(metadata_index, 'a', encoding='utf-8') as file:
+        file.write("600;file6.pdf;Sixth Meeting;;;eng;1;1\n")
+    row = load_metadata_index(metadata_index).loc[600]
+    with open(os.path.join(input_path, meeting_filename(600, row)), 'w', encoding='utf-8') as file:
+        file.write(ENGLISH)
+
+    report = corpus_statistics(metadata_index, input_path, None)
+
+    assert list(report['years']) == [1946, 1950, None]
+    assert report['years'][None]['meetings'] == 1
+    assert report['meetings'][-1]['year'] is None
+
+
+def test_corpus_statistics_with_workers_is_identical_to_serial_run(metadata_index, input_path):
+    assert corpus_statistics(metadata_index, input_path, None, workers=2) == corpus_statistics(
+        metadata_index, input_path, None
+    )
+
+
+def test_save_report_csv(metadata_index, input_path, tmp_path):
+    report = corpus_statistics(metadata_index, input_path)
+    save_report(report, str(tmp_path / 'report' / 'stats.csv'))
+
+    meetings = pd.read_csv(tmp_path / 'report' / 'stats.csv', sep=';')
+    assert meetings.meeting_id.tolist() == [100, 200, 300, 400, 500]
+    assert meetings.language_en.tolist()[0] == 1.0
+    years = pd.read_csv(tmp_path / 'report' / 'stats.years.csv', sep=';')
+    assert years.year.tolist() == [1946, 1950]
+    assert years.meetings.tolist() == [2, 2]
+
+
+def test_save_report_with_unknown_format_raises_value_error(tmp_path):
+    with pytest.raises(ValueError):
+        save_report({'totals': {}, 'years': {}, 'meetings': []}, str(tmp_path / 'stats.txt'))
+
+
+def test_main(metadata_index, input_path, tmp_path):
+    output_path = tmp_path / 'stats.json'
+
+    main(metadata_index, input_path, str(output_path), detect_languages=False)
+
+    report = json.loads(output_path.read_text(encoding='utf-8'))
+    assert report['totals']['meetings'] == 4
+    assert report['totals']['languages'] == {}
+    assert list(report['years']) == ['1946', '1950']
@@ -1,11 +1,24 @@
+import gzip
 import logging
 import os
+import random
 
 import jsonlines
 import nltk
+import pandas as pd
 import pytest
 
-from proceedings_curation.scripts.create_jsonl_dataset import create_jsonl_dataset, extract_n_consecutive_sentences
+from proceedings_curation.scripts.create_jsonl_dataset import (
+    Compression,
+    Sampling,
+    create_jsonl_dataset,
+    extract_n_consecutive_sentences,
+    file_random,
+    merge_records,
+    sample_n_consecutive_sentences,
+    sentence_language,
+)
+from proceedings_curation.writers.offset_index import JsonlDataset
 
 os.environ['BASE_URL'] = 'BASE_URL/'
 
@@ -163,3 +176,220 @@ def test_extract_n_consecutive_sentences():
     # Test extracting sentences without seed (random behavior)
     result = extract_n_consecutive_sentences(text, 2)
     assert len(nltk.sent_tokenize(result)) == 2
+
+
+@pytest.mark.parametrize(
+    'language_codes, expected', [('fre', 'fre'), ('ara', 'ara'), ('eng+fre', None), ('', None), (float('nan'), None)]
+)
+def test_sentence_language(language_codes, expected):
+    assert sentence_language(language_codes) == expected
+
+
+def test_extract_n_consecutive_sentences_language():
+    text = "这是第一句。这是第二句。这是第三句。"
+    assert extract_n_consecutive_sentences(text, 2, seed=0, language='zh') in (
+        "这是第一句。 这是第二句。",
+        "这是第二句。 这是第三句。",
+    )
+
+
+def test_create_jsonl_dataset_gzip(metadata_index, input_path, output_path):
+    create_jsonl_dataset(metadata_index, input_path, output_path, compression=Compression.gz)
+
+    with gzip.open(os.path.join(output_path, 'dataset.jsonl.gz'), 'rt', encoding='utf-8') as file:
+        lines = list(jsonlines.Reader(file))
+
+    assert len(lines) == 2
+    assert lines[0]['meta'] == {
+        'file': '2022_100_first_meeting.txt',
+        'title': 'First Meeting',
+        'date': '2022-01-01',
+        'source': 'BASE_URL/file1.pdf#page=1',
+    }
+
+
+def test_extract_n_consecutive_sentences_does_not_reseed_global_random():
+    state = random.getstate()
+    extract_n_consecutive_sentences("这是第一句。这是第二句。这是第三句。", 1, seed=42, language='zh')
+    assert random.getstate() == state
+
+
+def test_file_random():
+    assert file_random(42, 100).random() == file_random(42, 100).random()
+    assert file_random(42, 100).random() != file_random(42, 200).random()
+    assert file_random(42, 100).random() != file_random(43, 100).random()
+
+
+class TestSampleNConsecutiveSentences:
+    TEXT = ''.join(f"第{i}句。" for i in range(2000))
+
+    def test_sample_is_consecutive_sentences(self):
+        sentences = [f"第{i}句。" for i in range(2000)]
+        result = sample_n_consecutive_sentences(self.TEXT, 5, random.Random(1), language='zh', window_size=64)
+        sampled = result.split(' ')
+        assert len(sampled) == 5
+        start = sentences.index(sampled[0])
+        assert sampled == sentences[start : start + 5]
+
+    def test_sample_is_reproducible(self):
+        first = sample_n_consecutive_sentences(self.TEXT, 3, random.Random(7), language='zh')
+        second = sample_n_consecutive_sentences(self.TEXT, 3, random.Random(7), language='zh')
+        assert first == second
+
+    def test_sample_does_not_include_cut_sentences(self):
+        for seed in range(50):
+            for sentence in sample_n_consecutive_sentences(
+                self.TEXT, 2, random.Random(seed), language='zh', window_size=20
+            ).split(' '):
+                assert sentence.startswith('第') and sentence.endswith('句。')
+
+    def test_short_text_returns_full_text(self):
+        text = "这是第一句。这是第二句。"
+        assert sample_n_consecutive_sentences(text, 5, random.Random(0), language='zh') == text
+
+    def test_window_grows_to_full_text(self):
+        text = "这是第一句。这是第二句。这是第三句。"
+        result = sample_n_consecutive_sentences(text, 2, random.Random(0), language='zh', window_size=4)
+        assert result in ("这是第一句。 这是第二句。", "这是第二句。 这是第三句。")
+
+    def test_zero_sentences(self):
+        assert sample_n_consecutive_sentences(self.TEXT, 0, random.Random(0), language='zh') == ""
+
+
+@pytest.fixture(name='chinese_dataset')
+def fixture_chinese_dataset(tmpdir):
+    metadata_index_path = os.path.join(tmpdir, 'metadata_index.csv')
+    input_folder = os.path.join(tmpdir, 'input')
+    os.makedirs(input_folder, exist_ok=True)
+    with open(metadata_index_path, 'w', encoding='utf-8') as f:
+        f.write("meeting_id;filename;title_meeting;date_meeting;conference_date;language_codes;first_page;last_page\n")
+        for i in range(1, 9):
+            f.write(f"{i};file{i}.pdf;Meeting {i};2022-01-0{i};2022;chi;1;10\n")
+            with open(os.path.join(input_folder, f'2022_{i}_meeting_{i}.txt'), 'w', encoding='utf-8') as text:
+                text.write(''.join(f"会议{i}第{j}句。" for j in range(500)))
+    return metadata_index_path, input_folder
+
+
+@pytest.mark.parametrize('sampling', [Sampling.full, Sampling.window])
+def test_create_jsonl_dataset_workers_identical(chinese_dataset, tmpdir, sampling):
+    metadata_index, input_path = chinese_dataset
+    for name, workers in [('serial', 1), ('parallel', 3)]:
+        create_jsonl_dataset(
+            metadata_index, input_path, str(tmpdir), name, 6, 4, seed=42, sampling=sampling, workers=workers
+        )
+
+    with jsonlines.open(os.path.join(tmpdir, 'serial.jsonl')) as reader:
+        serial = list(reader)
+    with jsonlines.open(os.path.join(tmpdir, 'parallel.jsonl')) as reader:
+        parallel = list(reader)
+
+    assert len(serial) == 6
+    assert serial == parallel
+
+
+def test_create_jsonl_dataset_workers_missing_file(metadata_index, input_path, output_path, caplog):
+    os.remove(os.path.join(input_path, '2022_100_first_meeting.txt'))
+
+    create_jsonl_dataset(metadata_index, input_path, output_path, workers=2)
+
+    with jsonlines.open(os.path.join(output_path, 'dataset.jsonl')) as reader:
+        lines = list(reader)
+    assert [line['meta']['file'] for line in lines] == ['2022_200_second_meeting.txt']
+    assert "File 2022_100_first_meeting.txt not found" in caplog.text
+
+
+def test_create_jsonl_dataset_parquet(metadata_index, input_path, output_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+
+    create_jsonl_dataset(metadata_index, input_path, output_path, parquet=True)
+
+    assert os.path.exists(os.path.join(output_path, 'dataset.jsonl'))
+    assert os.listdir(os.path.join(output_path, 'dataset.parquet')) == ['year=2022']
+    table = pq.read_table(os.path.join(output_path, 'dataset.parquet'), filters=[('year', '=', 2022)])
+    rows = sorted(table.to_pylist(), key=lambda row: row['meeting_id'])
+    assert [row['meeting_id'] for row in rows] == [100, 200]
+    assert rows[0]['file'] == '2022_100_first_meeting.txt'
+    assert rows[0]['title'] == 'First Meeting'
+    assert str(rows[0]['date']) == '2022-01-01'
+    assert rows[0]['source'] == 'BASE_URL/file1.pdf#page=1'
+    assert rows[0]['language_codes'] == 'eng'
+    assert rows[0]['text'].startswith('This is the text for meeting 1.')
+
+
+def test_create_jsonl_dataset_incremental(chinese_dataset, tmpdir, caplog):
+    metadata_index, input_path = chinese_dataset
+    create_jsonl_dataset(metadata_index, input_path, str(tmpdir), 'dataset', incremental=True)
+    assert "No previous build found" in caplog.text
+    assert os.path.exists(os.path.join(tmpdir, 'dataset.manifest.json'))
+
+    # Change a text file and a title, and drop a meeting from the index
+    with open(os.path.join(input_path, '2022_3_meeting_3.txt'), 'w', encoding='utf-8') as text:
+        text.write("新的文本。")
+    index = pd.read_csv(metadata_index, sep=';')
+    index.loc[index.meeting_id == 7, 'title_meeting'] = 'Meeting 7'
+    index.loc[index.meeting_id == 7, 'first_page'] = 2
+    index = index[index.meeting_id != 5]
+    index.to_csv(metadata_index, sep=';', index=False)
+
+    caplog.clear()
+    create_jsonl_dataset(metadata_index, input_path, str(tmpdir), 'dataset', incremental=True)
+    assert "Reusing 5 records, building 2 records" in caplog.text
+    create_jsonl_dataset(metadata_index, input_path, str(tmpdir), 'full')
+
+    with (
+        open(os.path.join(tmpdir, 'dataset.jsonl'), 'rb') as incremental,
+        open(os.path.join(tmpdir, 'full.jsonl'), 'rb') as full,
+    ):
+        assert incremental.read() == full.read()
+    with jsonlines.open(os.path.join(tmpdir, 'dataset.jsonl')) as reader:
+        lines = list(reader)
+    assert len(lines) == 7
+    assert lines[2]['text'] == "新的文本。"
+    assert lines[5]['meta']['source'].endswith('#page=2')
+
+
+def test_create_jsonl_dataset_incremental_other_options(chinese_dataset, tmpdir, caplog):
+    metadata_index, input_path = chinese_dataset
+    create_jsonl_dataset(metadata_index, input_path, str(tmpdir), 'dataset')
+    create_jsonl_dataset(
+        metadata_index, input_path, str(tmpdir), 'dataset', None, 2, seed=1, sampling=Sampling.window, incremental=True
+    )
+    assert "Previous build used other options" in caplog.text
+    with jsonlines.open(os.path.join(tmpdir, 'dataset.jsonl')) as reader:
+        assert all(len(line['text'].split(' ')) == 2 for line in reader)
+
+
+def test_create_jsonl_dataset_offset_index(chinese_dataset, tmpdir):
+    metadata_index, input_path = chinese_dataset
+    create_jsonl_dataset(metadata_index, input_path, str(tmpdir), 'dataset')
+
+    with jsonlines.open(os.path.join(tmpdir, 'dataset.jsonl')) as reader:
+        lines = list(reader)
+    with JsonlDataset(os.path.join(tmpdir, 'dataset.jsonl')) as dataset:
+        assert len(dataset) == 8
+        assert dataset.get(4) == lines[3]
+        assert dataset.get_by_file('2022_6_meeting_6.txt') == lines[5]
+
+
+def test_create_jsonl_dataset_exclude(metadata_index, input_path, output_path, tmpdir):
+    exclude = os.path.join(tmpdir, 'exclusions.txt')
+    with open(exclude, 'w', encoding='utf-8') as f:
+        f.write("2022_200_second_meeting.txt\n\n")
+
+    create_jsonl_dataset(metadata_index, input_path, output_path, exclude=exclude)
+
+    with jsonlines.open(os.path.join(output_path, 'dataset.jsonl')) as reader:
+        lines = list(reader)
+    assert [line['meta']['file'] for line in lines] == ['2022_100_first_meeting.txt']
+
+
+def test_merge_records():
+    merged = merge_records([b'a', None, b'c', None], [({'text': 'b'}, None), (None, 'missing')])
+
+    assert list(merged) == [(b'a', None), ({'text': 'b'}, None), (b'c', None), (None, 'missing')]
+
+
+@pytest.mark.parametrize('built', [[], [({'text': 'b'}, None), ({'text': 'c'}, None)]])
+def test_merge_records_mismatch(built):
+    with pytest.raises(ValueError):
+        list(merge_records([b'a', None], built))
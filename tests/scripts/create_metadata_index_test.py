@@ -1,6 +1,7 @@
 import pandas as pd
 import pytest
 
+from proceedings_curation.metadata.schema import METADATA_INDEX_DTYPES
 from proceedings_curation.scripts.create_metadata_index import create_metadata_index, main, save_metadata_index
 
 
@@ -120,6 +121,11 @@ class TestCreateMetadataIndex:
         assert not idx.empty
         assert idx.columns.tolist() == expected_columns
 
+    def test_create_metadata_index_dtypes(self, proceedings_index_file, proceedings_metadata_file):
+        idx = create_metadata_index(proceedings_index_file, proceedings_metadata_file)
+
+        assert {column: str(dtype) for column, dtype in idx.dtypes.items()} == METADATA_INDEX_DTYPES
+
     def test_create_metadata_with_date_errors(
         self, proceedings_index_file_with_date_errors, proceedings_metadata_file, caplog
     ):
@@ -128,6 +134,7 @@ class TestCreateMetadataIndex:
         assert "errors in Proceedings index, 'Date meeting'" in caplog.text
         assert "Dates out of range" in caplog.text
         assert "Years do not match" in caplog.text
+        assert {record.levelname for record in caplog.records if "Dates out of range" in record.message} == {'ERROR'}
 
 
 @pytest.fixture(name="metadata_index")
@@ -225,6 +232,24 @@ class TestMainFunction:
             'language_codes',
         ]
 
+    def test_main_function_incremental(self, proceedings_index_file, proceedings_metadata_file, tmp_path):
+        output_file = tmp_path / "metadata_index.csv"
+        changes_file = tmp_path / "changes.csv"
+        main(proceedings_index_file, proceedings_metadata_file, output_file)
+        df = pd.read_excel(proceedings_index_file)
+        df.loc[1, 'Session president'] = 'President 3'
+        df.to_excel(proceedings_index_file, index=False)
+
+        main(proceedings_index_file, proceedings_metadata_file, output_file, incremental=True, changes=changes_file)
+
+        df_read = pd.read_csv(output_file, sep=';', encoding='utf-8-sig', index_col=0)
+        assert df_read.index.tolist() == [10000, 20000]
+        assert df_read.session_president.tolist() == ['President 1', 'President 3']
+        changes = pd.read_csv(changes_file, sep=';', encoding='utf-8-sig')
+        assert changes[['meeting_id', 'change', 'columns']].values.tolist() == [
+            [20000, 'modified', 'session_president']
+        ]
+
 
 class TestCreateMetadataIndexErrors:
     def test_create_metadata_index_with_invalid_pages_in_pdf(self, tmp_path, proceedings_metadata_file):
@@ -382,3 +407,52 @@ class TestCreateMetadataIndexErrors:
 
         with pytest.raises(ValueError):
             create_metadata_index(proceedings_index_file, proceedings_metadata_file)
+
+
+class TestCreateMetadataIndexValidation:
+    @pytest.fixture(name="proceedings_index_file_with_errors")
+    def fixture_proceedings_index_file_with_errors(self, tmp_path, proceedings_index_file):
+        df = pd.read_excel(proceedings_index_file)
+        df['Pages in doc'] = ['1-', '11-20']  # Trailing '-'
+        df['Pages in pdf'] = ['1-10', '20-11']  # Last page smaller than first page
+        file_path = tmp_path / "proceedings_index_with_errors.xlsx"
+        df.to_excel(file_path, index=False)
+        return file_path
+
+    def test_all_errors_are_raised_together(self, proceedings_index_file_with_errors, proceedings_metadata_file):
+        with pytest.raises(ValueError) as error:
+            create_metadata_index(proceedings_index_file_with_errors, proceedings_metadata_file)
+
+        assert "Trailing '-' in 'pages_in_doc' column" in str(error.value)
+        assert "Last page smaller than first page" in str(error.value)
+
+    def test_severities_turn_errors_into_warnings(self, proceedings_index_file_with_errors, proceedings_metadata_file):
+        with pytest.raises(ValueError) as error:
+            create_metadata_index(
+                proceedings_index_file_with_errors, proceedings_metadata_file, {'trailing_dash_pages_in_doc': 'warning'}
+            )
+
+        assert "Trailing '-' in 'pages_in_doc' column" not in str(error.value)
+        assert "Last page smaller than first page" in str(error.value)
+
+    def test_validation_report(self, proceedings_index_file_with_errors, proceedings_metadata_file, tmp_path):
+        report_file = tmp_path / "validation_report.csv"
+
+        with pytest.raises(ValueError):
+            create_metadata_index(
+                proceedings_index_file_with_errors, proceedings_metadata_file, validation_report=report_file
+            )
+
+        report = pd.read_csv(report_file, sep=';', encoding='utf-8-sig')
+        assert report.rule.tolist() == ['trailing_dash_pages_in_doc', 'last_page_before_first_page']
+        assert report.row.tolist() == [0, 1]
+
+    def test_main_function_with_warn(self, proceedings_index_file, proceedings_metadata_file, tmp_path):
+        df = pd.read_excel(proceedings_index_file)
+        df['Pages in doc'] = ['1-', '11-20']
+        df.to_excel(proceedings_index_file, index=False)
+        output_file = tmp_path / "metadata_index.csv"
+
+        main(proceedings_index_file, proceedings_metadata_file, output_file, warn=['trailing_dash_pages_in_doc'])
+
+        assert output_file.exists()
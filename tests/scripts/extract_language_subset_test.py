@@ -4,7 +4,7 @@ import pytest
 import typer
 from typer.testing import CliRunner
 
-from proceedings_curation.scripts.extract_language_subset import main, process_files
+from proceedings_curation.scripts.extract_language_subset import OutputSpec, main, parse_output_spec, process_files
 
 
 @pytest.fixture(name="input_folder")
@@ -194,6 +194,170 @@ class TestProcessFiles:
 
         assert "Unable to detect language for paragraph " in caplog.text
 
+    def test_process_files_with_multiple_outputs(self, tmpdir, input_folder, output_folder, possible_languages):
+        spanish_folder = str(tmpdir.join("output_es"))
+        both_folder = str(tmpdir.join("output_en_es"))
+
+        process_files(
+            input_folder,
+            output_folder,
+            "simple",
+            possible_languages,
+            ["en"],
+            outputs=[(["es"], spanish_folder, False), OutputSpec(["en", "es"], both_folder)],
+        )
+
+        with open(os.path.join(output_folder, "file2.txt"), 'r', encoding='utf-8') as file:
+            assert file.read() == ""
+        with open(os.path.join(spanish_folder, "file1.txt"), 'r', encoding='utf-8') as file:
+            assert file.read() == ""
+        with open(os.path.join(spanish_folder, "file2.txt"), 'r', encoding='utf-8') as file:
+            assert "Este es un archivo de prueba." in file.read()
+        with open(os.path.join(both_folder, "file1.txt"), 'r', encoding='utf-8') as file:
+            assert "This is a test file." in file.read()
+        with open(os.path.join(both_folder, "file2.txt"), 'r', encoding='utf-8') as file:
+            assert "Este es un archivo de prueba." in file.read()
+
+    def test_process_files_with_multiple_outputs_only_writes_missing_outputs(
+        self, caplog, tmpdir, input_folder, output_folder, possible_languages
+    ):
+        spanish_folder = str(tmpdir.join("output_es"))
+        os.makedirs(spanish_folder)
+        with open(os.path.join(spanish_folder, "file1.txt"), 'w', encoding='utf-8') as file:
+            file.write("existing")
+
+        process_files(
+            input_folder, output_folder, "simple", possible_languages, "en", outputs=[(["es"], spanish_folder, False)]
+        )
+
+        with open(os.path.join(spanish_folder, "file1.txt"), 'r', encoding='utf-8') as file:
+            assert file.read() == "existing"
+        assert os.path.exists(os.path.join(output_folder, "file1.txt"))
+        assert "File already exists. Skipping " not in caplog.text
+        assert "Number of paragraphs kept (es): " in caplog.text
+
+    def test_process_files_with_workers_is_identical_to_serial_run(
+        self, caplog, tmpdir, input_folder, possible_languages
+    ):
+        serial_folder = str(tmpdir.join("serial"))
+        parallel_folder = str(tmpdir.join("parallel"))
+        with open(os.path.join(input_folder, "file3.txt"), 'w', encoding='utf-8') as file:
+            file.write("1. Ceci est un paragraphe.\n2. This is a paragraph.\n3. Un kilo de tomates.\n4. abcdef.")
+
+        process_files(input_folder, serial_folder, "simple", possible_languages, ["en", "fr"])
+        serial_log = [record.message for record in caplog.records if "Using " not in record.message]
+        caplog.clear()
+        process_files(input_folder, parallel_folder, "simple", possible_languages, ["en", "fr"], workers=2)
+        parallel_log = [record.message for record in caplog.records if "Using " not in record.message]
+
+        for filename in sorted(os.listdir(input_folder)):
+            with open(os.path.join(serial_folder, filename), 'rb') as serial_file:
+                with open(os.path.join(parallel_folder, filename), 'rb') as parallel_file:
+                    assert serial_file.read() == parallel_file.read()
+        assert parallel_log == [message.replace(serial_folder, parallel_folder) for message in serial_log]
+
+    def test_process_files_with_profile_store(self, tmpdir, input_folder, output_folder, possible_languages):
+        profile_store = str(tmpdir.join("profiles.bin"))
+
+        process_files(
+            input_folder, output_folder, "simple", possible_languages, ["en"], workers=2, profile_store=profile_store
+        )
+
+        assert os.path.exists(profile_store)
+        with open(os.path.join(output_folder, "file1.txt"), 'r', encoding='utf-8') as file:
+            assert "This is a test file." in file.read()
+        with open(os.path.join(output_folder, "file2.txt"), 'r', encoding='utf-8') as file:
+            assert file.read() == ""
+
+    def test_process_files_with_min_detect_length(self, caplog, input_folder, output_folder, possible_languages):
+        with open(os.path.join(input_folder, "file3.txt"), 'w', encoding='utf-8') as file:
+            file.write("1. This is the first paragraph of the file.\n2. abcdef.\n3. This is the last paragraph.")
+
+        process_files(input_folder, output_folder, "simple", possible_languages, ["en"], min_detect_length=12)
+
+        with open(os.path.join(output_folder, "file3.txt"), 'r', encoding='utf-8') as file:
+            assert file.read().split("\n")[1] == "2. abcdef."
+        assert "Assigning paragraphs shorter than 12 characters the language of their neighbours" in caplog.text
+        assert "Unable to detect language for paragraph " not in caplog.text
+
+    def test_process_files_with_max_paragraph_repeats_drops_repeated_paragraphs(
+        self, caplog, tmpdir, possible_languages
+    ):
+        input_folder = str(tmpdir.mkdir("repeats"))
+        output_folder = str(tmpdir.join("output_repeats"))
+        for filename in ["file1.txt", "file2.txt"]:
+            with open(os.path.join(input_folder, filename), 'w', encoding='utf-8') as file:
+                file.write(f"1. This is the common header.\n2. This is the text of {filename}.")
+
+        process_files(input_folder, output_folder, "simple", possible_languages, ["en"], max_paragraph_repeats=1)
+
+        with open(os.path.join(output_folder, "file1.txt"), 'r', encoding='utf-8') as file:
+            assert file.read().startswith("1. This is the common header.")
+        with open(os.path.join(output_folder, "file2.txt"), 'r', encoding='utf-8') as file:
+            assert file.read() == "2. This is the text of file2.txt."
+        assert "Number of repeated paragraphs: 1" in caplog.text
+
+    def test_process_files_with_paragraph_dedup_count_keeps_repeated_paragraphs(
+        self, caplog, tmpdir, possible_languages
+    ):
+        input_folder = str(tmpdir.mkdir("repeats"))
+        output_folder = str(tmpdir.join("output_repeats"))
+        for filename in ["file1.txt", "file2.txt"]:
+            with open(os.path.join(input_folder, filename), 'w', encoding='utf-8') as file:
+                file.write("1. This is the common header.")
+
+        process_files(
+            input_folder,
+            output_folder,
+            "simple",
+            possible_languages,
+            ["en"],
+            max_paragraph_repeats=1,
+            dedup_action='count',
+        )
+
+        with open(os.path.join(output_folder, "file2.txt"), 'r', encoding='utf-8') as file:
+            assert file.read() == "1. This is the common header."
+        assert "Number of repeated paragraphs: 1" in caplog.text
+
+    def test_process_files_with_max_paragraph_repeats_and_workers_is_identical_to_serial_run(
+        self, caplog, tmpdir, possible_languages
+    ):
+        input_folder = str(tmpdir.mkdir("repeats"))
+        for i in range(4):
+            with open(os.path.join(input_folder, f"file{i}.txt"), 'w', encoding='utf-8') as file:
+                file.write(f"1. This is the common header.\n2. This is file number {i}.\n3. This is the footer.")
+        serial_folder = str(tmpdir.join("serial"))
+        parallel_folder = str(tmpdir.join("parallel"))
+
+        process_files(input_folder, serial_folder, "simple", possible_languages, ["en"], max_paragraph_repeats=2)
+        serial_log = [record.message for record in caplog.records if "Using " not in record.message]
+        caplog.clear()
+        process_files(
+            input_folder, parallel_folder, "simple", possible_languages, ["en"], workers=2, max_paragraph_repeats=2
+        )
+        parallel_log = [record.message for record in caplog.records if "Using " not in record.message]
+
+        for filename in sorted(os.listdir(input_folder)):
+            with open(os.path.join(serial_folder, filename), 'rb') as serial_file:
+                with open(os.path.join(parallel_folder, filename), 'rb') as parallel_file:
+                    assert serial_file.read() == parallel_file.read()
+        with open(os.path.join(serial_folder, "file3.txt"), 'r', encoding='utf-8') as file:
+            assert file.read() == "2. This is file number 3."
+        assert parallel_log == [message.replace(serial_folder, parallel_folder) for message in serial_log]
+
+
+class TestParseOutputSpec:
+    def test_parse_output_spec(self):
+        assert parse_output_spec("fr+en:/data/fre_eng") == OutputSpec(["fr", "en"], "/data/fre_eng", False)
+
+    def test_parse_output_spec_with_keep_undetected(self):
+        assert parse_output_spec("fr:/data/fre", keep_undetected=True) == OutputSpec(["fr"], "/data/fre", True)
+
+    def test_parse_output_spec_with_invalid_spec_raises_value_error(self):
+        with pytest.raises(ValueError):
+            parse_output_spec("/data/fre")
+
 
 app = typer.Typer()
 app.command()(main)
@@ -361,3 +525,30 @@ class TestMainFunction:
         assert os.path.exists(os.path.join(output_folder, "info.log"))
         assert os.path.exists(os.path.join(output_folder, "debug.log"))
         assert os.path.exists(os.path.join(output_folder, "warning.log"))
+
+    def test_main_function_with_outputs_and_workers(self, tmpdir, input_folder, output_folder):
+        spanish_folder = str(tmpdir.join("output_es"))
+        result = runner.invoke(
+            app,
+            [
+                input_folder,
+                output_folder,
+                "--tokenizer",
+                "simple",
+                "--possible-languages",
+                "en",
+                "--possible-languages",
+                "es",
+                "--filter-languages",
+                "en",
+                "--output",
+                f"es:{spanish_folder}",
+                "--workers",
+                "2",
+            ],
+        )
+        assert result.exit_code == 0
+        with open(os.path.join(output_folder, "file1.txt"), 'r', encoding='utf-8') as file:
+            assert "This is a test file." in file.read()
+        with open(os.path.join(spanish_folder, "file2.txt"), 'r', encoding='utf-8') as file:
+            assert "Este es un archivo de prueba." in file.read()
@@ -4,7 +4,13 @@ import pandas as pd
 import pytest
 
 from proceedings_curation.extractors import PDFBoxExtractorMod, TesseractExtractorMod
-from proceedings_curation.scripts.extract_meetings import check_source_files, extract_meetings, load_index, main
+from proceedings_curation.scripts.extract_meetings import (
+    Extractor,
+    check_source_files,
+    extract_meetings,
+    load_index,
+    main,
+)
 
 
 @pytest.fixture(name="metadata_index")
@@ -132,7 +138,7 @@ class TestMain:
                 metadata_index=metadata_index_file,
                 input_path=input_path,
                 output_path=output_path,
-                extractor='pdfbox',
+                extractor=Extractor.pdfbox,
                 page_numbers=False,
                 page_sep='',
                 force=False,
@@ -145,7 +151,7 @@ class TestMain:
                 metadata_index=metadata_index_file,
                 input_path=input_path,
                 output_path=output_path,
-                extractor='tesseract',
+                extractor=Extractor.tesseract,
                 page_numbers=False,
                 page_sep='',
                 force=False,
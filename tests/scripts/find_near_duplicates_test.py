@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from proceedings_curation.scripts.find_near_duplicates import find_near_duplicate_meetings, main
+
+WORDS = [f"word{i}" for i in range(300)]
+
+
+@pytest.fixture(name="input_folder")
+def fixture_input_folder(tmp_path):
+    folder = tmp_path / "input"
+    folder.mkdir()
+    (folder / "1946_1_first_meeting.txt").write_text(' '.join(WORDS), encoding='utf-8')
+    (folder / "1948_2_second_meeting.txt").write_text(' '.join(f"other{i}" for i in range(300)), encoding='utf-8')
+    (folder / "1950_3_reprint.txt").write_text(' '.join(WORDS[:295] + ['x'] * 5), encoding='utf-8')
+    return str(folder)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_find_near_duplicate_meetings(input_folder, tmp_path, workers):
+    report = tmp_path / "output" / "report.csv"
+    exclusions = tmp_path / "output" / "exclusions.txt"
+
+    find_near_duplicate_meetings(input_folder, str(report), str(exclusions), workers=workers)
+
+    pairs = pd.read_csv(report, sep=';')
+    assert pairs[['file', 'duplicate_file']].values.tolist() == [['1946_1_first_meeting.txt', '1950_3_reprint.txt']]
+    assert pairs.similarity[0] >= 0.8
+    assert exclusions.read_text(encoding='utf-8') == "1950_3_reprint.txt\n"
+
+
+def test_main_no_duplicates(tmp_path):
+    folder = tmp_path / "input"
+    folder.mkdir()
+    (folder / "1946_1_first_meeting.txt").write_text(' '.join(WORDS), encoding='utf-8')
+
+    main(str(folder), str(tmp_path / "report.csv"), str(tmp_path / "exclusions.txt"))
+
+    assert pd.read_csv(tmp_path / "report.csv", sep=';').empty
+    assert (tmp_path / "exclusions.txt").read_text(encoding='utf-8') == ""
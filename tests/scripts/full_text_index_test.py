@@ -0,0 +1,98 @@
+import os
+
+import pytest
+import typer
+from typer.testing import CliRunner
+
+from proceedings_curation.scripts.full_text_index import index_meetings, search_meetings
+from proceedings_curation.search.inverted_index import InvertedIndex
+
+runner = CliRunner()
+
+
+@pytest.fixture(name='metadata_index')
+def fixture_metadata_index(tmp_path):
+    path = tmp_path / 'metadata_index.csv'
+    path.write_text(
+        "meeting_id;filename;title_meeting;date_meeting;conference_date;language_codes;first_page;last_page\n"
+        "100;file1.pdf;First Meeting;1946-01-01;1946;eng;1;10\n"
+        "200;file2.pdf;Second Meeting;1950-02-02;1950;eng+fre;1;20\n",
+        encoding='utf-8',
+    )
+    return str(path)
+
+
+@pytest.fixture(name='input_path')
+def fixture_input_path(tmp_path):
+    folder = tmp_path / 'input'
+    folder.mkdir()
+    (folder / '1946_100_first_meeting.txt').write_text("1. Education for peace.\n2. Science.", encoding='utf-8')
+    (folder / '1950_200_second_meeting.txt').write_text("1. Culture and peace.", encoding='utf-8')
+    return str(folder)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_index_meetings(metadata_index, input_path, tmp_path, workers):
+    index_path = str(tmp_path / 'index' / 'meetings.sqlite')
+
+    index_meetings(metadata_index, input_path, index_path, workers=workers)
+
+    with InvertedIndex(index_path) as index:
+        hits = index.search('peace')
+        assert [(hit.meeting_id, hit.year, hit.title, hit.language_codes) for hit in hits] == [
+            (100, 1946, 'First Meeting', 'eng'),
+            (200, 1950, 'Second Meeting', 'eng+fre'),
+        ]
+        assert index.setting('tokenizer') == 'simple:'
+
+
+def test_index_meetings_is_incremental(metadata_index, input_path, tmp_path, caplog):
+    index_path = str(tmp_path / 'meetings.sqlite')
+    index_meetings(metadata_index, input_path, index_path)
+
+    with open(os.path.join(input_path, '1950_200_second_meeting.txt'), 'w', encoding='utf-8') as file:
+        file.write("1. Culture and communication.")
+    os.remove(os.path.join(input_path, '1946_100_first_meeting.txt'))
+    caplog.clear()
+    index_meetings(metadata_index, input_path, index_path)
+
+    assert "Indexing 1 new or changed meetings, keeping 0, removing 1" in caplog.text
+    with InvertedIndex(index_path) as index:
+        assert not index.search('peace')
+        assert [hit.meeting_id for hit in index.search('communication')] == [200]
+
+    caplog.clear()
+    index_meetings(metadata_index, input_path, index_path)
+    assert "Indexing 0 new or changed meetings, keeping 1, removing 0" in caplog.text
+
+
+def test_index_meetings_with_other_tokenizer_rebuilds_index(metadata_index, input_path, tmp_path, caplog):
+    index_path = str(tmp_path / 'meetings.sqlite')
+    index_meetings(metadata_index, input_path, index_path)
+    caplog.clear()
+
+    index_meetings(metadata_index, input_path, index_path, tokenizer='simple', tokenizer_language='fr')
+
+    assert "Indexing 2 new or changed meetings" in caplog.text
+
+
+def test_search_meetings(metadata_index, input_path, tmp_path):
+    index_path = str(tmp_path / 'meetings.sqlite')
+    index_meetings(metadata_index, input_path, index_path)
+    app = typer.Typer()
+    app.command()(search_meetings)
+
+    result = runner.invoke(app, [index_path, 'peace -science', '--year-from', '1947'])
+
+    assert result.exit_code == 0
+    assert result.output == "200\t1950\t1950_200_second_meeting.txt\tSecond Meeting\t1\n"
+
+
+def test_search_meetings_with_invalid_query(metadata_index, input_path, tmp_path):
+    index_path = str(tmp_path / 'meetings.sqlite')
+    index_meetings(metadata_index, input_path, index_path)
+    app = typer.Typer()
+    app.command()(search_meetings)
+
+    assert runner.invoke(app, [index_path, '(peace']).exit_code == 2
+    assert runner.invoke(app, [str(tmp_path / 'missing.sqlite'), 'peace']).exit_code == 2
@@ -0,0 +1,123 @@
+import pytest
+
+from proceedings_curation.search.inverted_index import (
+    InvertedIndex,
+    QueryError,
+    decode_positions,
+    decode_varints,
+    encode_positions,
+    encode_varints,
+    meeting_postings,
+    parse_query,
+)
+from proceedings_curation.tokenizers.tokenizers import SimpleParagraphTokenizer
+
+TEXTS = {
+    1: "1. Education for peace.\n2. Human rights and education.",
+    2: "1. The rights of humans.\n2. War and peace.",
+    3: "1. 教育与和平。",
+}
+METADATA = {
+    1: {'year': 1946, 'title': 'First meeting', 'language_codes': 'eng+fre'},
+    2: {'year': 1950, 'title': 'Second meeting', 'language_codes': 'eng'},
+    3: {'year': 1960, 'title': 'Third meeting', 'language_codes': 'chi'},
+}
+
+
+def add_meeting(index, meeting_id, text):
+    entry = {'file': f'{meeting_id}.txt', 'size': 0, 'mtime_ns': 0, 'text_hash': '', 'meta_hash': ''}
+    paragraphs, postings = meeting_postings(text, SimpleParagraphTokenizer())
+    index.add_meeting(meeting_id, entry, METADATA[meeting_id], paragraphs, postings)
+
+
+@pytest.fixture(name='index')
+def fixture_index(tmp_path):
+    with InvertedIndex(tmp_path / 'index.sqlite') as index:
+        for meeting_id, text in TEXTS.items():
+            add_meeting(index, meeting_id, text)
+        index.commit()
+        yield index
+
+
+def test_varints():
+    values = [0, 1, 127, 128, 300, 2**40]
+    assert decode_varints(encode_varints(values)).tolist() == values
+    assert len(encode_varints([127, 128])) == 3
+    assert len(decode_varints(b'')) == 0
+
+
+def test_positions():
+    positions = [(0, 3), (0, 7), (2, 1), (5, 0), (5, 200)]
+    assert decode_positions(encode_positions(positions)).tolist() == [list(position) for position in positions]
+
+
+class TestParseQuery:
+    def test_implicit_and(self):
+        assert parse_query('peace education') == ('and', ('phrase', ('peace',)), ('phrase', ('education',)))
+
+    def test_precedence(self):
+        assert parse_query('a OR b c') == ('or', ('phrase', ('a',)), ('and', ('phrase', ('b',)), ('phrase', ('c',))))
+
+    def test_not_and_parentheses(self):
+        assert parse_query('-(a OR b)') == ('not', ('or', ('phrase', ('a',)), ('phrase', ('b',))))
+
+    def test_phrase(self):
+        assert parse_query('"Human Rights"') == ('phrase', ('human', 'rights'))
+        assert parse_query('co-operation') == ('phrase', ('co', 'operation'))
+
+    @pytest.mark.parametrize('query', ['', 'a AND', '(a OR b', 'a)', '"..."'])
+    def test_invalid_query_raises_query_error(self, query):
+        with pytest.raises(QueryError):
+            parse_query(query)
+
+
+class TestInvertedIndex:
+    def test_len(self, index):
+        assert len(index) == 3
+
+    def test_term(self, index):
+        hits = index.search('peace')
+        assert [hit.meeting_id for hit in hits] == [1, 2]
+        assert hits[0].paragraphs == [0]
+        assert hits[1].paragraphs == [1]
+        assert hits[1].spans == [(TEXTS[2].index('2.'), len(TEXTS[2]))]
+
+    def test_boolean_queries(self, index):
+        assert [hit.meeting_id for hit in index.search('peace AND education')] == [1]
+        assert [hit.meeting_id for hit in index.search('education OR war')] == [1, 2]
+        assert [hit.meeting_id for hit in index.search('peace -war')] == [1]
+        assert [hit.meeting_id for hit in index.search('NOT peace')] == [3]
+
+    def test_phrase_queries(self, index):
+        assert [hit.meeting_id for hit in index.search('"human rights"')] == [1]
+        assert [hit.meeting_id for hit in index.search('"rights human"')] == []
+        assert [hit.meeting_id for hit in index.search('"education for peace"')] == [1]
+        assert [hit.meeting_id for hit in index.search('"和平"')] == [3]
+
+    def test_phrases_do_not_cross_paragraphs(self, index):
+        assert index.search('"peace human"') == []
+
+    def test_filters(self, index):
+        assert [hit.meeting_id for hit in index.search('peace', year_from=1947)] == [2]
+        assert [hit.meeting_id for hit in index.search('peace', year_to=1947)] == [1]
+        assert [hit.meeting_id for hit in index.search('peace', language='fre')] == [1]
+        assert [hit.meeting_id for hit in index.search('peace', language='en')] == []
+        assert len(index.search('peace', limit=1)) == 1
+
+    def test_remove_and_replace_meeting(self, index):
+        index.remove_meeting(1)
+        add_meeting(index, 2, "1. Nothing to see.")
+        index.commit()
+        assert index.search('peace') == []
+        assert [hit.meeting_id for hit in index.search('nothing')] == [2]
+        assert set(index.meetings()) == {2, 3}
+
+    @pytest.mark.usefixtures('index')
+    def test_index_is_persistent(self, tmp_path):
+        with InvertedIndex(tmp_path / 'index.sqlite') as reopened:
+            assert [hit.meeting_id for hit in reopened.search('peace')] == [1, 2]
+
+    def test_setting(self, index):
+        assert index.setting('tokenizer') is None
+        index.set_setting('tokenizer', 'simple')
+        assert index.setting('tokenizer') == 'simple'
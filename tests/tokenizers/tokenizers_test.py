@@ -1,10 +1,17 @@
+from array import array
+
 import pytest
 
 from proceedings_curation.tokenizers.tokenizers import (
+    PARAGRAPH_START,
     NLTKParagraphTokenizer,
+    ParagraphSpans,
     ParagraphTokenizer,
+    RegexSentenceTokenizer,
     SimpleParagraphTokenizer,
     TokenizerFactory,
+    get_sentence_tokenizer,
+    word_tokenize,
 )
 
 
@@ -56,6 +63,55 @@ class TestSimpleParagrapghTokenizer:
         expected: list[str] = []
         assert tokenizer.tokenize(text) == expected
 
+    def test_tokenize_paragraph_with_leading_whitespace_and_empty_first_line(self, tokenizer):
+        text = "\n  1. This is the first paragraph.\n\t(2) This is the second paragraph.\n( 3) Not a new paragraph."
+        expected = [
+            "",
+            "1. This is the first paragraph.",
+            "(2) This is the second paragraph. ( 3) Not a new paragraph.",
+        ]
+        assert tokenizer.tokenize(text) == expected
+
+    def test_tokenize_stream(self, tokenizer):
+        lines = iter(["1. This is the first paragraph.\n", "This is still the first paragraph.\n", "(2) Second.\n"])
+        paragraphs = tokenizer.tokenize_stream(lines)
+        assert next(paragraphs) == "1. This is the first paragraph. This is still the first paragraph."
+        assert list(paragraphs) == ["(2) Second."]
+
+    def test_tokenize_stream_from_file_is_same_as_tokenize(self, tokenizer, tmp_path):
+        text = "Preamble\n1. First paragraph.\ncontinued\n\n(2) Second paragraph.\n3. Third paragraph.\n"
+        path = tmp_path / "text.txt"
+        path.write_text(text, encoding="utf-8")
+        with open(path, 'r', encoding='utf-8') as file:
+            assert list(tokenizer.tokenize_stream(file)) == tokenizer.tokenize(text)
+
+    def test_tokenize_spans(self, tokenizer):
+        text = "1. This is the first paragraph.\nThis is still the first paragraph.  \n\n (2) This is the second."
+        spans = tokenizer.tokenize_spans(text)
+        assert list(spans.spans()) == [(0, 66), (71, 94)]
+        assert spans.source(0) == "1. This is the first paragraph.\nThis is still the first paragraph."
+        assert list(spans) == tokenizer.tokenize(text)
+
+    def test_tokenize_spans_is_same_as_tokenize(self, tokenizer):
+        texts = ["", "\n", "No number\n1. First", "\n1. First\n\n", "  (1) First\n( 2) Still first\n2 Second \n"]
+        for text in texts:
+            assert list(tokenizer.tokenize_spans(text)) == tokenizer.tokenize(text)
+
+    @pytest.mark.parametrize(
+        'line, starts_paragraph',
+        [
+            ('1. First', True),
+            ('  (2) Second', True),
+            ('\u00b2 Superscript', True),
+            ('(x) Letter', False),
+            ('( 2)', False),
+        ],
+    )
+    def test_paragraph_start(self, line, starts_paragraph):
+        stripped = line.strip()
+        assert bool(PARAGRAPH_START.match(line)) == starts_paragraph
+        assert starts_paragraph == (stripped[0].isdigit() or (stripped[0] == '(' and stripped[1].isdigit()))
+
 
 class TestNLTKParagraphTokenizer:
     @pytest.fixture(name="tokenizer")
@@ -108,6 +164,89 @@ class TestNLTKParagraphTokenizer:
         expected: list[str] = []
         assert tokenizer.tokenize(text) == expected
 
+    def test_tokenize_spans_is_same_as_tokenize(self, tokenizer):
+        text = "1. This is the first paragraph.\nThis is not still the first paragraph.\n(2) This is the third."
+        spans = tokenizer.tokenize_spans(text)
+        assert list(spans) == tokenizer.tokenize(text)
+        assert spans.source(2) == "This is not still the first paragraph."
+
+
+class TestRegexSentenceTokenizer:
+    def test_tokenize_chinese(self):
+        assert RegexSentenceTokenizer().tokenize("这是第一句。这是第二句！第三句？") == [
+            "这是第一句。",
+            "这是第二句！",
+            "第三句？",
+        ]
+
+    def test_tokenize_arabic(self):
+        text = "هذه جملة. هذه جملة أخرى؟ نعم"
+        assert RegexSentenceTokenizer().tokenize(text) == ["هذه جملة.", "هذه جملة أخرى؟", "نعم"]
+
+    def test_span_tokenize(self):
+        text = " First. Second!  "
+        assert list(RegexSentenceTokenizer().span_tokenize(text)) == [(1, 7), (8, 15)]
+
+    def test_tokenize_empty(self):
+        assert not RegexSentenceTokenizer().tokenize("  ")
+
+
+class TestGetSentenceTokenizer:
+    @pytest.mark.parametrize("language", ["ar", "ara", "zh", "ZH-CN", "ja", "ko"])
+    def test_regex_languages(self, language):
+        assert isinstance(get_sentence_tokenizer(language), RegexSentenceTokenizer)
+
+    def test_cached(self):
+        assert get_sentence_tokenizer("ar") is get_sentence_tokenizer("ar")
+
+    def test_nltk_tokenizer_uses_language(self):
+        tokenizer = NLTKParagraphTokenizer("zh")
+        text = "这是第一句。\n这是第二句。"
+        assert tokenizer.tokenize(text) == ["这是第一句。", "这是第二句。"]
+        assert list(tokenizer.tokenize_spans(text).spans()) == [(0, 6), (7, 13)]
+
+
+class TestWordTokenize:
+    def test_words_are_case_folded(self):
+        assert word_tokenize("Human Rights, co-operation; Straße 1946.") == [
+            "human",
+            "rights",
+            "co",
+            "operation",
+            "strasse",
+            "1946",
+        ]
+
+    def test_cjk_ideographs_are_words(self):
+        assert word_tokenize("教育与和平 UNESCO") == ["教", "育", "与", "和", "平", "unesco"]
+
+
+class TestParagraphSpans:
+    @pytest.fixture(name="spans")
+    def fixture_spans(self):
+        return ParagraphSpans("1. First\nline\n2. Second", array('q', [0, 14]), array('q', [13, 23]))
+
+    def test_len(self, spans):
+        assert len(spans) == 2
+
+    def test_getitem_replaces_newlines(self, spans):
+        assert spans[0] == "1. First line"
+        assert spans[-1] == "2. Second"
+
+    def test_getitem_slice(self, spans):
+        assert spans[1:] == ["2. Second"]
+
+    def test_source_is_exact_slice(self, spans):
+        assert spans.source(0) == "1. First\nline"
+
+    def test_iter(self, spans):
+        assert list(spans) == ["1. First line", "2. Second"]
+
+    def test_subset(self, spans):
+        subset = spans.subset([1])
+        assert list(subset) == ["2. Second"]
+        assert subset.text is spans.text
+
 
 class TestParagraphTokenizer:
     def test_initialize_ParagraphTokenizer(self):
@@ -119,6 +258,11 @@ class TestParagraphTokenizer:
         with pytest.raises(NotImplementedError):
             tokenizer.tokenize("")
 
+    def test_ParagraphTokenizer_tokenize_spans_raises_NotImplementedError(self):
+        tokenizer = ParagraphTokenizer()
+        with pytest.raises(NotImplementedError):
+            tokenizer.tokenize_spans("")
+
 
 class TestTokenizerFactory:
     def test_TokenizerFactory_get_tokenizer_simple(self):
@@ -129,6 +273,11 @@ class TestTokenizerFactory:
         tokenizer = TokenizerFactory.get_tokenizer("nltk")
         assert isinstance(tokenizer, NLTKParagraphTokenizer)
 
+    def test_TokenizerFactory_get_tokenizer_nltk_language(self):
+        tokenizer = TokenizerFactory.get_tokenizer("nltk", language="fr")
+        assert isinstance(tokenizer, NLTKParagraphTokenizer)
+        assert tokenizer.language == "fr"
+
     def test_TokenizerFactory_get_tokenizer_invalid(self):
         with pytest.raises(ValueError):
             TokenizerFactory.get_tokenizer("invalid")
@@ -0,0 +1,65 @@
+from typing import Any
+
+import pytest
+
+from proceedings_curation.writers.offset_index import JsonlDataset, write_offset_index
+from proceedings_curation.writers.writers import JsonlWriter
+
+RECORDS: list[dict[str, Any]] = [{'text': f'Texte {i} é', 'meta': {'file': f'{i}.txt'}} for i in range(10)]
+
+
+@pytest.fixture(name='dataset')
+def fixture_dataset(tmp_path):
+    path = tmp_path / 'dataset.jsonl'
+    with JsonlWriter(path, buffer_size=64) as writer:
+        spans = [writer.write(record) for record in RECORDS]
+    write_offset_index(
+        f'{path}.idx',
+        [100 + i for i in range(10)],
+        [record['meta']['file'] for record in RECORDS],
+        [offset for offset, _ in spans],
+        [length for _, length in spans],
+    )
+    with JsonlDataset(path) as dataset:
+        yield dataset
+
+
+class TestJsonlDataset:
+    def test_len_and_iter(self, dataset):
+        assert len(dataset) == 10
+        assert list(dataset) == RECORDS
+
+    def test_getitem(self, dataset):
+        assert dataset[3] == RECORDS[3]
+        assert dataset[-1] == RECORDS[-1]
+
+    def test_get(self, dataset):
+        assert dataset.get(105) == RECORDS[5]
+        with pytest.raises(KeyError):
+            dataset.get(1)
+
+    def test_get_by_file(self, dataset):
+        assert dataset.get_by_file('7.txt') == RECORDS[7]
+        with pytest.raises(KeyError):
+            dataset.get_by_file('missing.txt')
+
+    def test_sample(self, dataset):
+        sample = dataset.sample(4, seed=1)
+        assert len(sample) == 4
+        assert all(record in RECORDS for record in sample)
+        assert len({record['meta']['file'] for record in sample}) == 4
+        assert sample == dataset.sample(4, seed=1)
+        assert len(dataset.sample(20)) == 10
+
+    def test_not_an_index(self, tmp_path):
+        (tmp_path / 'dataset.jsonl').write_bytes(b'{}\n')
+        (tmp_path / 'dataset.jsonl.idx').write_bytes(b'\0' * 32)
+        with pytest.raises(ValueError):
+            JsonlDataset(tmp_path / 'dataset.jsonl')
+
+    def test_empty_dataset(self, tmp_path):
+        (tmp_path / 'dataset.jsonl').write_bytes(b'')
+        write_offset_index(tmp_path / 'dataset.jsonl.idx', [], [], [], [])
+        with JsonlDataset(tmp_path / 'dataset.jsonl') as dataset:
+            assert len(dataset) == 0
+            assert not dataset.sample(3)
@@ -0,0 +1,122 @@
+import gzip
+import json
+
+import numpy as np
+import pytest
+
+from proceedings_curation.writers import writers
+from proceedings_curation.writers.writers import JsonlWriter, ParquetDatasetWriter, dumps, read_lines
+
+RECORDS = [
+    {'text': 'Première séance', 'meta': {'file': 'a.txt', 'title': 'Title', 'date': None, 'source': 'url#page=1'}},
+    {'text': 'Second meeting', 'meta': {'file': 'b.txt', 'title': 'Title', 'date': '2022-01-01', 'source': 'url'}},
+]
+
+
+class TestDumps:
+    def test_dumps_is_compact_utf8(self):
+        assert dumps({'text': 'é', 'meta': {'date': None}}) == '{"text":"é","meta":{"date":null}}'.encode('utf-8')
+
+    def test_dumps_matches_json(self):
+        for record in RECORDS:
+            assert json.loads(dumps(record)) == record
+
+    def test_dumps_numpy(self):
+        assert json.loads(dumps({'page': np.uint16(3)})) == {'page': 3}
+
+    @pytest.mark.parametrize('use_orjson', [True, False])
+    def test_dumps_with_and_without_orjson(self, use_orjson, monkeypatch):
+        if use_orjson and writers.orjson is None:
+            pytest.skip('orjson is not installed')
+        if not use_orjson:
+            monkeypatch.setattr(writers, 'orjson', None)
+        record = {
+            'score': float('nan'),
+            'values': [np.int64(3), np.float64(2.5), np.float64('inf'), np.bool_(True)],
+            'pages': np.array([1, 2], dtype=np.uint16),
+        }
+
+        assert dumps(record) == b'{"score":null,"values":[3,2.5,null,true],"pages":[1,2]}'
+
+
+class TestJsonlWriter:
+    def test_write_jsonl(self, tmp_path):
+        path = tmp_path / 'dataset.jsonl'
+        with JsonlWriter(path) as writer:
+            writer.write_all(RECORDS)
+        assert [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()] == RECORDS
+
+    def test_write_gzip(self, tmp_path):
+        path = tmp_path / 'dataset.jsonl.gz'
+        with JsonlWriter(path) as writer:
+            writer.write_all(RECORDS)
+        with gzip.open(path, 'rt', encoding='utf-8') as file:
+            assert [json.loads(line) for line in file] == RECORDS
+
+    def test_write_zstd(self, tmp_path):
+        zstandard = pytest.importorskip('zstandard')
+        path = tmp_path / 'dataset.jsonl.zst'
+        with JsonlWriter(path) as writer:
+            writer.write_all(RECORDS)
+        data = zstandard.ZstdDecompressor().stream_reader(path.read_bytes()).read()
+        assert [json.loads(line) for line in data.decode('utf-8').splitlines()] == RECORDS
+
+    def test_gzip_is_reproducible(self, tmp_path):
+        for folder in ['first', 'second']:
+            (tmp_path / folder).mkdir()
+            with JsonlWriter(tmp_path / folder / 'dataset.jsonl.gz') as writer:
+                writer.write_all(RECORDS)
+        assert (tmp_path / 'first' / 'dataset.jsonl.gz').read_bytes() == (
+            tmp_path / 'second' / 'dataset.jsonl.gz'
+        ).read_bytes()
+
+    def test_buffer_is_flushed_when_full(self, tmp_path):
+        path = tmp_path / 'dataset.jsonl'
+        writer = JsonlWriter(path, buffer_size=10)
+        writer.write(RECORDS[0])
+        assert not writer.buffer
+        writer.write({})
+        assert writer.buffer == [b'{}\n']
+        writer.close()
+        assert path.read_bytes().endswith(b'{}\n')
+
+    def test_close_twice(self, tmp_path):
+        writer = JsonlWriter(tmp_path / 'dataset.jsonl')
+        writer.close()
+        writer.close()
+
+
+class TestParquetDatasetWriter:
+    def test_write_partitioned_batches(self, tmp_path):
+        pa = pytest.importorskip('pyarrow')
+        pq = pytest.importorskip('pyarrow.parquet')
+        schema = pa.schema([('year', pa.int32()), ('text', pa.string())])
+        path = tmp_path / 'dataset.parquet'
+        with ParquetDatasetWriter(path, schema, batch_size=2) as writer:
+            for i in range(5):
+                writer.write({'year': 1946 + i % 2, 'text': str(i)})
+        assert sorted(p.name for p in path.iterdir()) == ['year=1946', 'year=1947']
+        assert len(list((path / 'year=1946').iterdir())) == 3
+        table = pq.read_table(path)
+        assert sorted(table.column('text').to_pylist()) == ['0', '1', '2', '3', '4']
+
+    def test_replaces_existing_dataset(self, tmp_path):
+        pa = pytest.importorskip('pyarrow')
+        pq = pytest.importorskip('pyarrow.parquet')
+        schema = pa.schema([('year', pa.int32()), ('text', pa.string())])
+        path = tmp_path / 'dataset.parquet'
+        for text in ['old', 'new']:
+            with ParquetDatasetWriter(path, schema) as writer:
+                writer.write({'year': 1946, 'text': text})
+        assert pq.read_table(path).column('text').to_pylist() == ['new']
+
+
+@pytest.mark.parametrize('name', ['dataset.jsonl', 'dataset.jsonl.gz', 'dataset.jsonl.zst'])
+def test_read_lines(tmp_path, name):
+    if name.endswith('.zst'):
+        pytest.importorskip('zstandard')
+    with JsonlWriter(tmp_path / name) as writer:
+        writer.write(RECORDS[0])
+        writer.write_line(b'{"text":"raw"}\n')
+    lines = list(read_lines(tmp_path / name))
+    assert lines == [dumps(RECORDS[0]) + b'\n', b'{"text":"raw"}\n']